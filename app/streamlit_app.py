@@ -149,30 +149,49 @@ if PROJECT_ROOT not in sys.path:
 
 import streamlit as st
 import pandas as pd
-from src.resume_parser.parser import parse_resume_text
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
+from src.resume_parser.parser import parse_resume_text, parse_resume_bytes
+from src.models.tfidf_index import TfidfJobIndex, INDEX_DIR
+from src.models.filters import FilterIndex
+from src.utils.metrics import timed
+
+DISPLAY_COLS = ["title","companyName","locationShort","jobUrl","score"]
 
 # — cache your job dataset —
 @st.cache_data
 def load_job_data(path="data/raw/jobs_dummy.csv") -> pd.DataFrame:
     return pd.read_csv(path)
 
-def recommend_jobs(resume_text, jobs_df, top_n=5):
-    corpus = [resume_text] + jobs_df["description"].fillna("").tolist()
-    vect = TfidfVectorizer(stop_words="english")
-    tfidf = vect.fit_transform(corpus)
-    sims = cosine_similarity(tfidf[0], tfidf[1:])[0]
-    df = jobs_df.copy()
-    df["score"] = sims
-    return df.nlargest(top_n, "score")[["title","company","location","jobUrl","score"]]
+# — load the pre-fitted TF-IDF index once per process —
+# (build it with `python -m src.models.tfidf_index`; falls back to fitting
+#  over the dummy jobs if no index has been built yet)
+@st.cache_resource
+def load_job_index(index_dir=INDEX_DIR) -> TfidfJobIndex:
+    if TfidfJobIndex.exists(index_dir):
+        return TfidfJobIndex.load(index_dir)
+    return TfidfJobIndex.fit(load_job_data())
+
+@st.cache_resource
+def load_filter_index(index_dir=INDEX_DIR) -> FilterIndex:
+    return FilterIndex.build(load_job_index(index_dir).jobs)
+
+@timed("recommend_jobs")
+def recommend_jobs(resume_text, index, top_n=5, rows=None):
+    df = index.recommend(resume_text, top_n=top_n, rows=rows)
+    return df[[c for c in DISPLAY_COLS if c in df.columns]]
 
 def main():
     st.set_page_config("📄→💼 Job Recommender", layout="wide")
     st.title("📝 Intelligent Job Recommender 💼")
 
+    # sidebar filters, applied before scoring
+    st.sidebar.header("🔎 Refinement Filters")
+    location_input = st.sidebar.text_input("Location (city or state)",
+                                           placeholder="e.g. Remote, California")
+    salary_input   = st.sidebar.text_input("Salary ($ or range)",
+                                           placeholder="e.g. $80k or $80k–$100k")
+
     # 2) Let user upload OR pick from samples
-    uploaded = st.file_uploader("Upload .txt resume", type="txt")
+    uploaded = st.file_uploader("Upload your resume", type=["txt","pdf","docx"])
     sample_files = {
         "Software Engineer": "sample_resume_software.txt",
         "Teacher":              "sample_resume_teacher.txt",
@@ -182,12 +201,9 @@ def main():
     }
 
     if uploaded:
-        # write to temp and parse
-        tmp = "temp_resume.txt"
-        with open(tmp, "wb") as f:
-            f.write(uploaded.getvalue())
-        resume_text = parse_resume_text(tmp)
-        os.remove(tmp)
+        # parse in memory; cached by content hash across reruns
+        resume_text = parse_resume_bytes(uploaded.getvalue(),
+                                         os.path.splitext(uploaded.name)[1])
     else:
         choice = st.selectbox("Or pick a sample resume:", list(sample_files.keys()))
         st.info(f"Using **{choice}** sample")
@@ -199,9 +215,13 @@ def main():
 
     # recommendations
     st.subheader("Job Recommendations")
-    jobs = load_job_data()
-    st.write(f"Loaded **{len(jobs)}** jobs from `jobs_dummy.csv`.")
-    recs = recommend_jobs(resume_text, jobs, top_n=5)
+    index = load_job_index()
+    st.write(f"Loaded **{len(index.jobs)}** jobs from the TF-IDF index.")
+    rows = load_filter_index().select(location=location_input or None,
+                                      salary=salary_input or None)
+    if rows is not None:
+        st.write(f"**{len(rows)}** jobs match the filters.")
+    recs = recommend_jobs(resume_text, index, top_n=5, rows=rows)
     recs["score"] = recs["score"].map(lambda x: f"{x:.2f}")
     st.table(recs)
 
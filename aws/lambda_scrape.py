@@ -1,12 +1,25 @@
 import os
-import boto3
-import pandas as pd
-from src.data_collection.scrape_jobs import fetch_jobs_for_professions
+import shutil
+from src.data_collection.scrape_jobs import stream_jobs_for_professions
+from src.data_collection.sync import push_partitions
+from src.utils.object_store import open_store
+from src.utils import metrics
 from dotenv import load_dotenv
 
 load_dotenv()
-S3     = boto3.client("s3")
-BUCKET = os.getenv("S3_BUCKET")
+BUCKET    = os.getenv("S3_BUCKET")
+# e.g. file:///tmp/store to run the whole sync offline
+STORE_URL = os.getenv("JOB_STORE_URL") or f"s3://{BUCKET}/raw/jobs"
+LOCAL_DIR = "/tmp/raw/jobs"   # the only writable path inside Lambda
+
+_store = None
+
+def get_store():
+    # created on first invocation and reused while the container stays warm
+    global _store
+    if _store is None:
+        _store = open_store(STORE_URL)
+    return _store
 
 def handler(event, context):
     professions = [
@@ -14,7 +27,14 @@ def handler(event, context):
       "healthcare worker","chartered accountant",
       "business analyst","researcher"
     ]
-    df = fetch_jobs_for_professions(professions)
-    csv = df.to_csv(index=False).encode()
-    S3.put_object(Bucket=BUCKET, Key="raw/all_jobs.csv", Body=csv)
-    return {"statusCode":200, "body":f"Scraped {len(df)} jobs."}
+    # /tmp survives warm starts; don't re-push yesterday's partitions
+    shutil.rmtree(LOCAL_DIR, ignore_errors=True)
+    paths, n_jobs = stream_jobs_for_professions(professions, out_dir=LOCAL_DIR)
+    # only new/changed records go up, as compressed delta partitions
+    counts = push_partitions(paths, get_store())
+    # one structured metrics line per invocation in CloudWatch
+    metrics.flush()
+    return {"statusCode":200,
+            "body":f"Scraped {n_jobs} jobs into {len(paths)} partitions; uploaded "
+                   f"{counts['new']} new and {counts['changed']} changed records "
+                   f"in {counts['deltas']} deltas ({counts['bytes']} bytes)."}
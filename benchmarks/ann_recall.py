@@ -0,0 +1,111 @@
+# benchmarks/ann_recall.py
+#
+# Recall@k vs latency of the IVF(-PQ) index against exact search.
+#
+#   python -m benchmarks.ann_recall                       # synthetic
+#   python -m benchmarks.ann_recall --index-dir data/processed/job_index
+#
+# Settings that miss --min-recall or are slower than exact are flagged;
+# build_job_index(ann=True) runs the same check before keeping an index.
+
+import argparse
+import json
+import time
+import numpy as np
+
+from benchmarks import synthetic
+from src.models.ann_index import IVFIndex, MIN_RECALL, auto_pq_m, recall_at_k
+from src.models.topk import blocked_top_k, l2_normalize
+
+
+def synthetic_embeddings(n_rows, dim, n_queries, seed=0):
+    """Clustered unit vectors, roughly how job embeddings group by role."""
+    both = synthetic.make_embeddings(n_rows + n_queries, dim=dim, seed=seed)
+    return both[:n_rows], both[n_rows:]
+
+
+def real_embeddings(index_dir, n_queries, seed=0):
+    """Hold out `n_queries` rows of a built job index and use them as queries."""
+    from src.models.job_index import load_job_index
+    emb  = np.asarray(load_job_index(index_dir).embeddings, dtype=np.float32)
+    rng  = np.random.default_rng(seed)
+    mask = np.zeros(emb.shape[0], dtype=bool)
+    mask[rng.choice(emb.shape[0], min(n_queries, emb.shape[0] // 10 or 1), replace=False)] = True
+    return l2_normalize(emb[~mask]), l2_normalize(emb[mask])
+
+
+def run(base, queries, k, n_lists, pq_m, nprobes, refine):
+    t0 = time.perf_counter()
+    exact_idx, _ = blocked_top_k(queries, base, k=k)
+    exact_ms = (time.perf_counter() - t0) * 1000 / len(queries)
+
+    t0 = time.perf_counter()
+    index = IVFIndex.build(base, n_lists=n_lists, pq_m=pq_m)
+    build_s = time.perf_counter() - t0
+    if pq_m and refine > 1:
+        index.attach_vectors(base)
+
+    rows = []
+    for nprobe in nprobes:
+        t0 = time.perf_counter()
+        idx, _ = index.search(queries, k=k, nprobe=nprobe, refine=refine)
+        ms = (time.perf_counter() - t0) * 1000 / len(queries)
+        rows.append({"nprobe": nprobe, "recall": recall_at_k(idx, exact_idx),
+                     "ms_per_query": ms, "speedup": exact_ms / ms})
+    return {
+        "rows": base.shape[0], "dim": base.shape[1], "k": k,
+        "n_lists": index.n_lists, "pq_m": pq_m, "refine": refine,
+        "build_seconds": build_s,
+        "exact_ms_per_query": exact_ms,
+        "float32_bytes": int(base.shape[0] * base.shape[1] * 4),
+        "index_bytes": index.memory_bytes(),
+        "results": rows,
+    }
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--index-dir", help="benchmark a built job index instead of synthetic data")
+    ap.add_argument("--rows", type=int, default=100_000)
+    ap.add_argument("--dim", type=int, default=384)
+    ap.add_argument("--queries", type=int, default=200)
+    ap.add_argument("--k", type=int, default=10)
+    ap.add_argument("--n-lists", type=int, default=None)
+    ap.add_argument("--pq-m", type=int, default=None, help="0 disables PQ (default: dim/8)")
+    ap.add_argument("--refine", type=int, default=1, help="exact re-score of k*refine PQ hits")
+    ap.add_argument("--nprobe", type=int, nargs="+", default=[1, 2, 4, 8, 16, 32, 64])
+    ap.add_argument("--min-recall", type=float, default=MIN_RECALL)
+    ap.add_argument("--out", help="write the report as JSON")
+    args = ap.parse_args()
+
+    if args.index_dir:
+        base, queries = real_embeddings(args.index_dir, args.queries)
+    else:
+        base, queries = synthetic_embeddings(args.rows, args.dim, args.queries)
+    pq_m = auto_pq_m(base.shape[1]) if args.pq_m is None else args.pq_m
+
+    report = run(base, queries, args.k, args.n_lists, pq_m, args.nprobe, args.refine)
+
+    print(f"rows={report['rows']} dim={report['dim']} n_lists={report['n_lists']} "
+          f"pq_m={report['pq_m']} refine={report['refine']} build={report['build_seconds']:.1f}s")
+    print(f"memory: index {report['index_bytes'] / 2**20:.1f} MiB vs "
+          f"float32 {report['float32_bytes'] / 2**20:.1f} MiB")
+    print(f"exact: {report['exact_ms_per_query']:.3f} ms/query")
+    print(f"{'nprobe':>6}  {'recall@' + str(args.k):>9}  {'ms/query':>9}  {'speedup':>7}")
+    for r in report["results"]:
+        r["usable"] = r["recall"] >= args.min_recall and r["speedup"] > 1
+        note = "" if r["usable"] else "  below target" if r["recall"] < args.min_recall \
+            else "  slower than exact"
+        print(f"{r['nprobe']:>6}  {r['recall']:>9.3f}  {r['ms_per_query']:>9.3f}  "
+              f"{r['speedup']:>6.1f}x{note}")
+    if not any(r["usable"] for r in report["results"]):
+        print(f"no setting reaches recall@{args.k} >= {args.min_recall} faster than exact; "
+              f"keep exact search")
+
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+# benchmarks/clean_jobs.py
+#
+# Rows/second of the load_raw_jobs cleaning stage.
+#
+#   python -m benchmarks.clean_jobs --rows 200000 --baseline
+
+import os
+import time
+import argparse
+import tempfile
+import pandas as pd
+
+from benchmarks import synthetic
+from src.utils.io_helpers import load_raw_jobs
+
+
+def baseline_clean(df):
+    """The previous per-row BeautifulSoup implementation."""
+    from bs4 import BeautifulSoup
+    df = df.drop_duplicates(subset=["profession", "title", "companyName", "description"])
+    df["description"] = df["description"].apply(lambda x: BeautifulSoup(x, "html.parser").get_text())
+    df["description"] = df["description"].str.replace(r"\s+", " ", regex=True).str.strip()
+    return df
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--rows", type=int, default=100_000)
+    ap.add_argument("--html-frac", type=float, default=0.1)
+    ap.add_argument("--chunksize", type=int, default=50_000)
+    ap.add_argument("--baseline", action="store_true", help="also time the BeautifulSoup version")
+    args = ap.parse_args()
+
+    df = synthetic.make_jobs(args.rows, html_frac=args.html_frac)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "all_jobs.csv")
+        df.to_csv(path, index=False)
+
+        t0 = time.perf_counter()
+        out = load_raw_jobs(path, chunksize=args.chunksize)
+        dt = time.perf_counter() - t0
+        print(f"load_raw_jobs            {len(df):>9,} rows -> {len(out):>9,} "
+              f"in {dt:6.2f}s  ({len(df) / dt:,.0f} rows/s)")
+
+        if args.baseline:
+            t0 = time.perf_counter()
+            out = baseline_clean(pd.read_csv(path))
+            dt = time.perf_counter() - t0
+            print(f"baseline (bs4)           {len(df):>9,} rows -> {len(out):>9,} "
+                  f"in {dt:6.2f}s  ({len(df) / dt:,.0f} rows/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+# benchmarks/encoding.py
+#
+# Sentences/second of TwoTowerRecommender.encode vs. the EncodingEngine.
+# Works with any local sentence-transformers model directory.
+#
+#   python -m benchmarks.encoding --rows 5000 --model path/to/small-model --workers 4
+
+import os
+import time
+import argparse
+
+from benchmarks import synthetic
+from src.models.encoding import EncodingEngine
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--rows", type=int, default=2000)
+    ap.add_argument("--model", default="all-MiniLM-L6-v2", help="model name or local path")
+    ap.add_argument("--batch-size", type=int, default=64)
+    ap.add_argument("--max-seq-length", type=int, default=256)
+    ap.add_argument("--workers", type=int, default=os.cpu_count())
+    args = ap.parse_args()
+
+    texts = synthetic.make_jobs(args.rows)["description"].tolist()
+
+    engine = EncodingEngine(args.model, batch_size=args.batch_size,
+                            max_seq_length=args.max_seq_length)
+    model = engine.model
+    t0 = time.perf_counter()
+    model.encode(texts, batch_size=args.batch_size, convert_to_numpy=True,
+                 show_progress_bar=False)
+    dt = time.perf_counter() - t0
+    print(f"SentenceTransformer.encode         {len(texts):>7,} texts in {dt:7.2f}s "
+          f"({len(texts) / dt:,.1f} sentences/s)")
+
+    for workers in sorted({1, args.workers}):
+        with EncodingEngine(args.model, batch_size=args.batch_size,
+                            max_seq_length=args.max_seq_length, workers=workers,
+                            model=model if workers == 1 else None) as engine:
+            if workers > 1:
+                engine.encode(texts[:args.batch_size * workers])   # warm up the pool
+            engine.encode(texts)
+            stats = engine.last_stats
+        print(f"EncodingEngine workers={workers:<3}        {stats['sentences']:>7,} texts in "
+              f"{stats['seconds']:7.2f}s ({stats['sentences_per_sec']:,.1f} sentences/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+# benchmarks/hybrid.py
+#
+# Sparse candidate generation: brute-force TF-IDF mat-vec vs. the pruned
+# SparseInvertedIndex, with the fraction of postings each query scanned.
+#
+#   python -m benchmarks.hybrid --rows 200000 --queries 50 --k 100
+
+import time
+import argparse
+import numpy as np
+
+from benchmarks import synthetic
+from src.models.tfidf_index import TfidfJobIndex
+from src.models.hybrid import SparseInvertedIndex
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--rows", type=int, default=100_000)
+    ap.add_argument("--queries", type=int, default=50)
+    ap.add_argument("--k", type=int, default=100)
+    ap.add_argument("--max-terms", type=int, default=None)
+    args = ap.parse_args()
+
+    index = TfidfJobIndex.fit(synthetic.make_jobs(args.rows))
+    sparse = SparseInvertedIndex(index.job_matrix)
+    queries = [index.vectorizer.transform([t]) for t in synthetic.make_resumes(args.queries)]
+
+    brute, pruned, scanned, recall = [], [], [], []
+    for q in queries:
+        t0 = time.perf_counter()
+        scores = (index.job_matrix @ q.T).toarray().ravel()
+        exact = set(np.argsort(-scores)[:args.k])
+        brute.append(time.perf_counter() - t0)
+
+        t0 = time.perf_counter()
+        idx, _, stats = sparse.search(q, args.k, max_terms=args.max_terms)
+        pruned.append(time.perf_counter() - t0)
+        scanned.append(stats["postings_scanned"] / max(stats["postings_total"], 1))
+        recall.append(len(exact & set(idx)) / max(len(exact), 1))
+
+    print(f"brute force   {np.mean(brute) * 1000:8.2f} ms/query")
+    print(f"pruned        {np.mean(pruned) * 1000:8.2f} ms/query  "
+          f"({np.mean(scanned):.1%} of postings scanned, recall@{args.k} {np.mean(recall):.3f})")
+
+
+if __name__ == "__main__":
+    main()
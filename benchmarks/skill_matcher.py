@@ -0,0 +1,81 @@
+# benchmarks/skill_matcher.py
+#
+# Throughput of the compiled SkillMatcher vs one re.search per skill.
+#
+#   python -m benchmarks.skill_matcher --professions 50 --skills 2000
+
+import re
+import time
+import argparse
+import numpy as np
+
+from src.resume_parser.skills import SkillMatcher
+
+SYLLABLES = "ka lo mi ne ra tu vo si pe da go ri zu fa be".split()
+
+
+def make_skills(n_professions, n_skills, seed=0):
+    rng = np.random.default_rng(seed)
+    def term():
+        words = ["".join(rng.choice(SYLLABLES, rng.integers(2, 4)))
+                 for _ in range(rng.integers(1, 4))]
+        return " ".join(words)
+    return {
+        f"profession {p}": [(term(), [term()] if rng.random() < 0.2 else [])
+                            for _ in range(n_skills)]
+        for p in range(n_professions)
+    }
+
+
+def make_resumes(skills, n_resumes, words_per_resume=600, seed=1):
+    rng = np.random.default_rng(seed)
+    terms = [name for prof in skills.values() for name, _ in prof]
+    filler = ["".join(rng.choice(SYLLABLES, 3)) for _ in range(5000)]
+    resumes = []
+    for _ in range(n_resumes):
+        words = list(rng.choice(filler, words_per_resume))
+        for t in rng.choice(terms, 30):
+            words.insert(int(rng.integers(0, len(words))), t)
+        resumes.append(" ".join(words))
+    return resumes
+
+
+def baseline_match(skills, text):
+    """The old approach: one regex search per skill per profession."""
+    return {prof: [name for name, _ in terms
+                   if re.search(rf"\b{re.escape(name)}\b", text, re.IGNORECASE)]
+            for prof, terms in skills.items()}
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--professions", type=int, default=20)
+    ap.add_argument("--skills", type=int, default=1000, help="skills per profession")
+    ap.add_argument("--resumes", type=int, default=200)
+    ap.add_argument("--baseline-resumes", type=int, default=5)
+    args = ap.parse_args()
+
+    skills  = make_skills(args.professions, args.skills)
+    resumes = make_resumes(skills, args.resumes)
+    mb = sum(len(r) for r in resumes) / 1e6
+
+    t0 = time.perf_counter()
+    matcher = SkillMatcher(skills)
+    print(f"compile: {len(matcher.terms):,} terms in {time.perf_counter() - t0:.2f}s")
+
+    t0 = time.perf_counter()
+    n_hits = sum(len(h) for r in resumes for h in matcher.match(r).values())
+    dt = time.perf_counter() - t0
+    print(f"compiled: {len(resumes) / dt:8.1f} resumes/s  {mb / dt:6.2f} MB/s  ({n_hits:,} hits)")
+
+    sample = resumes[:args.baseline_resumes]
+    t0 = time.perf_counter()
+    for r in sample:
+        baseline_match(skills, r)
+    dt = time.perf_counter() - t0
+    print(f"baseline: {len(sample) / dt:8.1f} resumes/s  "
+          f"{sum(len(r) for r in sample) / 1e6 / dt:6.2f} MB/s")
+
+
+if __name__ == "__main__":
+    main()
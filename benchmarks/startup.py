@@ -0,0 +1,88 @@
+# benchmarks/startup.py
+#
+# Cold import cost of the app's entry modules, broken down per module
+# using `python -X importtime` in a fresh interpreter for each target.
+#
+#   python -m benchmarks.startup
+#   python -m benchmarks.startup app.streamlit_app --top 25
+
+import os
+import re
+import sys
+import json
+import argparse
+import subprocess
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+DEFAULT_TARGETS = [
+    "src.resume_parser.parser",
+    "src.models.tfidf_index",
+    "src.models.tower_model",
+    "src.service.server",
+    "app.streamlit_app",
+]
+
+LINE_RE = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+def import_profile(module: str) -> dict:
+    """Import `module` in a fresh interpreter and parse -X importtime output."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=PROJECT_ROOT, capture_output=True, text=True,
+    )
+    rows = []
+    for line in proc.stderr.splitlines():
+        m = LINE_RE.match(line)
+        if m:
+            self_us, cum_us, indent, name = m.groups()
+            rows.append({"module": name, "self_ms": int(self_us) / 1000,
+                         "cumulative_ms": int(cum_us) / 1000,
+                         "depth": (len(indent) - 1) // 2})
+    target = next((r for r in rows if r["module"] == module), None)
+    error = None
+    if proc.returncode:
+        error = proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else "failed"
+    return {
+        "target":   module,
+        "total_ms": target["cumulative_ms"] if target else None,
+        "error":    error,
+        "modules":  rows,
+    }
+
+
+def top_level_packages(rows, n):
+    """Heaviest top-level packages by summed self time (e.g. torch, sklearn)."""
+    totals = {}
+    for r in rows:
+        pkg = r["module"].split(".")[0]
+        totals[pkg] = totals.get(pkg, 0.0) + r["self_ms"]
+    return sorted(totals.items(), key=lambda kv: -kv[1])[:n]
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("targets", nargs="*", default=DEFAULT_TARGETS)
+    ap.add_argument("--top", type=int, default=10)
+    ap.add_argument("--out", help="write the full per-module breakdown as JSON")
+    args = ap.parse_args()
+
+    reports = []
+    for target in args.targets:
+        rep = import_profile(target)
+        reports.append(rep)
+        if rep["error"]:
+            print(f"{target}: import failed ({rep['error']})")
+            continue
+        print(f"{target}: {rep['total_ms']:.1f} ms")
+        for pkg, ms in top_level_packages(rep["modules"], args.top):
+            print(f"    {pkg:<32} {ms:8.1f} ms")
+
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(reports, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
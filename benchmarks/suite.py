@@ -0,0 +1,211 @@
+# benchmarks/suite.py
+#
+# End-to-end benchmark suite on synthetic data. For each corpus size it
+# measures latency, throughput and peak (Python-tracked) memory of:
+#   load_raw_jobs      cleaning a raw scrape CSV
+#   recommend_jobs     TF-IDF index fit + per-resume query
+#   rank               TwoTowerRecommender.rank + argsort vs batched search
+#   parse_resume_text  .txt resume extraction
+#
+#   python -m benchmarks.suite --sizes 1000 100000 --out benchmarks/results/today.json
+#   python -m benchmarks.suite --sizes 1000 --compare benchmarks/results/base.json
+
+import os
+import sys
+import json
+import time
+import platform
+import argparse
+import tempfile
+import tracemalloc
+import numpy as np
+
+from benchmarks import synthetic
+from src.models.tfidf_index import TfidfJobIndex
+from src.models.tower_model import TwoTowerRecommender
+from src.resume_parser.parser import parse_resume_text
+from src.utils.io_helpers import load_raw_jobs
+
+
+def _percentiles(samples_ms):
+    p50, p99 = np.percentile(samples_ms, [50, 99])
+    return {"p50_ms": float(p50), "p99_ms": float(p99)}
+
+
+def _peak_mb(fn):
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1] / 2**20
+    finally:
+        tracemalloc.stop()
+
+
+def _timed(fn):
+    t0 = time.perf_counter()
+    out = fn()
+    return out, (time.perf_counter() - t0) * 1000
+
+
+def _bare_recommender():
+    """A TwoTowerRecommender without an encoder; scoring doesn't need one."""
+    rec = TwoTowerRecommender.__new__(TwoTowerRecommender)
+    rec.model_name, rec.encoder, rec.job_vecs, rec.ann = "synthetic", None, None, None
+    return rec
+
+
+def bench_load_raw_jobs(tmp, n_jobs, memory):
+    path = os.path.join(tmp, f"jobs_{n_jobs}.csv")
+    synthetic.make_jobs(n_jobs).to_csv(path, index=False)
+    df, ms = _timed(lambda: load_raw_jobs(path))
+    out = {"total_ms": ms, "rows_per_sec": n_jobs / (ms / 1000)}
+    if memory:
+        out["peak_mb"] = _peak_mb(lambda: load_raw_jobs(path))
+    return out, df
+
+
+def bench_recommend_jobs(jobs, resumes, memory):
+    TfidfJobIndex.fit(jobs.head(10))  # keep sklearn's import out of fit_ms
+    index, fit_ms = _timed(lambda: TfidfJobIndex.fit(jobs))
+    lat = []
+    for r in resumes:
+        _, ms = _timed(lambda: index.search(r, top_n=5))
+        lat.append(ms)
+    out = {"fit_ms": fit_ms, **_percentiles(lat),
+           "queries_per_sec": len(resumes) / (sum(lat) / 1000)}
+    if memory:
+        out["peak_mb"] = _peak_mb(lambda: [index.search(r, top_n=5) for r in resumes[:20]])
+    return out
+
+
+def bench_rank(tmp, n_jobs, n_queries, dim, memory):
+    path = os.path.join(tmp, f"emb_{n_jobs}.npy") if n_jobs >= 200_000 else None
+    job_vecs = synthetic.make_embeddings(n_jobs, dim=dim, out_path=path)
+    queries  = synthetic.make_embeddings(n_queries, dim=dim, seed=1)
+    rec = _bare_recommender()
+
+    def legacy():
+        for q in queries:
+            np.argsort(rec.rank(q, job_vecs))[::-1][:10]
+
+    def batched():
+        rec.load_index(job_vecs, normalized=True).search(queries, k=10)
+
+    _, legacy_ms  = _timed(legacy)
+    _, batched_ms = _timed(batched)
+    out = {
+        "legacy_ms_per_query":  legacy_ms / n_queries,
+        "search_ms_per_query":  batched_ms / n_queries,
+        "search_queries_per_sec": n_queries / (batched_ms / 1000),
+    }
+    if memory:
+        out["legacy_peak_mb"] = _peak_mb(legacy)
+        out["peak_mb"]        = _peak_mb(batched)
+    return out
+
+
+def bench_parse_resumes(tmp, n_resumes, memory):
+    paths = synthetic.write_resumes(os.path.join(tmp, "resumes"), n_resumes)
+    lat = []
+    for p in paths:
+        _, ms = _timed(lambda: parse_resume_text(p))
+        lat.append(ms)
+    out = {**_percentiles(lat), "files_per_sec": n_resumes / (sum(lat) / 1000)}
+    if memory:
+        out["peak_mb"] = _peak_mb(lambda: [parse_resume_text(p) for p in paths])
+    return out
+
+
+def run_suite(sizes, n_queries=100, dim=384, memory=True):
+    results = []
+    resumes = synthetic.make_resumes(n_queries)
+    with tempfile.TemporaryDirectory() as tmp:
+        results.append({"stage": "parse_resume_text", "n_jobs": 0,
+                        **bench_parse_resumes(tmp, n_queries, memory)})
+        for n in sizes:
+            print(f"… {n:,} jobs", file=sys.stderr)
+            clean, jobs = bench_load_raw_jobs(tmp, n, memory)
+            results.append({"stage": "load_raw_jobs", "n_jobs": n, **clean})
+            results.append({"stage": "recommend_jobs", "n_jobs": n,
+                            **bench_recommend_jobs(jobs, resumes, memory)})
+            del jobs
+            results.append({"stage": "rank", "n_jobs": n,
+                            **bench_rank(tmp, n, n_queries, dim, memory)})
+    return {
+        "meta": {"python": platform.python_version(), "machine": platform.machine(),
+                 "cpus": os.cpu_count(), "n_queries": n_queries, "dim": dim,
+                 "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S")},
+        "results": results,
+    }
+
+
+def _direction(metric):
+    """+1 if higher is better, -1 if lower is better, 0 if not compared."""
+    if metric.endswith("_per_sec"):
+        return 1
+    if metric.endswith("_ms") or metric.endswith("_mb") or metric.endswith("_ms_per_query"):
+        return -1
+    return 0
+
+
+def compare(current, baseline, threshold=0.2):
+    """List of regressions worse than `threshold` (fractional) vs `baseline`."""
+    base = {(r["stage"], r["n_jobs"]): r for r in baseline["results"]}
+    regressions = []
+    for r in current["results"]:
+        old = base.get((r["stage"], r["n_jobs"]))
+        if not old:
+            continue
+        for metric, value in r.items():
+            sign = _direction(metric)
+            ref = old.get(metric)
+            if not sign or not isinstance(value, (int, float)) or not ref:
+                continue
+            change = (value - ref) / ref
+            if -sign * change > threshold:
+                regressions.append({"stage": r["stage"], "n_jobs": r["n_jobs"],
+                                    "metric": metric, "baseline": ref,
+                                    "current": value, "change": change})
+    return regressions
+
+
+def print_report(report):
+    for r in report["results"]:
+        metrics = "  ".join(f"{k}={v:,.2f}" for k, v in r.items()
+                            if k not in ("stage", "n_jobs"))
+        print(f"{r['stage']:<18} {r['n_jobs']:>9,}  {metrics}")
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Benchmark suite on synthetic data")
+    ap.add_argument("--sizes", type=int, nargs="+", default=[1_000, 100_000],
+                    help="job corpus sizes (e.g. 1000 100000 1000000)")
+    ap.add_argument("--queries", type=int, default=100)
+    ap.add_argument("--dim", type=int, default=384)
+    ap.add_argument("--no-memory", action="store_true", help="skip tracemalloc peak runs")
+    ap.add_argument("--out", help="write results JSON here")
+    ap.add_argument("--compare", help="baseline results JSON to check for regressions")
+    ap.add_argument("--threshold", type=float, default=0.2,
+                    help="allowed fractional regression vs baseline (default 0.2)")
+    args = ap.parse_args()
+
+    report = run_suite(args.sizes, args.queries, args.dim, memory=not args.no_memory)
+    print_report(report)
+
+    if args.out:
+        os.makedirs(os.path.dirname(args.out) or ".", exist_ok=True)
+        with open(args.out, "w") as f:
+            json.dump(report, f, indent=2)
+
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare(report, json.load(f), args.threshold)
+        for r in regressions:
+            print(f"REGRESSION {r['stage']} n={r['n_jobs']:,} {r['metric']}: "
+                  f"{r['baseline']:.3f} -> {r['current']:.3f} ({r['change']:+.0%})")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
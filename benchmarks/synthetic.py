@@ -0,0 +1,118 @@
+# benchmarks/synthetic.py
+#
+# Deterministic synthetic data in the same shapes the pipeline uses:
+# raw job tables in the scraper's schema, clustered unit embeddings and
+# plain-text resumes. Same seed -> same data.
+
+import os
+import numpy as np
+import pandas as pd
+
+from src.models.topk import l2_normalize
+
+PROFESSIONS = ["software engineer", "data engineer", "teacher", "healthcare worker",
+               "chartered accountant", "business analyst", "researcher"]
+LOCATIONS = ["San Francisco, CA", "New York, NY", "Austin, TX", "Seattle, WA",
+             "Chicago, IL", "Boston, MA", "Denver, CO", "Remote"]
+VOCAB = {
+    "software engineer":    "python java docker kubernetes aws microservices api backend ci/cd git",
+    "data engineer":        "spark sql airflow etl pipelines kafka warehouse python dbt cloud",
+    "teacher":              "lesson planning classroom curriculum students assessment grading math reading",
+    "healthcare worker":    "patient care nursing clinical charting medication hospital triage emr",
+    "chartered accountant": "audit tax ledger ifrs gaap reconciliation reporting compliance budgeting",
+    "business analyst":     "requirements stakeholders process modeling jira sql dashboards kpis",
+    "researcher":           "experiments publications statistics grants literature analysis lab methods",
+}
+COMMON = ("team communication experience years benefits salary responsibilities "
+          "remote hybrid growth collaborate fast paced environment role").split()
+
+
+def _description(rng, prof, n_words, html):
+    words = VOCAB[prof].split()
+    mix = rng.random(n_words) < 0.4
+    text = np.where(mix, rng.choice(words, n_words), rng.choice(COMMON, n_words))
+    text = " ".join(text)
+    if html:
+        text = f"<div><p>{text}</p><ul><li>401k &amp; dental</li></ul></div>"
+    return text
+
+
+def make_jobs(n_rows: int, seed: int = 0, words: int = 120, html_frac: float = 0.1,
+              dup_frac: float = 0.02) -> pd.DataFrame:
+    """Raw jobs with exactly the columns fetch_jobs_for_professions writes."""
+    rng   = np.random.default_rng(seed)
+    profs = rng.choice(PROFESSIONS, n_rows)
+    locs  = rng.choice(LOCATIONS, n_rows)
+    html  = rng.random(n_rows) < html_frac
+    start = np.datetime64("2025-01-01")
+    days  = rng.integers(0, 365, n_rows)
+    df = pd.DataFrame({
+        "profession":     profs,
+        "searchLocation": "San Francisco",
+        "title":          [f"{p.title()} {i}" for i, p in enumerate(profs)],
+        "jobType":        "Full-time",
+        "companyName":    [f"Company {c}" for c in rng.integers(0, max(1, n_rows // 20), n_rows)],
+        "companyUrl":     None,
+        "companyLogoUrl": None,
+        "companyRating":  np.round(rng.uniform(2.5, 5.0, n_rows), 1),
+        "locationShort":  locs,
+        "locationLong":   [f"{l}, USA" for l in locs],
+        "description":    [_description(rng, p, words, h) for p, h in zip(profs, html)],
+        "datePublished":  (start + days.astype("timedelta64[D]")).astype(str),
+        "jobUrl":         [f"https://jobs.example/{i}" for i in range(n_rows)],
+        "source":         "indeed",
+    })
+    # salaries last so the other columns match earlier seeds; some postings
+    # only have the text, some have nothing
+    lo = rng.integers(40, 160, n_rows) * 1000
+    hi = lo + rng.integers(0, 40, n_rows) * 1000
+    kind = rng.random(n_rows)
+    text = [f"${a // 1000}k - ${b // 1000}k a year" if a != b else f"${a // 1000}k a year"
+            for a, b in zip(lo, hi)]
+    at = df.columns.get_loc("locationLong") + 1
+    df.insert(at,     "salaryMin",  np.where(kind < 0.5, lo, np.nan))
+    df.insert(at + 1, "salaryMax",  np.where(kind < 0.5, hi, np.nan))
+    df.insert(at + 2, "salaryText", np.where(kind < 0.8, text, None))
+    n_dups = int(n_rows * dup_frac)
+    if n_dups:
+        df = pd.concat([df, df.sample(n=n_dups, random_state=seed)], ignore_index=True)
+    return df
+
+
+def make_embeddings(n_rows: int, dim: int = 384, seed: int = 0, n_topics: int = 256,
+                    noise: float = 0.6, out_path: str = None, chunk: int = 100_000):
+    """
+    Clustered unit vectors, float32. With `out_path` the matrix is written
+    chunk by chunk into a memory-mapped .npy (for 1M+ rows) and returned mapped.
+    """
+    rng    = np.random.default_rng(seed)
+    topics = rng.standard_normal((n_topics, dim)).astype(np.float32)
+    if out_path:
+        out = np.lib.format.open_memmap(out_path, mode="w+", dtype=np.float32,
+                                        shape=(n_rows, dim))
+    else:
+        out = np.empty((n_rows, dim), dtype=np.float32)
+    for start in range(0, n_rows, chunk):
+        n = min(chunk, n_rows - start)
+        labels = rng.integers(0, n_topics, n)
+        block = topics[labels] + noise * rng.standard_normal((n, dim)).astype(np.float32)
+        out[start:start + n] = l2_normalize(block)
+    if out_path:
+        out.flush()
+    return out
+
+
+def make_resumes(n: int, seed: int = 0, words: int = 250) -> list:
+    rng = np.random.default_rng(seed + 1)
+    return [_description(rng, p, words, html=False) for p in rng.choice(PROFESSIONS, n)]
+
+
+def write_resumes(out_dir: str, n: int, seed: int = 0) -> list:
+    os.makedirs(out_dir, exist_ok=True)
+    paths = []
+    for i, text in enumerate(make_resumes(n, seed)):
+        path = os.path.join(out_dir, f"resume_{i:05d}.txt")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(text)
+        paths.append(path)
+    return paths
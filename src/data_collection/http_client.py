@@ -0,0 +1,111 @@
+# src/data_collection/http_client.py
+
+import time
+import random
+import threading
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from src.utils.metrics import timer, inc
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class RateLimiter:
+    """Spaces calls at least 1/rate seconds apart (thread-safe)."""
+
+    def __init__(self, rate_per_sec: float = None):
+        self.interval = 1.0 / rate_per_sec if rate_per_sec else 0.0
+        self._next = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self):
+        if not self.interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next)
+            self._next = start + self.interval
+        if start > now:
+            time.sleep(start - now)
+
+
+class PooledClient:
+    """
+    Thread-safe JSON POST client on one pooled requests.Session, with
+    per-host concurrency and rate limits, timeouts and exponential
+    backoff (honouring Retry-After) on 429/5xx and connection errors.
+    """
+
+    def __init__(self, headers=None, per_host_concurrency: int = 4,
+                 per_host_rate: float = None, timeout=(5, 60),
+                 max_retries: int = 4, backoff_base: float = 0.5,
+                 backoff_max: float = 30.0, pool_size: int = 16):
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        if headers:
+            self.session.headers.update(headers)
+        self.per_host_concurrency = per_host_concurrency
+        self.per_host_rate = per_host_rate
+        self.timeout      = timeout
+        self.max_retries  = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max  = backoff_max
+        self._hosts = {}
+        self._lock  = threading.Lock()
+
+    def _host_limits(self, url):
+        host = urlsplit(url).netloc
+        with self._lock:
+            if host not in self._hosts:
+                self._hosts[host] = (
+                    threading.BoundedSemaphore(self.per_host_concurrency),
+                    RateLimiter(self.per_host_rate),
+                )
+            return self._hosts[host]
+
+    def _backoff(self, attempt, resp=None):
+        retry_after = resp.headers.get("Retry-After") if resp is not None else None
+        if retry_after:
+            try:
+                return min(float(retry_after), self.backoff_max)
+            except ValueError:
+                pass
+        delay = min(self.backoff_base * (2 ** attempt), self.backoff_max)
+        return delay * random.uniform(0.5, 1.0)
+
+    def post_json(self, url, payload):
+        sem, limiter = self._host_limits(url)
+        host = urlsplit(url).netloc
+        for attempt in range(self.max_retries + 1):
+            resp = None
+            if attempt:
+                inc("http_retries", host=host)
+            try:
+                limiter.wait()
+                with sem, timer("http_request", host=host):
+                    resp = self.session.post(url, json=payload, timeout=self.timeout)
+                inc("http_responses", host=host, status=resp.status_code)
+                if resp.status_code not in RETRY_STATUSES:
+                    resp.raise_for_status()
+                    return resp.json()
+            except (requests.ConnectionError, requests.Timeout):
+                inc("http_responses", host=host, status="network_error")
+                if attempt == self.max_retries:
+                    raise
+            if attempt == self.max_retries:
+                resp.raise_for_status()
+            time.sleep(self._backoff(attempt, resp))
+
+    def close(self):
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -1,10 +1,17 @@
 # src/data_collection/scrape_jobs.py
 
 import os
-import requests
+import datetime
+import itertools
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
 import pandas as pd
 from dotenv import load_dotenv
 
+from src.data_collection.http_client import PooledClient
+from src.utils.partitions import PARTITIONS_DIR, write_partition
+from src.utils import metrics
+
 load_dotenv()
 KEY  = os.getenv("RAPIDAPI_KEY")
 HOST = os.getenv("RAPIDAPI_HOST")  # e.g. indeed-scraper-api.p.rapidapi.com
@@ -15,84 +22,137 @@ HEADERS = {
     "x-rapidapi-key":  KEY
 }
 
-def fetch_jobs_for_professions(profs, location="San Francisco"):
+
+def build_payload(prof, location):
+    return {
+        "scraper":  {"maxRows": 10},
+        "query":    prof,
+        "location": location,
+        "jobType":  "fulltime",
+        "radius":   "50",
+        "sort":     "relevance",
+        "fromDays": "7",
+        "country":  "us"
+    }
+
+
+def flatten_job(j, prof, location):
+    """Flatten one API job record into a row for data/raw/all_jobs.csv."""
+    loc = j.get("location") or {}
+    sal = j.get("salary") or {}
+    return {
+        "profession":              prof,
+        "searchLocation":          location,
+        "title":                   j.get("title"),
+        "jobType":                 j.get("jobType"),
+        "companyName":             j.get("companyName"),
+        "companyUrl":              j.get("companyUrl"),
+        "companyLogoUrl":          j.get("companyLogoUrl"),
+        "companyRating":           (j.get("rating") or {}).get("rating"),
+        "locationShort":           loc.get("formattedAddressShort"),
+        "locationLong":            loc.get("formattedAddressLong"),
+        "salaryMin":               sal.get("salaryFrom"),
+        "salaryMax":               sal.get("salaryTo"),
+        "salaryText":              sal.get("salaryText"),
+        # pick whichever description you prefer
+        "description":             j.get("descriptionText") or j.get("descriptionHtml"),
+        "datePublished":           j.get("datePublished"),
+        "jobUrl":                  j.get("jobUrl"),
+        "source":                  j.get("source")
+    }
+
+
+def fetch_one(client, url, prof, location):
+    """
+    POST one (profession, location) query, wait for the scraper to finish
+    and return its flattened job records.
+    """
+    data = client.post_json(url, build_payload(prof, location))
+    jobs = (data.get("returnvalue") or {}).get("data", [])
+    if not jobs:
+        print(f"⚠️  No jobs returned for profession={prof!r} location={location!r}")
+    return [flatten_job(j, prof, location) for j in jobs]
+
+
+def iter_job_batches(profs, locations, max_workers=8, base_url=None, client=None):
     """
-    For each profession in `profs`, POST to /api/job, wait for completion
-    and then flatten returnvalue.data into a DataFrame.
+    Fan out one query per (profession, location) pair over a thread pool
+    sharing one pooled, rate-limited, retrying HTTP client. Yields
+    (query_no, profession, location, records) as each query finishes; a
+    query that still fails after retries is reported and skipped.
     """
-    all_jobs = []
-    url = f"https://{HOST}/api/job"
-
-    for prof in profs:
-        payload = {
-            "scraper":  {"maxRows": 10},
-            "query":    prof,
-            "location": location,
-            "jobType":  "fulltime",
-            "radius":   "50",
-            "sort":     "relevance",
-            "fromDays": "7",
-            "country":  "us"
-        }
-
-        # 1) kick off the scraper + wait for it to finish
-        resp = requests.post(url, json=payload, headers=HEADERS)
-        print("RAW RESPONSE:", resp.text)
-        resp.raise_for_status()
-        data = resp.json()
-
-        # 2) get the list of jobs
-        jobs = data.get("returnvalue", {}).get("data", [])
-        if not jobs:
-            print(f"⚠️  No jobs returned for profession={prof!r}")
-            continue
-
-        # 3) flatten each job record
-        for j in jobs:
-            # top‐level fields
-            title   = j.get("title")
-            jobType = j.get("jobType")
-            comp    = j.get("companyName")
-            comp_url= j.get("companyUrl")
-            logo    = j.get("companyLogoUrl")
-
-            # rating nested
-            rating = j.get("rating", {}).get("rating")
-
-            # location nested
-            loc = j.get("location", {})
-            loc_short = loc.get("formattedAddressShort")
-            loc_long  = loc.get("formattedAddressLong")
-
-            # pick whichever description you prefer
-            descr = j.get("descriptionText") or j.get("descriptionHtml")
-
-            all_jobs.append({
-                "profession":              prof,
-                "title":                   title,
-                "jobType":                 jobType,
-                "companyName":             comp,
-                "companyUrl":              comp_url,
-                "companyLogoUrl":          logo,
-                "companyRating":           rating,
-                "locationShort":           loc_short,
-                "locationLong":            loc_long,
-                "description":             descr,
-                "datePublished":           j.get("datePublished"),
-                "jobUrl":                  j.get("jobUrl"),
-                "source":                  j.get("source")
-            })
-
-    # 4) write out
+    url = f"{base_url or 'https://' + HOST}/api/job"
+    queries = list(itertools.product(profs, locations))
+    if not queries:
+        return
+
+    own_client = client is None
+    client = client or PooledClient(headers=HEADERS)
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(queries)))) as pool:
+            futures = {
+                pool.submit(fetch_one, client, url, prof, loc): (i, prof, loc)
+                for i, (prof, loc) in enumerate(queries)
+            }
+            for fut in as_completed(futures):
+                i, prof, loc = futures.pop(fut)
+                try:
+                    batch = fut.result()
+                except Exception as e:
+                    print(f"❌ Fetch failed for profession={prof!r} location={loc!r}: {e}")
+                    continue
+                yield i, prof, loc, batch
+    finally:
+        if own_client:
+            client.close()
+
+
+def fetch_jobs_for_professions(profs, location="San Francisco", locations=None,
+                               max_workers=8, base_url=None, client=None,
+                               out_path="data/raw/all_jobs.csv"):
+    """
+    Scrape every (profession, location) pair and return one DataFrame,
+    also written to `out_path` as CSV. `locations` overrides the single
+    `location`; `base_url` points at another API host (e.g. a local stub).
+    Holds the whole scrape in memory -- see stream_jobs_for_professions.
+    """
+    batches = {}
+    for i, _, _, batch in iter_job_batches(profs, locations or [location],
+                                           max_workers, base_url, client):
+        batches[i] = batch
+    all_jobs = [job for i in sorted(batches) for job in batches[i]]
+
+    # write out
     df = pd.DataFrame(all_jobs)
-    os.makedirs("data/raw", exist_ok=True)
-    df.to_csv("data/raw/all_jobs.csv", index=False)
+    if out_path:
+        os.makedirs(os.path.dirname(out_path) or ".", exist_ok=True)
+        df.to_csv(out_path, index=False)
     return df
 
 
+def stream_jobs_for_professions(profs, location="San Francisco", locations=None,
+                                max_workers=8, base_url=None, client=None,
+                                out_dir=PARTITIONS_DIR, fmt="jsonl", date=None):
+    """
+    Like fetch_jobs_for_professions, but each finished query is written
+    straight to its date/profession partition (compressed JSONL or Parquet)
+    and dropped, so memory is bounded by the batches in flight and a crash
+    keeps every partition already written. Returns (paths, n_jobs).
+    """
+    date = date or datetime.date.today().isoformat()
+    paths, n_jobs = [], 0
+    for _, prof, loc, batch in iter_job_batches(profs, locations or [location],
+                                                max_workers, base_url, client):
+        if batch:
+            paths.append(write_partition(batch, out_dir, date, prof, part=loc, fmt=fmt))
+            n_jobs += len(batch)
+    return paths, n_jobs
+
+
 if __name__ == "__main__":
     professions = [
         "software developer"
     ]
-    df = fetch_jobs_for_professions(professions)
-    print(f"\n✅ Scraped {len(df)} jobs and wrote to data/raw/all_jobs.csv")
+    paths, n_jobs = stream_jobs_for_professions(professions)
+    print(f"\n✅ Scraped {n_jobs} jobs into {len(paths)} partitions under {PARTITIONS_DIR}")
+    metrics.flush(os.getenv("JOB_RECOMMENDER_METRICS_TEXTFILE"))
@@ -0,0 +1,213 @@
+# src/data_collection/sync.py
+#
+# Incremental sync of scraped partitions to an object store.
+#
+# push: only records that are new or whose content changed since the last
+#       push are uploaded, as compressed date/profession-partitioned delta
+#       objects. Record fingerprints live in the store (_sync/), so the
+#       Lambda needs no local state between runs.
+# pull: downloads only the deltas listed in the manifest after the local
+#       cursor, into the usual partition layout for load_raw_jobs.
+#
+#   <store>/date=YYYY-MM-DD/profession=<slug>/part-delta_000042.jsonl.gz
+#   <store>/_sync/manifest.json        {"next_seq", "deltas": [...]}
+#   <store>/_sync/fingerprints.npz     (profession, record key) hash -> content hash
+
+import io
+import os
+import re
+import sys
+import gzip
+import json
+import hashlib
+import argparse
+import datetime
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+from src.utils.object_store import open_store
+from src.utils.partitions import PARTITIONS_DIR, write_partition, list_partitions
+
+MANIFEST_KEY     = "_sync/manifest.json"
+FINGERPRINTS_KEY = "_sync/fingerprints.npz"
+CURSOR_FILE      = "_sync_cursor.json"
+# fields that can differ between otherwise identical scrapes of a posting
+# within one partition (the same query run for several locations); the
+# profession is part of the partition and so of the record key instead
+VOLATILE_FIELDS  = ("searchLocation",)
+KEY_FALLBACK     = ("title", "companyName")
+
+_PARTITION_RE = re.compile(r"date=([^/\\]+)[/\\]profession=([^/\\]+)")
+
+
+def _digest(text: str) -> bytes:
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest()
+
+
+def record_key(rec: dict, profession: str = "") -> bytes:
+    """
+    Stable identity of a posting within a profession partition: its
+    jobUrl, else title/company. A posting returned by several profession
+    queries gets one key per profession, so it lands in each partition.
+    """
+    if rec.get("jobUrl"):
+        ident = str(rec["jobUrl"])
+    else:
+        ident = "\x1f".join(str(rec.get(c) or "") for c in KEY_FALLBACK)
+    return _digest(f"{profession}\x1e{ident}")
+
+
+def content_hash(rec: dict) -> bytes:
+    body = {k: v for k, v in rec.items() if k not in VOLATILE_FIELDS}
+    return _digest(json.dumps(body, sort_keys=True, ensure_ascii=False, default=str))
+
+
+def _read_records(path):
+    if path.endswith(".jsonl.gz"):
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            return [json.loads(line) for line in f if line.strip()]
+    df = pd.read_parquet(path)
+    return df.astype(object).where(df.notna(), None).to_dict("records")
+
+
+def load_manifest(store) -> dict:
+    try:
+        return json.loads(store.get_bytes(MANIFEST_KEY))
+    except KeyError:
+        return {"version": 1, "next_seq": 1, "deltas": []}
+
+
+def load_fingerprints(store) -> dict:
+    try:
+        data = np.load(io.BytesIO(store.get_bytes(FINGERPRINTS_KEY)))
+    except KeyError:
+        return {}
+    keys, hashes = data["keys"].tobytes(), data["hashes"].tobytes()
+    return {keys[i:i + 16]: hashes[i:i + 16] for i in range(0, len(keys), 16)}
+
+
+def _save_fingerprints(store, seen: dict):
+    # raw uint8 rather than "S16": numpy strips trailing NUL bytes from S
+    # strings, which would corrupt digests that happen to end in one
+    buf = io.BytesIO()
+    np.savez_compressed(buf, keys=np.frombuffer(b"".join(seen.keys()), dtype=np.uint8),
+                        hashes=np.frombuffer(b"".join(seen.values()), dtype=np.uint8))
+    store.put_bytes(FINGERPRINTS_KEY, buf.getvalue())
+
+
+def push_partitions(paths, store) -> dict:
+    """
+    Upload the new and changed records of the given partition files as
+    delta objects and register them in the manifest. The manifest is
+    written after the deltas and before the fingerprints, so a failed run
+    can at worst re-upload some records, never lose them.
+    Returns counts of new, changed and unchanged records and deltas.
+    """
+    manifest = load_manifest(store)
+    seen     = load_fingerprints(store)
+    counts   = {"new": 0, "changed": 0, "unchanged": 0, "deltas": 0, "bytes": 0}
+    now      = datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for path in paths:
+            m = _PARTITION_RE.search(path)
+            date, profession = m.groups() if m else (datetime.date.today().isoformat(), "none")
+            delta = []
+            for rec in _read_records(path):
+                key, digest = record_key(rec, profession), content_hash(rec)
+                old = seen.get(key)
+                if old == digest:
+                    counts["unchanged"] += 1
+                    continue
+                counts["new" if old is None else "changed"] += 1
+                seen[key] = digest
+                delta.append(rec)
+            if not delta:
+                continue
+
+            seq = manifest["next_seq"]
+            local = write_partition(delta, tmp, date, profession, part=f"delta-{seq:06d}")
+            key = os.path.relpath(local, tmp).replace(os.sep, "/")
+            store.put_file(local, key)
+            size = os.path.getsize(local)
+            manifest["next_seq"] = seq + 1
+            manifest["deltas"].append({"seq": seq, "key": key, "date": date,
+                                       "profession": profession, "records": len(delta),
+                                       "bytes": size, "created_at": now})
+            counts["deltas"] += 1
+            counts["bytes"]  += size
+
+    if counts["deltas"]:
+        manifest["updated_at"] = now
+        store.put_bytes(MANIFEST_KEY, json.dumps(manifest, indent=2).encode())
+        _save_fingerprints(store, seen)
+    return counts
+
+
+def _read_cursor(path) -> int:
+    if not os.path.exists(path):
+        return 0
+    with open(path) as f:
+        return json.load(f)["last_seq"]
+
+
+def pull_deltas(store, out_dir: str = PARTITIONS_DIR, since: int = None,
+                cursor_path: str = None):
+    """
+    Download the deltas after `since` (default: the cursor saved in
+    `out_dir` by the previous pull) into `out_dir`'s partition layout.
+    Returns (local paths, last sequence number); the cursor is advanced
+    only after every download succeeded.
+    """
+    cursor_path = cursor_path or os.path.join(out_dir, CURSOR_FILE)
+    since = _read_cursor(cursor_path) if since is None else since
+    manifest = load_manifest(store)
+    wanted = [d for d in manifest["deltas"] if d["seq"] > since]
+
+    paths = []
+    for delta in wanted:
+        local = os.path.join(out_dir, *delta["key"].split("/"))
+        store.download_file(delta["key"], local)
+        paths.append(local)
+
+    last_seq = max((d["seq"] for d in wanted), default=since)
+    os.makedirs(os.path.dirname(cursor_path) or ".", exist_ok=True)
+    with open(cursor_path, "w") as f:
+        json.dump({"last_seq": last_seq}, f)
+    return paths, last_seq
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Incremental scrape sync with an object store")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    push = sub.add_parser("push", help="upload new/changed records from local partitions")
+    push.add_argument("store", help="s3://bucket/prefix, file:///path or a local path")
+    push.add_argument("--root", default=PARTITIONS_DIR)
+    push.add_argument("--dates", nargs="*", default=None)
+    pull = sub.add_parser("pull", help="download deltas since the last pull")
+    pull.add_argument("store")
+    pull.add_argument("--out", default=PARTITIONS_DIR)
+    pull.add_argument("--since", type=int, default=None)
+    pull.add_argument("--update-live-index", action="store_true",
+                      help="fold the pulled deltas into the live job index")
+    args = ap.parse_args(argv)
+
+    store = open_store(args.store)
+    if args.cmd == "push":
+        counts = push_partitions(list_partitions(args.root, dates=args.dates), store)
+        print(f"✅ Pushed {counts['new']} new and {counts['changed']} changed records "
+              f"({counts['unchanged']} unchanged) in {counts['deltas']} deltas")
+        return 0
+
+    paths, last_seq = pull_deltas(store, args.out, since=args.since)
+    print(f"✅ Pulled {len(paths)} deltas (up to seq {last_seq}) into {args.out}")
+    if args.update_live_index and paths:
+        from src.models.live_index import update_live_index
+        print(f"Live index: {update_live_index(paths)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,11 +1,216 @@
-from sklearn.metrics import precision_score
+import os
+import time
+import argparse
+import numpy as np
+import pandas as pd
 
 def precision_at_k(true_ids: list[str], recommended_ids: list[str], k: int = 10) -> float:
+    true_ids = set(true_ids)
     hits = [1 if job in true_ids else 0 for job in recommended_ids[:k]]
     return sum(hits) / k
 
+
+# ── qrels / run files ───────────────────────────────────────────────────────
+
+def _read_table(path, trec_cols, names):
+    """
+    Read a TREC-style whitespace file (`trec_cols` columns, no header) or a
+    CSV/TSV with a header containing `names`.
+    """
+    if path.endswith((".csv", ".tsv")):
+        df = pd.read_csv(path, sep="\t" if path.endswith(".tsv") else ",", dtype=str)
+        return df[[c for c in df.columns if c in names]]
+    df = pd.read_csv(path, sep=r"\s+", header=None, names=trec_cols, dtype=str)
+    return df[[c for c in trec_cols if c in names]]
+
+def load_qrels(path) -> pd.DataFrame:
+    """query_id, job_id, relevance. TREC qrels: `qid 0 docid rel`."""
+    df = _read_table(path, ["query_id", "iter", "job_id", "relevance"],
+                     ["query_id", "job_id", "relevance"])
+    df["relevance"] = pd.to_numeric(df["relevance"]).astype(np.float64)
+    return df
+
+def load_run(path) -> pd.DataFrame:
+    """query_id, job_id, score. TREC run: `qid Q0 docid rank score tag`."""
+    df = _read_table(path, ["query_id", "q0", "job_id", "rank", "score", "tag"],
+                     ["query_id", "job_id", "score", "rank"])
+    if "score" in df.columns:
+        df["score"] = pd.to_numeric(df["score"])
+    else:
+        df["score"] = -pd.to_numeric(df["rank"])
+    return df[["query_id", "job_id", "score"]]
+
+
+# ── array-based metrics ─────────────────────────────────────────────────────
+
+def _gain_matrix(qrels, run, k):
+    """
+    (queries, k) relevance of each query's top-k run entries (0 past the
+    end of a short run), plus per-query relevant counts and ideal gains.
+    Queries come from the qrels; queries missing from the run score 0.
+    """
+    qids = pd.Index(qrels["query_id"].unique())
+    rel  = qrels[qrels["relevance"] > 0]
+
+    run = run[run["query_id"].isin(qids)].sort_values(
+        ["query_id", "score", "job_id"], ascending=[True, False, True])
+    run = run.drop_duplicates(["query_id", "job_id"])
+    run = run.assign(pos=run.groupby("query_id").cumcount())
+    run = run[run["pos"] < k].merge(rel[["query_id", "job_id", "relevance"]],
+                                    on=["query_id", "job_id"], how="left")
+
+    gains = np.zeros((len(qids), k))
+    rows  = qids.get_indexer(run["query_id"])
+    gains[rows, run["pos"].to_numpy()] = run["relevance"].fillna(0).to_numpy()
+
+    n_rel = rel.groupby("query_id").size().reindex(qids, fill_value=0).to_numpy()
+    ideal = np.zeros((len(qids), k))
+    rel_sorted = rel.sort_values(["query_id", "relevance"], ascending=[True, False])
+    rel_sorted = rel_sorted.assign(pos=rel_sorted.groupby("query_id").cumcount())
+    rel_sorted = rel_sorted[rel_sorted["pos"] < k]
+    ideal[qids.get_indexer(rel_sorted["query_id"]), rel_sorted["pos"].to_numpy()] = \
+        rel_sorted["relevance"].to_numpy()
+    return qids, gains, ideal, n_rel
+
+def evaluate_run(qrels: pd.DataFrame, run: pd.DataFrame, ks=(5, 10)) -> tuple:
+    """
+    precision@k, recall@k, nDCG@k (gain 2^rel - 1) for each k and MRR over
+    the deepest k, for every query in `qrels` at once.
+    Returns (mean metrics dict, per-query DataFrame).
+    """
+    kmax = max(ks)
+    qids, gains, ideal, n_rel = _gain_matrix(qrels, run, kmax)
+    hits = gains > 0
+    discount = 1.0 / np.log2(np.arange(2, kmax + 2))
+
+    per_query = {}
+    for k in ks:
+        h = hits[:, :k].sum(axis=1)
+        per_query[f"P@{k}"] = h / k
+        per_query[f"R@{k}"] = np.divide(h, n_rel, out=np.zeros(len(qids)), where=n_rel > 0)
+        dcg  = ((2 ** gains[:, :k] - 1) * discount[:k]).sum(axis=1)
+        idcg = ((2 ** ideal[:, :k] - 1) * discount[:k]).sum(axis=1)
+        per_query[f"nDCG@{k}"] = np.divide(dcg, idcg, out=np.zeros(len(qids)), where=idcg > 0)
+    first = np.where(hits.any(axis=1), hits.argmax(axis=1) + 1, 0)
+    per_query["MRR"] = np.divide(1.0, first, out=np.zeros(len(qids)), where=first > 0)
+
+    per_query = pd.DataFrame(per_query, index=qids.rename("query_id"))
+    return per_query.mean().to_dict(), per_query
+
+
+# ── running a backend ───────────────────────────────────────────────────────
+
+def latency_summary(latencies_ms) -> dict:
+    lat = np.asarray(latencies_ms, dtype=np.float64)
+    if not len(lat):
+        return {}
+    p50, p90, p99 = np.percentile(lat, [50, 90, 99])
+    return {"latency_p50_ms": float(p50), "latency_p90_ms": float(p90),
+            "latency_p99_ms": float(p99), "latency_mean_ms": float(lat.mean())}
+
+def run_backend(search_fn, queries: dict, k: int = 10) -> tuple:
+    """
+    Call `search_fn(text, k) -> [(job_id, score), ...]` for every query,
+    timing each call. Returns (run DataFrame, latencies in ms).
+    """
+    rows, latencies = [], []
+    for qid, text in queries.items():
+        t0 = time.perf_counter()
+        results = search_fn(text, k)
+        latencies.append((time.perf_counter() - t0) * 1000)
+        rows += [(qid, str(job_id), float(score)) for job_id, score in results]
+    return pd.DataFrame(rows, columns=["query_id", "job_id", "score"]), latencies
+
+def make_backend(name, id_column=None, **kwargs):
+    """
+    search_fn for a built index: "tfidf" (TfidfJobIndex), "dense"
+    (TwoTowerRecommender over the job index, with its verified ANN index
+    if use_ann; other kwargs go to search(), e.g. nprobe=16) or "hybrid" (HybridRetriever; kwargs go to
+    its constructor, e.g. fusion="weighted"). Job ids come from
+    `id_column`, else row number.
+    """
+    if name == "tfidf":
+        from src.models.tfidf_index import TfidfJobIndex
+        index = TfidfJobIndex.load()
+        ids = index.jobs[id_column].astype(str).to_numpy() if id_column else None
+        def search(text, k):
+            idx, scores = index.search(text, k)
+            return zip(ids[idx] if ids is not None else idx, scores)
+        return search
+    if name == "dense":
+        from src.models.job_index import load_job_index, INDEX_DIR
+        from src.models.ann_index import ANN_SUBDIR, load_verified
+        from src.models.tower_model import get_recommender
+        index = load_job_index()
+        model = get_recommender(index.model_name)
+        model.load_index(index.embeddings, normalized=index.normalized)
+        use_ann = kwargs.pop("use_ann", False)
+        ann = load_verified(os.path.join(INDEX_DIR, ANN_SUBDIR)) if use_ann else None
+        if ann is not None:
+            model.load_ann(ann)
+        ids = index.jobs[id_column].astype(str).to_numpy() if id_column else None
+        def search(text, k):
+            idx, scores = model.search(model.encode([text], show_progress_bar=False), k=k, **kwargs)
+            keep = idx[0] >= 0
+            idx, scores = idx[0][keep], scores[0][keep]
+            return zip(ids[idx] if ids is not None else idx, scores)
+        return search
+    if name == "hybrid":
+        from src.models.hybrid import load_hybrid
+        retriever = load_hybrid(**kwargs)
+        ids = retriever.jobs[id_column].astype(str).to_numpy() if id_column else None
+        def search(text, k):
+            idx, scores, _ = retriever.search(text, k)
+            return zip(ids[idx] if ids is not None else idx, scores)
+        return search
+    raise ValueError(f"Unknown backend {name!r}")
+
+def load_queries(path) -> dict:
+    """query_id -> text, from a TSV/CSV with query_id and text columns."""
+    df = pd.read_csv(path, sep="\t" if path.endswith(".tsv") else ",", dtype=str)
+    return dict(zip(df["query_id"], df["text"].fillna("")))
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Offline ranking evaluation")
+    ap.add_argument("--qrels", required=True)
+    ap.add_argument("--run", help="score an existing run file")
+    ap.add_argument("--backend", choices=["tfidf", "dense", "hybrid"], help="or run a backend live")
+    ap.add_argument("--queries", help="query_id/text file for --backend")
+    ap.add_argument("--id-column", default=None, help="job id column in the index metadata")
+    ap.add_argument("--ann", action="store_true",
+                    help="use the verified ANN index for --backend dense/hybrid")
+    ap.add_argument("--nprobe", type=int, default=None, help="ANN probes for --backend dense")
+    ap.add_argument("--exact", action="store_true", help="exact search for --backend dense")
+    ap.add_argument("--fusion", choices=["rrf", "weighted"], default="rrf",
+                    help="score fusion for --backend hybrid")
+    ap.add_argument("--k", type=int, nargs="+", default=[5, 10])
+    ap.add_argument("--per-query", help="write per-query metrics CSV here")
+    args = ap.parse_args(argv)
+
+    qrels = load_qrels(args.qrels)
+    latencies = []
+    if args.run:
+        run = load_run(args.run)
+    elif args.backend and args.queries:
+        kwargs = {}
+        if args.backend == "dense":
+            kwargs = {"nprobe": args.nprobe, "exact": args.exact, "use_ann": args.ann}
+        elif args.backend == "hybrid":
+            kwargs = {"fusion": args.fusion, "use_ann": args.ann}
+        search = make_backend(args.backend, args.id_column, **kwargs)
+        run, latencies = run_backend(search, load_queries(args.queries), max(args.k))
+    else:
+        ap.error("give --run, or --backend with --queries")
+
+    metrics, per_query = evaluate_run(qrels, run, ks=args.k)
+    metrics.update(latency_summary(latencies))
+    print(f"queries: {len(per_query)}")
+    for name, value in metrics.items():
+        print(f"{name:<16} {value:.4f}")
+    if args.per_query:
+        per_query.to_csv(args.per_query)
+
+
 if __name__ == "__main__":
-    # Example usage—replace with your labeled test set
-    true = ["job1","job2","job3"]
-    recs = ["job2","job4","job1","job5"]
-    print("P@3:", precision_at_k(true, recs, k=3))
+    main()
@@ -0,0 +1,319 @@
+# src/models/ann_index.py
+
+import os
+import json
+import time
+import numpy as np
+
+from src.models.topk import top_k_rows, blocked_top_k
+
+ANN_SUBDIR = "ann"   # inside the job index directory
+# an ANN index is only saved and served when it finds at least this share
+# of the exact top-k (and answers faster than exact search)
+MIN_RECALL = 0.95
+NPROBES    = (4, 8, 16, 32, 64, 128)
+
+
+def _sq_dists(x: np.ndarray, centroids: np.ndarray, c_sq: np.ndarray) -> np.ndarray:
+    # ||x - c||^2 up to the per-row constant ||x||^2
+    return c_sq[None, :] - 2.0 * (x @ centroids.T)
+
+
+def _assign(x: np.ndarray, centroids: np.ndarray, chunk: int = 65536) -> np.ndarray:
+    c_sq = (centroids ** 2).sum(axis=1)
+    out = np.empty(x.shape[0], dtype=np.int64)
+    for start in range(0, x.shape[0], chunk):
+        block = np.asarray(x[start:start + chunk], dtype=np.float32)
+        out[start:start + chunk] = _sq_dists(block, centroids, c_sq).argmin(axis=1)
+    return out
+
+
+def kmeans(x: np.ndarray, k: int, n_iter: int = 20, seed: int = 0,
+           max_points_per_centroid: int = 256) -> np.ndarray:
+    """
+    Plain Lloyd's k-means in numpy. Trains on at most
+    `k * max_points_per_centroid` sampled rows; empty clusters are reseeded
+    from random training points.
+    """
+    rng = np.random.default_rng(seed)
+    n = x.shape[0]
+    k = min(k, n)
+    if n > k * max_points_per_centroid:
+        x = x[np.sort(rng.choice(n, k * max_points_per_centroid, replace=False))]
+    x = np.asarray(x, dtype=np.float32)
+    centroids = x[rng.choice(x.shape[0], k, replace=False)].copy()
+
+    for _ in range(n_iter):
+        labels = _assign(x, centroids)
+        counts = np.bincount(labels, minlength=k)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, labels, x)
+        nonempty = counts > 0
+        centroids[nonempty] = sums[nonempty] / counts[nonempty, None]
+        empty = np.flatnonzero(~nonempty)
+        if empty.size:
+            centroids[empty] = x[rng.choice(x.shape[0], empty.size, replace=False)]
+    return centroids
+
+
+def auto_n_lists(n_rows: int) -> int:
+    return int(max(1, min(n_rows, round(4 * np.sqrt(n_rows)))))
+
+
+def auto_pq_m(dim: int) -> int:
+    """Largest divisor of `dim` that gives sub-vectors of at least 8 dims."""
+    for m in range(max(1, dim // 8), 0, -1):
+        if dim % m == 0:
+            return m
+    return 1
+
+
+class IVFIndex:
+    """
+    Inverted-file ANN index over L2-normalized vectors. Rows are bucketed
+    by a k-means coarse quantizer and stored contiguously per list; a query
+    scores only the `nprobe` closest lists. With `pq_m > 0` the residuals
+    (vector minus its centroid) are product-quantized to `pq_m` one-byte
+    codes per row, and scored through per-query lookup tables. If the full
+    vectors are attached (e.g. the memory-mapped job index), the best
+    `k * refine` PQ candidates are re-scored exactly. `recall` is the
+    recall@k measured by tune_nprobe() at the stored `nprobe`.
+    """
+
+    def __init__(self, n_lists: int, pq_m: int = 0, pq_bits: int = 8,
+                 nprobe: int = 8, refine: int = 4, recall: float = None):
+        if pq_bits > 8:
+            raise ValueError("pq_bits above 8 is not supported")
+        self.n_lists   = n_lists
+        self.pq_m      = pq_m
+        self.pq_bits   = pq_bits
+        self.nprobe    = nprobe
+        self.refine    = refine
+        self.recall    = recall
+        self.vectors   = None   # optional full vectors for PQ refinement
+        self.centroids = None   # (n_lists, dim)
+        self.codebooks = None   # (pq_m, ksub, dim // pq_m)
+        self.offsets   = None   # (n_lists + 1,) list boundaries into ids/data
+        self.ids       = None   # (rows,) original row id per stored slot
+        self.data      = None   # (rows, dim) float32 or (rows, pq_m) uint8
+
+    # ── building ────────────────────────────────────────────────────────────
+    @classmethod
+    def build(cls, x: np.ndarray, n_lists: int = None, pq_m: int = 0,
+              pq_bits: int = 8, nprobe: int = 8, seed: int = 0) -> "IVFIndex":
+        n_lists = n_lists or auto_n_lists(x.shape[0])
+        index = cls(n_lists, pq_m=pq_m, pq_bits=pq_bits, nprobe=nprobe)
+        index.train(x, seed=seed)
+        index.add(x)
+        return index
+
+    def train(self, x: np.ndarray, seed: int = 0):
+        self.centroids = kmeans(x, self.n_lists, seed=seed)
+        self.n_lists = self.centroids.shape[0]
+        if self.pq_m:
+            dim = x.shape[1]
+            if dim % self.pq_m:
+                raise ValueError(f"pq_m={self.pq_m} does not divide dim={dim}")
+            rng = np.random.default_rng(seed)
+            sample = x[np.sort(rng.choice(x.shape[0], min(x.shape[0], 65536), replace=False))]
+            sample = np.asarray(sample, dtype=np.float32)
+            resid = sample - self.centroids[_assign(sample, self.centroids)]
+            ksub = 1 << self.pq_bits
+            dsub = dim // self.pq_m
+            self.codebooks = np.stack([
+                self._pad_codebook(kmeans(resid[:, j * dsub:(j + 1) * dsub], ksub, seed=seed + j), ksub)
+                for j in range(self.pq_m)
+            ])
+
+    @staticmethod
+    def _pad_codebook(cb: np.ndarray, ksub: int) -> np.ndarray:
+        # tiny training sets yield fewer than ksub centroids; pad with copies
+        if cb.shape[0] < ksub:
+            cb = np.concatenate([cb, np.repeat(cb[:1], ksub - cb.shape[0], axis=0)])
+        return cb
+
+    def _encode(self, resid: np.ndarray) -> np.ndarray:
+        dsub = resid.shape[1] // self.pq_m
+        codes = np.empty((resid.shape[0], self.pq_m), dtype=np.uint8)
+        for j in range(self.pq_m):
+            codes[:, j] = _assign(resid[:, j * dsub:(j + 1) * dsub], self.codebooks[j])
+        return codes
+
+    def add(self, x: np.ndarray, chunk: int = 65536):
+        """(Re)build the inverted lists from the full vector set `x`."""
+        labels = _assign(x, self.centroids)
+        order  = np.argsort(labels, kind="stable")
+        counts = np.bincount(labels, minlength=self.n_lists)
+        self.offsets = np.concatenate([[0], np.cumsum(counts)]).astype(np.int64)
+        self.ids = order.astype(np.int64)
+
+        if self.pq_m:
+            self.data = np.empty((x.shape[0], self.pq_m), dtype=np.uint8)
+        else:
+            self.data = np.empty(x.shape, dtype=np.float32)
+        for start in range(0, x.shape[0], chunk):
+            rows  = order[start:start + chunk]
+            block = np.asarray(x[rows], dtype=np.float32)
+            if self.pq_m:
+                block = self._encode(block - self.centroids[labels[rows]])
+            self.data[start:start + chunk] = block
+
+    # ── querying ────────────────────────────────────────────────────────────
+    def attach_vectors(self, vectors: np.ndarray):
+        """Use `vectors` (row ids as passed to add) to refine PQ results."""
+        self.vectors = vectors
+        return self
+
+    def search(self, queries: np.ndarray, k: int = 10, nprobe: int = None,
+               refine: int = None, chunk: int = 64):
+        """
+        Approximate inner-product top-k. Returns (indices, scores) shaped
+        (queries, k); slots with fewer than k candidates are padded with
+        index -1 and score -inf. Queries are scored `chunk` at a time, all
+        their probed lists at once.
+        """
+        nprobe  = min(nprobe or self.nprobe, self.n_lists)
+        refine  = self.refine if refine is None else refine
+        refine  = refine if (self.pq_m and self.vectors is not None and refine > 1) else 1
+        queries = np.array(queries, dtype=np.float32, ndmin=2)
+        c_sq    = (self.centroids ** 2).sum(axis=1)
+
+        out_idx    = np.full((queries.shape[0], k), -1, dtype=np.int64)
+        out_scores = np.full((queries.shape[0], k), -np.inf, dtype=np.float32)
+        for start in range(0, queries.shape[0], chunk):
+            q = queries[start:start + chunk]
+            coarse_ip = q @ self.centroids.T
+            probes, _ = top_k_rows(-(c_sq[None, :] - 2.0 * coarse_ip), nprobe)
+            idx, sc = self._search_probes(q, probes, coarse_ip, k, refine)
+            out_idx[start:start + chunk, :idx.shape[1]]    = idx
+            out_scores[start:start + chunk, :sc.shape[1]] = sc
+        return out_idx, out_scores
+
+    def _search_probes(self, q, probes, coarse_ip, k, refine):
+        n_q    = q.shape[0]
+        starts = self.offsets[probes]
+        sizes  = (self.offsets[probes + 1] - starts).ravel()
+        total  = int(sizes.sum())
+        if not total:
+            return np.empty((n_q, 0), dtype=np.int64), np.empty((n_q, 0), dtype=np.float32)
+        # one flat entry per (query, stored slot) over every probed list
+        q_of   = np.repeat(np.repeat(np.arange(n_q), probes.shape[1]), sizes)
+        run_at = np.repeat(np.cumsum(sizes) - sizes, sizes)
+        slots  = np.repeat(starts.ravel(), sizes) + np.arange(total) - run_at
+        per_q  = np.bincount(q_of, minlength=n_q)
+        col    = np.arange(total) - np.repeat(np.cumsum(per_q) - per_q, per_q)
+
+        if self.pq_m:
+            dsub = q.shape[1] // self.pq_m
+            lut = np.einsum("mkd,qmd->qmk", self.codebooks, q.reshape(n_q, self.pq_m, dsub))
+            codes = np.asarray(self.data[slots])
+            flat = lut[q_of[:, None], np.arange(self.pq_m)[None, :], codes].sum(axis=1)
+            flat += coarse_ip[q_of, np.repeat(probes.ravel(), sizes)]
+        else:
+            flat = np.einsum("td,td->t", np.asarray(self.data[slots]), q[q_of])
+
+        scores = np.full((n_q, int(per_q.max())), -np.inf, dtype=np.float32)
+        ids    = np.full(scores.shape, -1, dtype=np.int64)
+        scores[q_of, col] = flat
+        ids[q_of, col]    = self.ids[slots]
+        ids, scores = top_k_rows(scores, k * refine, ids)
+        if refine > 1:
+            # exact re-score; unique (sorted) ids keep memory-mapped reads sequential
+            valid = np.isfinite(scores)
+            uniq, inv = np.unique(ids[valid], return_inverse=True)
+            vecs = np.asarray(self.vectors[uniq], dtype=np.float32)
+            scores = np.full(ids.shape, -np.inf, dtype=np.float32)
+            scores[valid] = np.einsum("td,td->t", vecs[inv.ravel()],
+                                      q[np.nonzero(valid)[0]])
+            ids, scores = top_k_rows(scores, k, ids)
+        ids = np.where(np.isfinite(scores), ids, -1)
+        return ids, scores
+
+    def memory_bytes(self) -> int:
+        parts = [self.centroids, self.codebooks, self.offsets, self.ids, self.data]
+        return int(sum(p.nbytes for p in parts if p is not None))
+
+    # ── persistence ─────────────────────────────────────────────────────────
+    _ARRAYS = ("centroids", "codebooks", "offsets", "ids", "data")
+
+    def save(self, index_dir: str):
+        os.makedirs(index_dir, exist_ok=True)
+        for name in self._ARRAYS:
+            arr = getattr(self, name)
+            if arr is not None:
+                np.save(os.path.join(index_dir, f"{name}.npy"), arr)
+        with open(os.path.join(index_dir, "params.json"), "w") as f:
+            json.dump({"n_lists": self.n_lists, "pq_m": self.pq_m,
+                       "pq_bits": self.pq_bits, "nprobe": self.nprobe,
+                       "refine": self.refine, "recall": self.recall}, f, indent=2)
+
+    @classmethod
+    def load(cls, index_dir: str, mmap: bool = True) -> "IVFIndex":
+        with open(os.path.join(index_dir, "params.json")) as f:
+            index = cls(**json.load(f))
+        for name in cls._ARRAYS:
+            path = os.path.join(index_dir, f"{name}.npy")
+            if os.path.exists(path):
+                setattr(index, name, np.load(path, mmap_mode="r" if mmap else None))
+        # small and touched by every query; keep them resident
+        index.centroids = np.asarray(index.centroids)
+        index.offsets   = np.asarray(index.offsets)
+        return index
+
+
+def recall_at_k(approx: np.ndarray, exact: np.ndarray) -> float:
+    """Mean share of each exact top-k row found in the approximate one."""
+    k = exact.shape[1]
+    return float(np.mean([len(set(a) & set(e)) / k for a, e in zip(approx, exact)]))
+
+
+def tune_nprobe(index: IVFIndex, vectors: np.ndarray, k: int = 10, n_queries: int = 200,
+                min_recall: float = MIN_RECALL, nprobes=NPROBES, seed: int = 0) -> dict:
+    """
+    Find the smallest nprobe whose recall@k against exact search over
+    `vectors` reaches `min_recall` while still answering faster than
+    exact search. Queries are sampled rows of `vectors`; each query's own
+    row is left out of both result lists. On success the index's nprobe
+    and recall are set. Returns the measurements, with "ok" telling
+    whether any nprobe qualified.
+    """
+    rng  = np.random.default_rng(seed)
+    rows = np.sort(rng.choice(vectors.shape[0], min(n_queries, vectors.shape[0]), replace=False))
+    queries = np.asarray(vectors[rows], dtype=np.float32)
+
+    def without_self(idx):
+        return np.array([[i for i in r if i != row][:k] for r, row in zip(idx, rows)])
+
+    t0 = time.perf_counter()
+    exact, _ = blocked_top_k(queries, vectors, k=k + 1)
+    exact_ms = (time.perf_counter() - t0) * 1000 / len(rows)
+    exact = without_self(exact)
+
+    report = {"ok": False, "min_recall": min_recall, "exact_ms": exact_ms, "probes": []}
+    for nprobe in nprobes:
+        if nprobe > index.n_lists:
+            break
+        t0 = time.perf_counter()
+        idx, _ = index.search(queries, k=k + 1, nprobe=nprobe)
+        ms = (time.perf_counter() - t0) * 1000 / len(rows)
+        recall = recall_at_k(without_self(idx), exact)
+        report["probes"].append({"nprobe": nprobe, "recall": recall, "ms": ms})
+        if recall >= min_recall:
+            if ms < exact_ms:
+                index.nprobe, index.recall = nprobe, recall
+                report.update(ok=True, nprobe=nprobe, recall=recall, ms=ms)
+            break
+    return report
+
+
+def load_verified(index_dir: str, min_recall: float = MIN_RECALL):
+    """
+    The IVFIndex saved in `index_dir` if it exists and its measured recall
+    meets `min_recall`, else None (callers then search exactly).
+    """
+    if not os.path.exists(os.path.join(index_dir, "params.json")):
+        return None
+    index = IVFIndex.load(index_dir)
+    if index.recall is None or index.recall < min_recall:
+        return None
+    return index
@@ -0,0 +1,216 @@
+# src/models/batch_match.py
+#
+# Offline batch matching: every resume against every job in the on-disk
+# job index. Resumes are streamed and encoded in batches; each batch is
+# scored against the memory-mapped job matrix block by block with a
+# running top-k, so memory stays bounded however large resumes × jobs is.
+# Results go to a directory of Parquet parts, one per resume batch, and
+# a checkpoint lets an interrupted run pick up where it stopped.
+#
+#   python -m src.models.batch_match data/processed/resumes.jsonl \
+#       -o data/processed/matches --k 50
+
+import os
+import sys
+import json
+import time
+import argparse
+import itertools
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from src.models.job_index import load_job_index, INDEX_DIR
+from src.models.topk import l2_normalize, sharded_top_k
+from src.utils.metrics import timer, inc
+
+OUT_DIR         = "data/processed/matches"
+CHECKPOINT_FILE = "_checkpoint.json"
+
+
+def iter_resume_records(path, id_field="path", text_field="text", chunksize=10_000):
+    """
+    Stream (resume_id, text) pairs from a JSONL file (e.g. the output of
+    src.resume_parser.bulk), a CSV or a Parquet file. JSONL records whose
+    "status" is not "ok" are yielded with text None so record positions,
+    which the checkpoint counts, stay stable; batch_match skips them.
+    """
+    ext = os.path.splitext(path)[1].lower()
+    if ext in (".jsonl", ".json"):
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                rec = json.loads(line)
+                text = rec.get(text_field) or ""
+                if rec.get("status", "ok") != "ok":
+                    text = None
+                yield str(rec[id_field]), text
+    elif ext == ".csv":
+        for chunk in pd.read_csv(path, usecols=[id_field, text_field], chunksize=chunksize):
+            for rid, text in zip(chunk[id_field], chunk[text_field].fillna("")):
+                yield str(rid), text
+    elif ext == ".parquet":
+        import pyarrow.parquet as pq
+        for batch in pq.ParquetFile(path).iter_batches(chunksize, columns=[id_field, text_field]):
+            for rid, text in zip(batch.column(0).to_pylist(), batch.column(1).to_pylist()):
+                yield str(rid), text or ""
+    else:
+        raise ValueError(f"Unsupported resume input: {path!r}")
+
+
+def _batches(records, size):
+    it = iter(records)
+    while True:
+        batch = list(itertools.islice(it, size))
+        if not batch:
+            return
+        yield batch
+
+
+def _read_checkpoint(out_dir):
+    path = os.path.join(out_dir, CHECKPOINT_FILE)
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return json.load(f)
+
+
+def _write_checkpoint(out_dir, state):
+    path = os.path.join(out_dir, CHECKPOINT_FILE)
+    tmp  = path + ".tmp"
+    with open(tmp, "w") as f:
+        json.dump(state, f, indent=2)
+    os.replace(tmp, path)
+
+
+def _write_part(out_dir, part, frame):
+    path = os.path.join(out_dir, f"part-{part:05d}.parquet")
+    tmp  = path + ".tmp"
+    frame.to_parquet(tmp, index=False)
+    os.replace(tmp, path)
+    return path
+
+
+def batch_match(resumes_path, out_dir=OUT_DIR, index_dir=INDEX_DIR, k=50,
+                batch_size=256, block_size=32768, workers=None,
+                id_field="path", text_field="text", job_id_column=None,
+                model_name=None, encode_fn=None, restart=False):
+    """
+    Match every resume in `resumes_path` against the job index and write
+    the top `k` jobs per resume to `out_dir` as Parquet parts with columns
+    resume_id, rank, job_row, score (and job_id if `job_id_column` is set).
+
+    Peak scoring memory is about workers × batch_size × block_size × 4
+    bytes; the job matrix itself is only mapped. `encode_fn(texts)`
+    overrides the index's sentence-transformers model. Unless `restart`,
+    an existing checkpoint for the same index and settings is resumed;
+    one for different settings raises ValueError.
+    Returns the final checkpoint dict.
+    """
+    index = load_job_index(index_dir, columns=[job_id_column] if job_id_column else [])
+    if encode_fn is None:
+        from src.models.tower_model import get_recommender
+        model = get_recommender(model_name or index.model_name)
+        encode_fn = lambda texts: model.encode(texts, show_progress_bar=False)
+
+    settings = {
+        "resumes":    os.path.abspath(resumes_path),
+        "index":      index.manifest["checksum"],
+        "k":          k,
+        "batch_size": batch_size,
+    }
+    os.makedirs(out_dir, exist_ok=True)
+    state = None if restart else _read_checkpoint(out_dir)
+    if state is not None and state["settings"] != settings:
+        raise ValueError(f"{out_dir} holds a checkpoint for different settings; "
+                         f"pass restart=True (--restart) to start over")
+    if state is None:
+        for name in os.listdir(out_dir):
+            if name.startswith("part-"):
+                os.remove(os.path.join(out_dir, name))
+        state = {"settings": settings, "resumes_done": 0, "skipped": 0, "parts": 0,
+                 "done": False}
+        _write_checkpoint(out_dir, state)
+    if state["done"]:
+        return state
+
+    job_ids = index.jobs[job_id_column].to_numpy() if job_id_column else None
+    workers = workers or os.cpu_count() or 1
+    records = iter_resume_records(resumes_path, id_field, text_field)
+    records = itertools.islice(records, state["resumes_done"], None)
+
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for batch in _batches(records, batch_size):
+            # failed or empty resumes still count towards the checkpoint
+            # offset but are not matched
+            usable = [(rid, text) for rid, text in batch if text and text.strip()]
+            state["resumes_done"] += len(batch)
+            state["skipped"] = state.get("skipped", 0) + len(batch) - len(usable)
+            if not usable:
+                _write_checkpoint(out_dir, state)
+                continue
+            ids   = [rid for rid, _ in usable]
+            texts = [text for _, text in usable]
+            with timer("batch_match", stage="encode"):
+                queries = l2_normalize(encode_fn(texts))
+            with timer("batch_match", stage="score"):
+                idx, scores = sharded_top_k(queries, index.embeddings, k=k,
+                                            block_size=block_size, workers=workers,
+                                            pool=pool)
+            n, kk = idx.shape
+            frame = pd.DataFrame({
+                "resume_id": np.repeat(ids, kk),
+                "rank":      np.tile(np.arange(1, kk + 1, dtype=np.int16), n),
+                "job_row":   idx.ravel(),
+                "score":     scores.ravel().astype(np.float32),
+            })
+            if job_ids is not None:
+                frame["job_id"] = job_ids[idx.ravel()]
+            # part first, checkpoint second: a crash in between rewrites
+            # the same part number on resume
+            _write_part(out_dir, state["parts"], frame)
+            state["parts"] += 1
+            _write_checkpoint(out_dir, state)
+            inc("batch_match_resumes", len(usable))
+
+            rate = state["resumes_done"] / max(time.perf_counter() - t0, 1e-9)
+            print(f"  {state['resumes_done']} resumes matched ({rate:.1f}/s)", flush=True)
+
+    state["done"] = True
+    _write_checkpoint(out_dir, state)
+    return state
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Match many resumes against the job index.")
+    ap.add_argument("resumes", help="JSONL (from src.resume_parser.bulk), CSV or Parquet")
+    ap.add_argument("-o", "--out", default=OUT_DIR)
+    ap.add_argument("--index-dir", default=INDEX_DIR)
+    ap.add_argument("--k", type=int, default=50)
+    ap.add_argument("--batch-size", type=int, default=256)
+    ap.add_argument("--block-size", type=int, default=32768)
+    ap.add_argument("--workers", type=int, default=None)
+    ap.add_argument("--id-field", default="path")
+    ap.add_argument("--text-field", default="text")
+    ap.add_argument("--job-id-column", default=None, help="e.g. jobUrl")
+    ap.add_argument("--model-name", default=None, help="defaults to the index manifest's model")
+    ap.add_argument("--restart", action="store_true", help="ignore an existing checkpoint")
+    args = ap.parse_args(argv)
+
+    t0 = time.perf_counter()
+    state = batch_match(args.resumes, args.out, args.index_dir, k=args.k,
+                        batch_size=args.batch_size, block_size=args.block_size,
+                        workers=args.workers, id_field=args.id_field,
+                        text_field=args.text_field, job_id_column=args.job_id_column,
+                        model_name=args.model_name, restart=args.restart)
+    print(f"✅ Matched {state['resumes_done'] - state.get('skipped', 0)} resumes "
+          f"({state.get('skipped', 0)} failed or empty skipped) in "
+          f"{time.perf_counter() - t0:.1f}s -> {args.out} ({state['parts']} parts)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,137 @@
+# src/models/embedding_cache.py
+
+import os
+import re
+import json
+import time
+import hashlib
+import numpy as np
+
+CACHE_DIR = "data/processed/embedding_cache"
+
+
+def normalize_text(text) -> str:
+    return re.sub(r"\s+", " ", str(text or "")).strip()
+
+
+def text_key(text) -> bytes:
+    """16-byte digest of the whitespace-normalized text."""
+    return hashlib.blake2b(normalize_text(text).encode("utf-8"), digest_size=16).digest()
+
+
+class EmbeddingCache:
+    """
+    Persistent embedding cache for one encoder configuration, keyed by a
+    hash of the normalized text. Stored as two aligned arrays (keys.npy,
+    vectors.npy) under `<cache_dir>/<model name>[-seq<max_seq_length>]/`,
+    plus meta.json with the measured encode cost so each run can report
+    the time it saved. Vectors truncated at another max_seq_length, or
+    from another model, live in another directory and are never reused.
+    """
+
+    def __init__(self, model_name: str, max_seq_length: int = None,
+                 cache_dir: str = CACHE_DIR):
+        self.model_name = model_name
+        self.max_seq_length = max_seq_length
+        name = re.sub(r"[^\w.-]+", "_", model_name)
+        if max_seq_length:
+            name += f"-seq{int(max_seq_length)}"
+        self.path = os.path.join(cache_dir, name)
+        self.keys    = np.empty(0, dtype="S16")
+        self.vectors = None
+        self.meta    = {"model_name": model_name, "max_seq_length": max_seq_length,
+                        "seconds_per_text": None}
+        self.load()
+
+    def __len__(self):
+        return len(self.keys)
+
+    def load(self):
+        meta_path = os.path.join(self.path, "meta.json")
+        if not os.path.exists(meta_path):
+            return
+        with open(meta_path) as f:
+            meta = json.load(f)
+        if (meta.get("model_name"), meta.get("max_seq_length")) != \
+                (self.model_name, self.max_seq_length):
+            return
+        self.meta    = meta
+        self.keys    = np.load(os.path.join(self.path, "keys.npy"))
+        self.vectors = np.load(os.path.join(self.path, "vectors.npy"))
+
+    def save(self):
+        os.makedirs(self.path, exist_ok=True)
+        # write-then-rename so an interrupted run leaves the old cache intact
+        for name, arr in (("keys", self.keys), ("vectors", self.vectors)):
+            tmp = os.path.join(self.path, f"{name}.tmp.npy")
+            np.save(tmp, arr)
+            os.replace(tmp, os.path.join(self.path, f"{name}.npy"))
+        with open(os.path.join(self.path, "meta.json"), "w") as f:
+            json.dump(self.meta, f, indent=2)
+
+    def encode(self, texts: list, encode_fn, prune: bool = True):
+        """
+        Return embeddings for `texts`, calling `encode_fn(list[str])` only
+        for texts whose key is not cached yet. With `prune`, entries for
+        texts no longer present are dropped so the cache tracks the corpus.
+        Returns (embeddings, stats) where stats has hits, misses,
+        encode_seconds and an estimate of saved_seconds.
+        """
+        if not len(texts):
+            empty = {"hits": 0, "misses": 0, "encoded": 0,
+                     "encode_seconds": 0.0, "saved_seconds": 0.0}
+            return np.empty((0, 0), dtype=np.float32), empty
+
+        keys = np.array([text_key(t) for t in texts], dtype="S16")
+        uniq, inverse = np.unique(keys, return_inverse=True)
+
+        if len(self.keys):
+            order = np.argsort(self.keys)
+            sorted_keys = self.keys[order]
+            pos = np.clip(np.searchsorted(sorted_keys, uniq), 0, len(sorted_keys) - 1)
+            hit = sorted_keys[pos] == uniq
+            src = order[pos]
+        else:
+            hit = np.zeros(len(uniq), dtype=bool)
+            src = np.zeros(len(uniq), dtype=np.int64)
+
+        miss_rows = np.flatnonzero(~hit)
+        first_of  = np.full(len(uniq), -1, dtype=np.int64)
+        first_of[inverse[::-1]] = np.arange(len(texts))[::-1]
+
+        encode_seconds = 0.0
+        new_vecs = None
+        if len(miss_rows):
+            t0 = time.perf_counter()
+            new_vecs = np.asarray(
+                encode_fn([normalize_text(texts[i]) for i in first_of[miss_rows]]),
+                dtype=np.float32,
+            )
+            encode_seconds = time.perf_counter() - t0
+            self.meta["seconds_per_text"] = encode_seconds / len(miss_rows)
+
+        dim = new_vecs.shape[1] if new_vecs is not None else self.vectors.shape[1]
+        uniq_vecs = np.empty((len(uniq), dim), dtype=np.float32)
+        if hit.any():
+            uniq_vecs[hit] = self.vectors[src[hit]]
+        if new_vecs is not None:
+            uniq_vecs[miss_rows] = new_vecs
+
+        if prune:
+            self.keys, self.vectors = uniq, uniq_vecs
+        else:
+            old_only = ~np.isin(self.keys, uniq)
+            self.keys = np.concatenate([self.keys[old_only], uniq])
+            self.vectors = (np.concatenate([self.vectors[old_only], uniq_vecs])
+                            if self.vectors is not None else uniq_vecs)
+
+        n_hits = int(hit[inverse].sum())
+        per_text = self.meta.get("seconds_per_text") or 0.0
+        stats = {
+            "hits":           n_hits,
+            "misses":         len(texts) - n_hits,
+            "encoded":        int(len(miss_rows)),
+            "encode_seconds": encode_seconds,
+            "saved_seconds":  per_text * int(hit.sum()),
+        }
+        return uniq_vecs[inverse], stats
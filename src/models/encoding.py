@@ -0,0 +1,279 @@
+# src/models/encoding.py
+#
+# Throughput-oriented sentence encoding for large corpora.
+#
+# Texts are consumed as a stream in chunks; inside each chunk they are
+# sorted by length and cut into batches, so short descriptions are not
+# padded up to long ones. Batches run in-process or on a pool of worker
+# processes (each holding its own copy of the model), and every batch is
+# written straight into a preallocated or memory-mapped float32 array at
+# its original row positions.
+#
+#   python -m src.models.encoding data/processed/jobs_processed.csv \
+#       --out data/processed/embeddings.npy --workers 4 --max-seq-length 256
+
+import os
+import sys
+import time
+import argparse
+import itertools
+import multiprocessing
+from contextlib import contextmanager, nullcontext
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from src.utils.metrics import timer, inc
+
+# characters kept per token of max_seq_length before tokenizing; anything
+# beyond would be truncated by the tokenizer anyway
+CHARS_PER_TOKEN = 8
+
+
+def _load_model(model_name_or_path, max_seq_length, device=None):
+    from sentence_transformers import SentenceTransformer
+    model = SentenceTransformer(model_name_or_path, device=device)
+    if max_seq_length:
+        model.max_seq_length = max_seq_length
+    return model
+
+
+# per-worker-process state, set by _init_worker
+_worker_model = None
+
+
+def _init_worker(model_name_or_path, max_seq_length, threads):
+    global _worker_model
+    import torch
+    torch.set_num_threads(threads)
+    _worker_model = _load_model(model_name_or_path, max_seq_length, device="cpu")
+
+
+def _worker_dim():
+    return _worker_model.get_sentence_embedding_dimension()
+
+
+def _encode_batch_worker(args):
+    texts, normalize = args
+    return _encode(_worker_model, texts, normalize)
+
+
+def _encode(model, texts, normalize):
+    out = model.encode(texts, batch_size=len(texts), convert_to_numpy=True,
+                       show_progress_bar=False, normalize_embeddings=normalize)
+    return np.asarray(out, dtype=np.float32)
+
+
+@contextmanager
+def _max_seq_length(model, max_seq_length):
+    """Set `model.max_seq_length` for the with block and restore it afterwards."""
+    if not max_seq_length or not hasattr(model, "max_seq_length"):
+        yield
+        return
+    saved = model.max_seq_length
+    model.max_seq_length = max_seq_length
+    try:
+        yield
+    finally:
+        model.max_seq_length = saved
+
+
+def length_sorted_batches(texts, batch_size):
+    """
+    Positions of `texts` grouped into batches of similar length, longest
+    first (so the slowest batches start early on a pool).
+    """
+    order = np.argsort([-len(t) for t in texts], kind="stable")
+    return [order[i:i + batch_size] for i in range(0, len(order), batch_size)]
+
+
+class EncodingEngine:
+    """
+    Encodes an iterable of texts into a float32 (n, dim) array.
+
+    `model` may be a loaded SentenceTransformer (or anything with its
+    encode() / get_sentence_embedding_dimension()); otherwise one is loaded
+    from `model_name_or_path`, which can be a local directory. A passed-in
+    model's max_seq_length is only overridden while encode() runs. With
+    `workers` > 1 batches are encoded on that many (spawned) processes,
+    each using `threads_per_worker` torch threads; the embedding size then
+    comes from `dim`, `model` or a worker, so the parent never loads a
+    model of its own.
+    """
+
+    def __init__(self, model_name_or_path="all-MiniLM-L6-v2", batch_size: int = 64,
+                 max_seq_length: int = 256, workers: int = 1, threads_per_worker: int = 1,
+                 chunk_size: int = 8192, normalize: bool = False, model=None,
+                 dim: int = None):
+        self.model_name_or_path = model_name_or_path
+        self.batch_size         = batch_size
+        self.max_seq_length     = max_seq_length
+        self.workers            = workers or 1
+        self.threads_per_worker = threads_per_worker
+        self.chunk_size         = chunk_size
+        self.normalize          = normalize
+        self._model             = model
+        self._dim               = dim
+        self._pool              = None
+        self.last_stats         = None
+
+    @property
+    def model(self):
+        if self._model is None:
+            self._model = _load_model(self.model_name_or_path, self.max_seq_length)
+        return self._model
+
+    @property
+    def dim(self) -> int:
+        if self._dim is None:
+            pool = self._pool_or_none()
+            if self._model is None and pool is not None:
+                self._dim = pool.submit(_worker_dim).result()
+            else:
+                self._dim = self.model.get_sentence_embedding_dimension()
+        return self._dim
+
+    def _pool_or_none(self):
+        if self.workers <= 1:
+            return None
+        if self._pool is None:
+            # spawn, not fork: the parent may already have torch loaded
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.workers, mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(self.model_name_or_path, self.max_seq_length,
+                          self.threads_per_worker))
+        return self._pool
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _truncate(self, text):
+        text = "" if text is None else str(text)
+        if self.max_seq_length:
+            return text[:self.max_seq_length * CHARS_PER_TOKEN]
+        return text
+
+    def encode(self, texts, n: int = None, out: np.ndarray = None,
+               out_path: str = None, verbose: bool = False) -> np.ndarray:
+        """
+        Encode `texts` (any iterable; only one chunk is held at a time) into
+        `out`, a new memory-mapped .npy at `out_path`, or a new in-memory
+        array. `n` is the number of texts, needed up front for `out_path`
+        when `texts` has no len(). Stats (sentences, seconds,
+        sentences_per_sec) are kept in `last_stats`.
+        """
+        if n is None and hasattr(texts, "__len__"):
+            n = len(texts)
+        if out is None and out_path is not None:
+            if n is None:
+                raise ValueError("n is required to memory-map an output for a text stream")
+            os.makedirs(os.path.dirname(out_path) or ".", exist_ok=True)
+            out = np.lib.format.open_memmap(out_path, mode="w+", dtype=np.float32,
+                                            shape=(n, self.dim))
+        elif out is None and n is not None:
+            out = np.empty((n, self.dim), dtype=np.float32)
+        parts = [] if out is None else None
+
+        pool = self._pool_or_none()
+        seq_limit = nullcontext() if pool is not None else \
+            _max_seq_length(self.model, self.max_seq_length)
+        t0, done = time.perf_counter(), 0
+        it = iter(texts)
+        with timer("encode_corpus", workers=self.workers), seq_limit:
+            while True:
+                chunk = [self._truncate(t) for t in itertools.islice(it, self.chunk_size)]
+                if not chunk:
+                    break
+                batches = length_sorted_batches(chunk, self.batch_size)
+                if pool is None:
+                    results = (_encode(self.model, [chunk[i] for i in b], self.normalize)
+                               for b in batches)
+                else:
+                    results = pool.map(_encode_batch_worker,
+                                       [([chunk[i] for i in b], self.normalize) for b in batches])
+                block = np.empty((len(chunk), self.dim), dtype=np.float32) if out is None else None
+                for b, vecs in zip(batches, results):
+                    if out is None:
+                        block[b] = vecs
+                    else:
+                        out[done + b] = vecs
+                if block is not None:
+                    parts.append(block)
+                done += len(chunk)
+                if verbose:
+                    rate = done / max(time.perf_counter() - t0, 1e-9)
+                    print(f"  {done:,} texts encoded ({rate:,.1f} sentences/s)", flush=True)
+
+        seconds = time.perf_counter() - t0
+        if out is None:
+            out = np.concatenate(parts) if parts else np.empty((0, self.dim), dtype=np.float32)
+        elif n is not None and done != n:
+            raise ValueError(f"expected {n} texts, got {done}")
+        if isinstance(out, np.memmap):
+            out.flush()
+        inc("encode_texts", done)
+        self.last_stats = {"sentences": done, "seconds": seconds,
+                           "sentences_per_sec": done / seconds if seconds else 0.0}
+        return out
+
+
+def _iter_texts(path, column="description", chunksize=50_000):
+    ext = os.path.splitext(path)[1].lower()
+    if ext == ".csv":
+        import pandas as pd
+        for chunk in pd.read_csv(path, usecols=[column], chunksize=chunksize):
+            yield from chunk[column].fillna("").astype(str)
+    elif ext == ".parquet":
+        import pyarrow.parquet as pq
+        for batch in pq.ParquetFile(path).iter_batches(chunksize, columns=[column]):
+            yield from (t or "" for t in batch.column(0).to_pylist())
+    else:
+        with open(path, encoding="utf-8") as f:
+            yield from (line.rstrip("\n") for line in f)
+
+
+def _count_texts(path, column="description"):
+    ext = os.path.splitext(path)[1].lower()
+    if ext == ".parquet":
+        import pyarrow.parquet as pq
+        return pq.ParquetFile(path).metadata.num_rows
+    return sum(1 for _ in _iter_texts(path, column))
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Encode a text corpus into a .npy matrix.")
+    ap.add_argument("input", help="CSV/Parquet with a text column, or a text file (one per line)")
+    ap.add_argument("--out", required=True, help="output .npy (memory-mapped while writing)")
+    ap.add_argument("--column", default="description")
+    ap.add_argument("--model", default="all-MiniLM-L6-v2", help="model name or local path")
+    ap.add_argument("--batch-size", type=int, default=64)
+    ap.add_argument("--max-seq-length", type=int, default=256)
+    ap.add_argument("--workers", type=int, default=1)
+    ap.add_argument("--threads-per-worker", type=int, default=1)
+    ap.add_argument("--chunk-size", type=int, default=8192)
+    ap.add_argument("--normalize", action="store_true")
+    args = ap.parse_args(argv)
+
+    n = _count_texts(args.input, args.column)
+    with EncodingEngine(args.model, batch_size=args.batch_size,
+                        max_seq_length=args.max_seq_length, workers=args.workers,
+                        threads_per_worker=args.threads_per_worker,
+                        chunk_size=args.chunk_size, normalize=args.normalize) as engine:
+        engine.encode(_iter_texts(args.input, args.column), n=n, out_path=args.out, verbose=True)
+        stats = engine.last_stats
+    print(f"✅ Encoded {stats['sentences']:,} texts in {stats['seconds']:.1f}s "
+          f"({stats['sentences_per_sec']:,.1f} sentences/s) -> {args.out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
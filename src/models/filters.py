@@ -0,0 +1,209 @@
+# src/models/filters.py
+
+import os
+import re
+import json
+import numpy as np
+import pandas as pd
+
+FILTERS_FILE = "filters.npz"
+LOCATION_COLUMNS = ["locationShort", "locationLong", "location"]
+
+US_STATES = {
+    "alabama": "al", "alaska": "ak", "arizona": "az", "arkansas": "ar", "california": "ca",
+    "colorado": "co", "connecticut": "ct", "delaware": "de", "florida": "fl", "georgia": "ga",
+    "hawaii": "hi", "idaho": "id", "illinois": "il", "indiana": "in", "iowa": "ia",
+    "kansas": "ks", "kentucky": "ky", "louisiana": "la", "maine": "me", "maryland": "md",
+    "massachusetts": "ma", "michigan": "mi", "minnesota": "mn", "mississippi": "ms",
+    "missouri": "mo", "montana": "mt", "nebraska": "ne", "nevada": "nv", "new hampshire": "nh",
+    "new jersey": "nj", "new mexico": "nm", "new york": "ny", "north carolina": "nc",
+    "north dakota": "nd", "ohio": "oh", "oklahoma": "ok", "oregon": "or", "pennsylvania": "pa",
+    "rhode island": "ri", "south carolina": "sc", "south dakota": "sd", "tennessee": "tn",
+    "texas": "tx", "utah": "ut", "vermont": "vt", "virginia": "va", "washington": "wa",
+    "west virginia": "wv", "wisconsin": "wi", "wyoming": "wy", "district of columbia": "dc",
+}
+
+_SALARY_NUM = re.compile(r"\$?\s*(\d[\d,]*(?:\.\d+)?)\s*([kK])?")
+HOURS_PER_YEAR = 2080
+
+
+def location_terms(value) -> set:
+    """
+    Lookup terms for one location string: the whole string and each
+    comma-separated part, lowercased, with US state names mapped to codes.
+    "San Francisco, CA 94105" -> {"san francisco, ca 94105", "san francisco", "ca"}.
+    """
+    if not isinstance(value, str) or not value.strip():
+        return set()
+    value = " ".join(value.lower().split())
+    terms = {value}
+    for part in value.split(","):
+        part = re.sub(r"\b\d{5}(?:-\d{4})?\b", "", part).strip()
+        if part:
+            terms.add(US_STATES.get(part, part))
+    return terms
+
+
+def normalize_location(query: str) -> str:
+    query = " ".join(str(query).lower().split())
+    return US_STATES.get(query, query)
+
+
+def parse_salary(text):
+    """
+    (low, high) yearly salary from text like "$80k", "$80k–$100k", "80-100k",
+    "$85,000 - $95,000 a year" or "$40 an hour"; None if no amount found.
+    """
+    if not isinstance(text, str):
+        return None
+    found = [(float(n.replace(",", "")), bool(k)) for n, k in _SALARY_NUM.findall(text)]
+    found = [(n, k) for n, k in found if n > 0][:2]
+    if not found:
+        return None
+    # "80-100k": a trailing k covers both ends of the range
+    if any(k for _, k in found):
+        found = [(n, k or n < 1000) for n, k in found]
+    nums = [n * (1000 if k else 1) for n, k in found]
+    lo, hi = min(nums), max(nums)
+    if re.search(r"\b(hour|hr|hourly)\b", text, re.IGNORECASE):
+        lo, hi = lo * HOURS_PER_YEAR, hi * HOURS_PER_YEAR
+    return lo, hi
+
+
+def _salary_bounds(jobs: pd.DataFrame):
+    lo = pd.to_numeric(jobs.get("salaryMin"), errors="coerce") if "salaryMin" in jobs else None
+    hi = pd.to_numeric(jobs.get("salaryMax"), errors="coerce") if "salaryMax" in jobs else None
+    lo = lo.to_numpy(dtype=np.float64, copy=True) if lo is not None else np.full(len(jobs), np.nan)
+    hi = hi.to_numpy(dtype=np.float64, copy=True) if hi is not None else np.full(len(jobs), np.nan)
+    if "salaryText" in jobs:
+        missing = np.isnan(lo) & np.isnan(hi)
+        for i in np.flatnonzero(missing):
+            parsed = parse_salary(jobs["salaryText"].iat[i])
+            if parsed:
+                lo[i], hi[i] = parsed
+    lo = np.where(np.isnan(lo), hi, lo)
+    hi = np.where(np.isnan(hi), lo, hi)
+    return lo, hi
+
+
+class _InvertedLists:
+    """term -> sorted row ids, stored as one flat array plus offsets."""
+
+    def __init__(self, terms, offsets, rows):
+        self.terms   = list(terms)
+        self.lookup  = {t: i for i, t in enumerate(self.terms)}
+        self.offsets = offsets
+        self.rows    = rows
+
+    @classmethod
+    def build(cls, term_sets):
+        postings = {}
+        for row, terms in enumerate(term_sets):
+            for t in terms:
+                postings.setdefault(t, []).append(row)
+        terms = sorted(postings)
+        sizes = [len(postings[t]) for t in terms]
+        offsets = np.concatenate([[0], np.cumsum(sizes)]).astype(np.int64)
+        rows = (np.concatenate([np.asarray(postings[t], dtype=np.int64) for t in terms])
+                if terms else np.empty(0, dtype=np.int64))
+        return cls(terms, offsets, rows)
+
+    def get(self, term) -> np.ndarray:
+        i = self.lookup.get(term)
+        if i is None:
+            return np.empty(0, dtype=np.int64)
+        return self.rows[self.offsets[i]:self.offsets[i + 1]]
+
+
+class FilterIndex:
+    """
+    Pre-filter structures built alongside the job index: inverted lists for
+    profession and location terms (from locationShort/locationLong), and
+    the rows sorted by yearly salary low/high bounds for range queries.
+    select() returns the surviving row ids so scoring can skip the rest.
+    """
+
+    def __init__(self, n_rows, professions, locations, sal_lo_order, sal_lo, sal_hi_order, sal_hi):
+        self.n_rows       = n_rows
+        self.professions  = professions
+        self.locations    = locations
+        self.sal_lo_order = sal_lo_order   # row ids sorted by salary low bound
+        self.sal_lo       = sal_lo         # ... and the sorted bounds
+        self.sal_hi_order = sal_hi_order
+        self.sal_hi       = sal_hi
+
+    @classmethod
+    def build(cls, jobs: pd.DataFrame) -> "FilterIndex":
+        profs = jobs["profession"] if "profession" in jobs else pd.Series([None] * len(jobs))
+        professions = _InvertedLists.build(
+            [{p.lower()} if isinstance(p, str) else set() for p in profs])
+
+        loc_cols = [c for c in LOCATION_COLUMNS if c in jobs.columns]
+        loc_sets = [set() for _ in range(len(jobs))]
+        for col in loc_cols:
+            for row, value in enumerate(jobs[col].tolist()):
+                loc_sets[row] |= location_terms(value)
+        locations = _InvertedLists.build(loc_sets)
+
+        lo, hi = _salary_bounds(jobs)
+        has = np.flatnonzero(~np.isnan(lo))
+        lo_order = has[np.argsort(lo[has], kind="stable")]
+        hi_order = has[np.argsort(hi[has], kind="stable")]
+        return cls(len(jobs), professions, locations,
+                   lo_order, lo[lo_order], hi_order, hi[hi_order])
+
+    def select(self, profession=None, location=None, salary=None):
+        """
+        Row ids (sorted) matching every given filter, or None when no filter
+        is given. `salary` is a (low, high) yearly range or text parsed with
+        parse_salary; jobs without salary data never match a salary filter.
+        """
+        sets = []
+        if profession:
+            sets.append(self.professions.get(str(profession).lower()))
+        if location:
+            sets.append(self.locations.get(normalize_location(location)))
+        if salary is not None:
+            if isinstance(salary, str):
+                salary = parse_salary(salary)
+            if salary:
+                lo, hi = salary
+                # overlap: job_low <= hi and job_high >= lo
+                ok_lo = self.sal_lo_order[:np.searchsorted(self.sal_lo, hi, side="right")]
+                ok_hi = self.sal_hi_order[np.searchsorted(self.sal_hi, lo, side="left"):]
+                sets.append(np.intersect1d(ok_lo, ok_hi))
+        if not sets:
+            return None
+        sets.sort(key=len)
+        rows = np.sort(sets[0])
+        for other in sets[1:]:
+            if not len(rows):
+                break
+            rows = rows[np.isin(rows, other, assume_unique=True)]
+        return rows
+
+    def save(self, index_dir: str):
+        np.savez(
+            os.path.join(index_dir, FILTERS_FILE),
+            n_rows=np.array(self.n_rows),
+            prof_terms=np.array(json.dumps(self.professions.terms)),
+            prof_offsets=self.professions.offsets, prof_rows=self.professions.rows,
+            loc_terms=np.array(json.dumps(self.locations.terms)),
+            loc_offsets=self.locations.offsets, loc_rows=self.locations.rows,
+            sal_lo_order=self.sal_lo_order, sal_lo=self.sal_lo,
+            sal_hi_order=self.sal_hi_order, sal_hi=self.sal_hi,
+        )
+
+    @classmethod
+    def load(cls, index_dir: str) -> "FilterIndex":
+        z = np.load(os.path.join(index_dir, FILTERS_FILE))
+        return cls(
+            int(z["n_rows"]),
+            _InvertedLists(json.loads(str(z["prof_terms"])), z["prof_offsets"], z["prof_rows"]),
+            _InvertedLists(json.loads(str(z["loc_terms"])), z["loc_offsets"], z["loc_rows"]),
+            z["sal_lo_order"], z["sal_lo"], z["sal_hi_order"], z["sal_hi"],
+        )
+
+    @staticmethod
+    def exists(index_dir: str) -> bool:
+        return os.path.exists(os.path.join(index_dir, FILTERS_FILE))
@@ -0,0 +1,251 @@
+# src/models/hybrid.py
+#
+# Hybrid sparse + dense retrieval. Candidates come from a TF-IDF inverted
+# index searched with MaxScore-style pruning and from the dense
+# (two-tower / ANN) index; only the union of the two candidate lists is
+# then scored exactly by both models and fused, by reciprocal rank or by a
+# weighted sum of min-max normalized scores.
+#
+# The sparse side is a TfidfJobIndex fitted over the job index metadata
+# and kept in <job index>/sparse/, so its rows line up with the dense rows.
+
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+from src.models.job_index import load_job_index, INDEX_DIR
+from src.models.tfidf_index import TfidfJobIndex
+from src.models.topk import top_k, l2_normalize
+from src.utils.metrics import timer
+
+SPARSE_SUBDIR = "sparse"
+FUSIONS       = ("rrf", "weighted")
+
+
+class SparseInvertedIndex:
+    """
+    Inverted (column-major) view of an L2-normalized TF-IDF job matrix,
+    searched with MaxScore-style pruning. Query terms are taken in
+    decreasing order of their score upper bound (query weight × the term's
+    largest document weight) and their posting lists scanned in growing
+    blocks. As soon as the bounds of the unscanned terms cannot lift any
+    job above the current k-th best partial score, those long, low-weight
+    posting lists are skipped and only the surviving candidates are scored
+    in full. Results are exact.
+    """
+
+    def __init__(self, job_matrix):
+        self.csr = job_matrix.tocsr()
+        self.csc = job_matrix.tocsc()
+        self.n_docs = self.csc.shape[0]
+        lengths = np.diff(self.csc.indptr)
+        self.max_weights = np.zeros(self.csc.shape[1], dtype=np.float64)
+        nonempty = lengths > 0
+        if nonempty.any():
+            self.max_weights[nonempty] = np.maximum.reduceat(
+                self.csc.data, self.csc.indptr[:-1][nonempty])
+        self.postings = lengths
+        self.row_nnz  = np.diff(self.csr.indptr)
+
+    def search(self, qvec, k: int = 10, max_terms: int = None):
+        """
+        Top-k (job rows, scores) for one query row vector in the same term
+        space, plus stats on how many postings were scanned in full vs.
+        how many candidate rows were scored afterwards.
+
+        Exact by default. For candidate generation, `max_terms` keeps only
+        the query terms with the highest bounds, trading recall for speed.
+        """
+        q = qvec.tocsr()
+        terms, qw = q.indices, q.data
+        ub = qw * self.max_weights[terms]
+        order = np.argsort(-ub, kind="stable")
+        order = order[ub[order] > 0][:max_terms]
+        terms, qw, ub = terms[order], qw[order], ub[order]
+        if max_terms is not None:
+            q = _sparse_row(terms, qw, q.shape[1])
+        # remaining[i]: best score still obtainable from terms i, i+1, ...
+        remaining = np.append(np.cumsum(ub[::-1])[::-1], 0.0)
+
+        stats = {"terms": len(terms), "terms_scanned": 0, "postings_scanned": 0,
+                 "candidates": 0, "postings_total": int(self.postings[terms].sum())}
+        if not len(terms) or k <= 0:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32), stats
+
+        acc, done, step = np.zeros(self.n_docs), 0, 1
+        while True:
+            block = terms[done:done + step]
+            acc += self.csc[:, block] @ qw[done:done + step]
+            stats["postings_scanned"] += int(self.postings[block].sum())
+            done += len(block)
+            if done == len(terms):
+                idx, scores = top_k(acc, k)
+                break
+            kk = min(k, self.n_docs)
+            theta = np.partition(acc, self.n_docs - kk)[self.n_docs - kk]
+            if remaining[done] <= theta:
+                # jobs below theta - remaining can no longer make the top k;
+                # rescore the rest row-wise when that touches fewer postings
+                # than scanning the remaining (long) posting lists would
+                cand = np.flatnonzero(acc + remaining[done] >= theta)
+                if self.row_nnz[cand].sum() < self.postings[terms[done:]].sum():
+                    full = (self.csr[cand] @ q.T).toarray().ravel()
+                    stats["candidates"] = len(cand)
+                    idx, scores = top_k(full, k)
+                    idx = cand[idx]
+                    break
+            step *= 2
+        stats["terms_scanned"] = done
+        keep = scores > 0
+        return idx[keep].astype(np.int64), scores[keep].astype(np.float32), stats
+
+
+def _sparse_row(cols, data, n_cols):
+    from scipy import sparse
+    return sparse.csr_matrix((data, cols, [0, len(cols)]), shape=(1, n_cols))
+
+
+def _ranks(scores: np.ndarray) -> np.ndarray:
+    """1-based rank of each score, best first."""
+    ranks = np.empty(len(scores), dtype=np.int64)
+    ranks[np.argsort(-scores, kind="stable")] = np.arange(1, len(scores) + 1)
+    return ranks
+
+
+def rrf_fuse(score_lists, rrf_k: int = 60, weights=None) -> np.ndarray:
+    """Reciprocal rank fusion: sum of weight / (rrf_k + rank) per list."""
+    weights = weights or [1.0] * len(score_lists)
+    return sum(w / (rrf_k + _ranks(s)) for w, s in zip(weights, score_lists))
+
+
+def weighted_fuse(score_lists, weights) -> np.ndarray:
+    """Weighted sum of per-list min-max normalized scores."""
+    fused = np.zeros(len(score_lists[0]), dtype=np.float64)
+    for w, s in zip(weights, score_lists):
+        s = np.asarray(s, dtype=np.float64)
+        span = s.max() - s.min() if len(s) else 0.0
+        fused += w * ((s - s.min()) / span if span > 0 else np.zeros_like(s))
+    return fused
+
+
+class HybridRetriever:
+    """
+    Combines a TfidfJobIndex and a TwoTowerRecommender (with its job
+    vectors loaded, and optionally an ANN index) whose rows are the same
+    jobs. `fusion` is "rrf" or "weighted"; `alpha` is the dense weight for
+    "weighted" fusion (the sparse weight is 1 - alpha). `sparse_max_terms`
+    caps the query terms used for sparse candidate generation; candidates
+    are still scored with the full query.
+    """
+
+    def __init__(self, tfidf: TfidfJobIndex, dense, jobs: pd.DataFrame = None,
+                 fusion: str = "rrf", alpha: float = 0.5, rrf_k: int = 60,
+                 n_sparse: int = 100, n_dense: int = 100, sparse_max_terms: int = None):
+        if fusion not in FUSIONS:
+            raise ValueError(f"Unknown fusion {fusion!r}; expected one of {FUSIONS}")
+        if dense.job_vecs is None:
+            raise ValueError("the dense recommender has no job vectors; call load_index() first")
+        if tfidf.job_matrix.shape[0] != dense.job_vecs.shape[0]:
+            raise ValueError(
+                f"sparse index has {tfidf.job_matrix.shape[0]} jobs, "
+                f"dense index has {dense.job_vecs.shape[0]}"
+            )
+        self.tfidf    = tfidf
+        self.sparse   = SparseInvertedIndex(tfidf.job_matrix)
+        self.dense    = dense
+        self.jobs     = tfidf.jobs if jobs is None else jobs.reset_index(drop=True)
+        self.fusion   = fusion
+        self.alpha    = alpha
+        self.rrf_k    = rrf_k
+        self.n_sparse = n_sparse
+        self.sparse_max_terms = sparse_max_terms
+        self.n_dense  = n_dense
+
+    def search(self, resume_text: str, k: int = 10, resume_vec: np.ndarray = None,
+               rows=None, fusion: str = None):
+        """
+        Return (job rows, fused scores, details), best first. `details` has
+        the exact sparse and dense scores of the returned rows, candidate
+        counts, pruning stats and per-stage timings in ms. `resume_vec`
+        skips encoding when the caller already has it; `rows` (e.g. from
+        FilterIndex.select) restricts both candidate generators.
+        """
+        fusion = fusion or self.fusion
+        timings = {}
+        t0 = time.perf_counter()
+        qvec = self.tfidf.vectorizer.transform([resume_text or ""])
+        if rows is None:
+            s_idx, _, stats = self.sparse.search(qvec, self.n_sparse,
+                                                 max_terms=self.sparse_max_terms)
+        else:
+            s_idx, _ = self.tfidf.search(resume_text, self.n_sparse, rows=rows)
+            stats = None
+        timings["sparse_ms"] = (time.perf_counter() - t0) * 1000
+
+        t0 = time.perf_counter()
+        if resume_vec is None:
+            resume_vec = self.dense.encode([resume_text or ""], show_progress_bar=False)
+        query = l2_normalize(resume_vec)
+        d_idx, _ = self.dense.search(query, k=self.n_dense, rows=rows)
+        d_idx = d_idx[0][d_idx[0] >= 0]
+        timings["dense_ms"] = (time.perf_counter() - t0) * 1000
+
+        t0 = time.perf_counter()
+        with timer("score", method="hybrid"):
+            union = np.union1d(s_idx, d_idx).astype(np.int64)
+            if not len(union):
+                empty = np.empty(0, dtype=np.float32)
+                return union, empty, {"sparse": empty, "dense": empty, "timings": timings}
+            sparse_scores = (self.tfidf.job_matrix[union] @ qvec.T).toarray().ravel()
+            dense_scores  = np.asarray(self.dense.job_vecs[union], dtype=np.float32) @ query[0]
+            if fusion == "rrf":
+                fused = rrf_fuse([sparse_scores, dense_scores], self.rrf_k)
+            else:
+                fused = weighted_fuse([sparse_scores, dense_scores],
+                                      [1.0 - self.alpha, self.alpha])
+            idx, scores = top_k(fused, k)
+        timings["fuse_ms"] = (time.perf_counter() - t0) * 1000
+
+        details = {
+            "sparse":            sparse_scores[idx],
+            "dense":             dense_scores[idx],
+            "sparse_candidates": len(s_idx),
+            "dense_candidates":  len(d_idx),
+            "union":             len(union),
+            "pruning":           stats,
+            "timings":           timings,
+        }
+        return union[idx], scores, details
+
+    def recommend(self, resume_text: str, k: int = 10, **search_kwargs) -> pd.DataFrame:
+        idx, scores, details = self.search(resume_text, k, **search_kwargs)
+        out = self.jobs.iloc[idx].copy()
+        out["score"]        = scores
+        out["sparse_score"] = details["sparse"]
+        out["dense_score"]  = details["dense"]
+        return out
+
+
+def build_sparse_index(index_dir: str = INDEX_DIR) -> TfidfJobIndex:
+    """Fit TF-IDF over a job index's metadata, row-aligned, into <index_dir>/sparse."""
+    jobs = load_job_index(index_dir).jobs
+    index = TfidfJobIndex.fit(jobs)
+    index.save(os.path.join(index_dir, SPARSE_SUBDIR))
+    return index
+
+
+def load_hybrid(index_dir: str = INDEX_DIR, model_name: str = None, use_ann: bool = False,
+                **kwargs) -> HybridRetriever:
+    """HybridRetriever over a job index built with its sparse/ (and ann/) parts."""
+    from src.models.ann_index import ANN_SUBDIR, load_verified
+    from src.models.tower_model import get_recommender
+    index = load_job_index(index_dir)
+    model = get_recommender(model_name or index.model_name)
+    model.load_index(index.embeddings, normalized=index.normalized)
+    ann = load_verified(os.path.join(index_dir, ANN_SUBDIR)) if use_ann else None
+    if ann is not None:
+        model.load_ann(ann)
+    tfidf = TfidfJobIndex.load(os.path.join(index_dir, SPARSE_SUBDIR))
+    return HybridRetriever(tfidf, model, jobs=index.jobs, **kwargs)
@@ -0,0 +1,122 @@
+# src/models/job_index.py
+
+import os
+import json
+import hashlib
+import numpy as np
+import pandas as pd
+
+INDEX_DIR = "data/processed/job_index"
+
+EMBEDDINGS_FILE = "embeddings.npy"
+METADATA_FILE   = "metadata.parquet"
+MANIFEST_FILE   = "manifest.json"
+
+
+def _file_checksum(path: str, chunk_size: int = 1 << 20) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+class JobIndex:
+    """
+    On-disk job index: a contiguous (rows, dim) embedding matrix kept as a
+    memory-mapped .npy, job metadata as a Parquet table and a JSON manifest.
+    The matrix is opened read-only, so worker processes share the OS page
+    cache instead of each holding a private copy.
+    """
+
+    def __init__(self, embeddings: np.ndarray, jobs: pd.DataFrame, manifest: dict):
+        self.embeddings = embeddings
+        self.jobs       = jobs
+        self.manifest   = manifest
+
+    @property
+    def model_name(self) -> str:
+        return self.manifest["model_name"]
+
+    @property
+    def normalized(self) -> bool:
+        return self.manifest.get("normalized", False)
+
+    def __len__(self):
+        return self.manifest["rows"]
+
+
+def save_job_index(jobs: pd.DataFrame, embeddings: np.ndarray, model_name: str,
+                   index_dir: str = INDEX_DIR, dtype: str = "float32",
+                   normalized: bool = False) -> dict:
+    """
+    Persist `embeddings` (one row per job in `jobs`) and the job metadata.
+    `dtype` may be "float32" or "float16"; `normalized` records whether rows
+    are already unit length. The manifest is written last so a half-written
+    index is never picked up by a reader.
+    """
+    if dtype not in ("float32", "float16"):
+        raise ValueError(f"Unsupported embedding dtype: {dtype!r}")
+    embeddings = np.asarray(embeddings)
+    if embeddings.ndim != 2 or embeddings.shape[0] != len(jobs):
+        raise ValueError(
+            f"Expected {len(jobs)} embedding rows, got shape {embeddings.shape}"
+        )
+
+    os.makedirs(index_dir, exist_ok=True)
+    manifest_path = os.path.join(index_dir, MANIFEST_FILE)
+    if os.path.exists(manifest_path):
+        os.remove(manifest_path)
+
+    # written beside the live file and renamed over it: truncating the
+    # .npy in place would pull pages from under readers that map it
+    emb_path = os.path.join(index_dir, EMBEDDINGS_FILE)
+    tmp_path = emb_path + ".tmp"
+    out = np.lib.format.open_memmap(tmp_path, mode="w+", dtype=dtype,
+                                    shape=embeddings.shape)
+    out[:] = embeddings
+    out.flush()
+    del out
+    os.replace(tmp_path, emb_path)
+
+    meta = jobs.drop(columns=["job_embedding"], errors="ignore").reset_index(drop=True)
+    meta.to_parquet(os.path.join(index_dir, METADATA_FILE), index=False)
+
+    manifest = {
+        "model_name": model_name,
+        "dim":        int(embeddings.shape[1]),
+        "rows":       int(embeddings.shape[0]),
+        "dtype":      dtype,
+        "normalized": bool(normalized),
+        "checksum":   "sha256:" + _file_checksum(emb_path),
+    }
+    with open(manifest_path, "w") as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
+
+
+def load_job_index(index_dir: str = INDEX_DIR, columns=None,
+                   verify: bool = False) -> JobIndex:
+    """
+    Open an index written by save_job_index. The embedding matrix is mapped,
+    not read, so this is close to instant regardless of corpus size.
+    Pass `columns` to load only part of the metadata, and `verify=True`
+    to check the embedding file against the manifest checksum.
+    """
+    with open(os.path.join(index_dir, MANIFEST_FILE)) as f:
+        manifest = json.load(f)
+
+    emb_path = os.path.join(index_dir, EMBEDDINGS_FILE)
+    if verify:
+        checksum = "sha256:" + _file_checksum(emb_path)
+        if checksum != manifest["checksum"]:
+            raise ValueError(f"Checksum mismatch for {emb_path}")
+
+    embeddings = np.load(emb_path, mmap_mode="r")
+    if embeddings.shape != (manifest["rows"], manifest["dim"]):
+        raise ValueError(
+            f"{emb_path} has shape {embeddings.shape}, manifest says "
+            f"({manifest['rows']}, {manifest['dim']})"
+        )
+    jobs = pd.read_parquet(os.path.join(index_dir, METADATA_FILE), columns=columns)
+    return JobIndex(embeddings, jobs, manifest)
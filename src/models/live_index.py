@@ -0,0 +1,611 @@
+# src/models/live_index.py
+#
+# Mutable job index for postings that arrive between full rebuilds.
+#
+#   <live_dir>/live.json                    segment list, model, generation
+#   <live_dir>/.lock                        writer lock (flock)
+#   <live_dir>/segments/seg-000001/         one save_job_index() directory
+#   <live_dir>/segments/seg-000001/filters.npz   FilterIndex of the segment
+#   <live_dir>/segments/seg-000001/deleted.npy   tombstones (bool per row)
+#
+# New postings are appended as a new segment and removed or expired ones
+# are tombstoned; both are visible to the next query, in this process or
+# any other one using the same directory. Writers (append, delete,
+# compact) hold a file lock and re-read live.json before changing it, so
+# the scraper, the CLI and a service can share one live index.
+# compact() merges segments and drops dead rows in the background: readers
+# keep using the old segments (memory-mapped) until the merged one is
+# swapped in, and the old directories are only removed after a grace
+# period, once every reader has moved on.
+
+import os
+import json
+import time
+import shutil
+import threading
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:          # Windows: writers are only serialized in-process
+    fcntl = None
+
+import numpy as np
+import pandas as pd
+
+from src.models.job_index import load_job_index, save_job_index
+from src.models.filters import FilterIndex
+from src.models.topk import l2_normalize, blocked_top_k, top_k_rows
+from src.utils.metrics import timer, inc
+
+LIVE_DIR        = "data/processed/live_index"
+LIVE_MANIFEST   = "live.json"
+SEGMENTS_SUBDIR = "segments"
+DELETED_FILE    = "deleted.npy"
+LOCK_FILE       = ".lock"
+RETIRE_GRACE_S  = 300.0
+
+
+@contextmanager
+def _file_lock(path):
+    """Exclusive advisory lock on `path`, held for the with block."""
+    with open(path, "a") as f:
+        if fcntl is not None:
+            fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+
+class _Segment:
+    """One immutable job_index directory plus its mutable tombstone vector."""
+
+    def __init__(self, name, path, embeddings, jobs, deleted, key_column, filters):
+        self.name       = name
+        self.path       = path
+        self.embeddings = embeddings
+        self.jobs       = jobs
+        self.deleted    = deleted
+        self.filters    = filters
+        self.keys       = jobs[key_column].astype(str).to_numpy(dtype=object)
+        col = jobs["datePublished"] if "datePublished" in jobs else pd.Series(
+            [None] * len(jobs), dtype=object)
+        self.published  = pd.to_datetime(col, errors="coerce", utc=True)
+        self._alive     = None
+
+    @classmethod
+    def load(cls, path, key_column):
+        index = load_job_index(path)
+        deleted_path = os.path.join(path, DELETED_FILE)
+        if os.path.exists(deleted_path):
+            deleted = np.load(deleted_path)
+        else:
+            deleted = np.zeros(len(index), dtype=bool)
+        # segments are written with their filters; build them for older ones
+        filters = FilterIndex.load(path) if FilterIndex.exists(path) else \
+            FilterIndex.build(index.jobs)
+        return cls(os.path.basename(path), path, index.embeddings, index.jobs,
+                   deleted, key_column, filters)
+
+    def __len__(self):
+        return len(self.keys)
+
+    @property
+    def n_dead(self) -> int:
+        return int(self.deleted.sum())
+
+    def alive_rows(self):
+        """Sorted live row ids, or None when nothing in the segment is deleted."""
+        if self._alive is None:
+            self._alive = np.flatnonzero(~self.deleted) if self.deleted.any() else False
+        return None if self._alive is False else self._alive
+
+    def candidate_rows(self, profession=None, location=None, salary=None):
+        alive = self.alive_rows()
+        rows  = self.filters.select(profession, location, salary)
+        if rows is None:
+            return alive
+        if alive is None:
+            return rows
+        return rows[~self.deleted[rows]]
+
+    def mark_deleted(self, rows):
+        rows = np.asarray(rows, dtype=np.int64)
+        if not len(rows):
+            return
+        # copy-on-write so a reader holding the old vector never sees it change
+        deleted = self.deleted.copy()
+        deleted[rows] = True
+        self.deleted, self._alive = deleted, None
+        self.save_deleted()
+
+    def save_deleted(self):
+        path = os.path.join(self.path, DELETED_FILE)
+        tmp  = path + ".tmp"
+        with open(tmp, "wb") as f:
+            np.save(f, self.deleted)
+        os.replace(tmp, path)
+
+
+class LiveJobIndex:
+    """
+    Append-only segments + tombstones over the job_index format. Jobs are
+    identified by `key_column` (default "jobUrl"); appending a key that
+    already exists replaces the old posting. Writes take a thread lock and
+    a file lock and publish a new segment list, so searches never block on
+    them. Unless `auto_refresh` is off, each search first checks whether
+    live.json changed on disk (one stat) and picks up other writers' work.
+    Segments retired by compaction are deleted `retire_grace_s` seconds
+    later.
+    """
+
+    def __init__(self, live_dir: str = LIVE_DIR, key_column: str = "jobUrl",
+                 model_name: str = None, auto_refresh: bool = True,
+                 retire_grace_s: float = RETIRE_GRACE_S):
+        self.live_dir   = live_dir
+        self.key_column = key_column
+        self.model_name = model_name
+        self.auto_refresh   = auto_refresh
+        self.retire_grace_s = retire_grace_s
+        self.segments   = []     # replaced wholesale, never mutated in place
+        self.generation = -1
+        self._next_seg  = 1
+        self._retired   = []     # [{"name", "generation", "retired_at"}]
+        self._stamp     = None   # (inode, mtime, size) of the live.json last read
+        self._keys      = {}     # key -> (segment, row) for live rows
+        self._lock         = threading.RLock()
+        self._compact_lock = threading.Lock()
+        self._compactor    = None
+        self._stop         = threading.Event()
+        self.refresh()
+
+    # ── persistence ─────────────────────────────────────────────────────────
+
+    def _manifest_path(self):
+        return os.path.join(self.live_dir, LIVE_MANIFEST)
+
+    def _segment_path(self, name):
+        return os.path.join(self.live_dir, SEGMENTS_SUBDIR, name)
+
+    def _manifest_stamp(self):
+        try:
+            st = os.stat(self._manifest_path())
+        except FileNotFoundError:
+            return None
+        return st.st_ino, st.st_mtime_ns, st.st_size
+
+    @contextmanager
+    def _writing(self):
+        """
+        Serialize writers across threads and processes. State is re-synced
+        from live.json under the lock, so segment names and generations
+        are always allocated from the latest committed manifest.
+        """
+        with self._lock:
+            os.makedirs(self.live_dir, exist_ok=True)
+            with _file_lock(os.path.join(self.live_dir, LOCK_FILE)):
+                self.refresh()
+                yield
+
+    def _allocate(self) -> str:
+        name = f"seg-{self._next_seg:06d}"
+        self._next_seg += 1
+        return name
+
+    def _commit(self):
+        self.generation += 1
+        manifest = {
+            "model_name": self.model_name,
+            "key_column": self.key_column,
+            "generation": self.generation,
+            "next_segment": self._next_seg,
+            "segments": [seg.name for seg in self.segments],
+            "retired": self._retired,
+        }
+        tmp = self._manifest_path() + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(tmp, self._manifest_path())
+        self._stamp = self._manifest_stamp()
+
+    def refresh(self) -> bool:
+        """
+        Re-read live.json if another process changed it (e.g. the scraper
+        appended a segment). Returns True when anything was reloaded.
+        """
+        try:
+            return self._reload()
+        except FileNotFoundError:
+            # a segment listed in the manifest we read was compacted away
+            # and purged meanwhile; the current manifest no longer has it
+            return self._reload()
+
+    def _refresh_if_changed(self):
+        if self._manifest_stamp() == self._stamp:
+            return
+        # a writer in this process holds the lock and publishes its own changes
+        if self._lock.acquire(blocking=False):
+            try:
+                self.refresh()
+            finally:
+                self._lock.release()
+
+    def _reload(self) -> bool:
+        stamp = self._manifest_stamp()
+        if stamp is None:
+            return False
+        with open(self._manifest_path()) as f:
+            manifest = json.load(f)
+        with self._lock:
+            self._stamp = stamp
+            if manifest["generation"] <= self.generation:
+                return False
+            loaded = {seg.name: seg for seg in self.segments}
+            segments = []
+            for name in manifest["segments"]:
+                seg = loaded.get(name)
+                if seg is None:
+                    seg = _Segment.load(self._segment_path(name), manifest["key_column"])
+                else:
+                    deleted_path = os.path.join(seg.path, DELETED_FILE)
+                    if os.path.exists(deleted_path):
+                        seg.deleted, seg._alive = np.load(deleted_path), None
+                segments.append(seg)
+            self.model_name = self.model_name or manifest["model_name"]
+            self.key_column = manifest["key_column"]
+            self._next_seg  = manifest["next_segment"]
+            self._retired   = manifest.get("retired", [])
+            self.generation = manifest["generation"]
+            self.segments   = segments
+            self._rebuild_keys()
+            return True
+
+    def _rebuild_keys(self):
+        keys = {}
+        for seg in self.segments:
+            for row in (seg.alive_rows() if seg.deleted.any() else range(len(seg))):
+                keys[seg.keys[row]] = (seg, int(row))
+        self._keys = keys
+
+    @classmethod
+    def from_job_index(cls, index_dir: str, live_dir: str = LIVE_DIR,
+                       key_column: str = "jobUrl") -> "LiveJobIndex":
+        """Start a live index whose first segment is a built job_index."""
+        index = load_job_index(index_dir)
+        live  = cls(live_dir, key_column=key_column, model_name=index.model_name)
+        live.append(index.jobs, index.embeddings, normalized=index.normalized)
+        return live
+
+    # ── writes ──────────────────────────────────────────────────────────────
+
+    def __len__(self):
+        return len(self._keys)
+
+    def __contains__(self, key):
+        return str(key) in self._keys
+
+    def append(self, jobs: pd.DataFrame, embeddings: np.ndarray,
+               normalized: bool = False) -> int:
+        """
+        Add postings as a new segment; existing postings with the same key
+        are tombstoned. Returns the number of rows appended.
+        """
+        if self.model_name is None:
+            raise ValueError("model_name is required before appending to a live index")
+        if self.key_column not in jobs.columns:
+            raise ValueError(f"jobs have no {self.key_column!r} column")
+        jobs = jobs.reset_index(drop=True)
+        keys = jobs[self.key_column].astype(str)
+        keep = ~keys.duplicated(keep="last").to_numpy()
+        jobs = jobs[keep].reset_index(drop=True)
+        embeddings = np.asarray(embeddings)[keep]
+        if not len(jobs):
+            return 0
+        if not normalized:
+            embeddings = l2_normalize(embeddings)
+
+        with self._writing():
+            seg = self._write_segment(self._allocate(), jobs, embeddings)
+            self._delete_keys(seg.keys)
+            self.segments = self.segments + [seg]
+            for row, key in enumerate(seg.keys):
+                self._keys[key] = (seg, row)
+            self._commit()
+        inc("live_index_appended", len(jobs))
+        return len(jobs)
+
+    def _write_segment(self, name, jobs, embeddings) -> _Segment:
+        path = self._segment_path(name)
+        save_job_index(jobs, embeddings, self.model_name, index_dir=path, normalized=True)
+        # built once here rather than on the first filtered query of every reader
+        FilterIndex.build(jobs).save(path)
+        return _Segment.load(path, self.key_column)
+
+    def _delete_keys(self, keys) -> int:
+        by_segment = {}
+        for key in keys:
+            hit = self._keys.pop(str(key), None)
+            if hit is not None:
+                by_segment.setdefault(hit[0], []).append(hit[1])
+        for seg, rows in by_segment.items():
+            seg.mark_deleted(rows)
+        return sum(len(rows) for rows in by_segment.values())
+
+    def delete(self, keys) -> int:
+        """Tombstone postings by key; returns how many were live."""
+        with self._writing():
+            n = self._delete_keys(keys)
+            if n:
+                self._commit()
+        inc("live_index_deleted", n)
+        return n
+
+    def expire(self, max_age_days: float = None, before=None) -> int:
+        """
+        Tombstone postings whose datePublished is older than `before` (a
+        timestamp) or `max_age_days` ago. Undated postings are kept.
+        """
+        if before is None:
+            if max_age_days is None:
+                raise ValueError("pass max_age_days or before")
+            before = pd.Timestamp.now(tz="UTC") - pd.Timedelta(days=max_age_days)
+        before = pd.Timestamp(before)
+        before = before.tz_localize("UTC") if before.tzinfo is None else before
+        with self._lock:
+            keys = []
+            for seg in self.segments:
+                old = (seg.published < before).to_numpy() & ~seg.deleted
+                keys.extend(seg.keys[old])
+        return self.delete(keys)
+
+    def retain_only(self, keys_seen, professions=None) -> int:
+        """
+        Tombstone live postings missing from the latest scrape. With
+        `professions`, only postings of those professions are considered,
+        since a scrape usually covers a subset of them.
+        """
+        seen  = {str(k) for k in keys_seen}
+        profs = {str(p).lower() for p in professions} if professions else None
+        with self._lock:
+            keys = []
+            for key, (seg, row) in self._keys.items():
+                if key in seen:
+                    continue
+                if profs is not None:
+                    prof = seg.jobs["profession"].iat[row] if "profession" in seg.jobs else None
+                    if str(prof).lower() not in profs:
+                        continue
+                keys.append(key)
+        return self.delete(keys)
+
+    # ── reads ───────────────────────────────────────────────────────────────
+
+    def search(self, queries: np.ndarray, k: int = 10, block_size: int = 65536,
+               profession=None, location=None, salary=None):
+        """
+        Exact cosine top-k over every live posting in every segment.
+        Returns (keys, scores), both shaped (n_queries, <= k), best first.
+        """
+        if self.auto_refresh:
+            self._refresh_if_changed()
+        segments = self.segments     # snapshot; writers publish a new list
+        queries  = l2_normalize(queries)
+        keys, scores = [], []
+        with timer("score", method="live"):
+            for seg in segments:
+                rows = seg.candidate_rows(profession, location, salary)
+                if rows is not None and not len(rows):
+                    continue
+                idx, sc = blocked_top_k(queries, seg.embeddings, k=k,
+                                        block_size=block_size, rows=rows)
+                keys.append(seg.keys[idx])
+                scores.append(sc)
+            if not keys:
+                return (np.empty((len(queries), 0), dtype=object),
+                        np.empty((len(queries), 0), dtype=np.float32))
+            cand_scores = np.concatenate(scores, axis=1)
+            return top_k_rows(cand_scores, min(k, cand_scores.shape[1]),
+                              np.concatenate(keys, axis=1))
+
+    def lookup(self, key):
+        """Metadata of the live posting with this key, or None."""
+        hit = self._keys.get(str(key))
+        if hit is None:
+            return None
+        seg, row = hit
+        return seg.jobs.iloc[row]
+
+    def jobs_for(self, keys) -> pd.DataFrame:
+        """
+        Metadata rows of live postings, in the order of `keys` and indexed
+        by position in `keys`. Keys deleted since they were returned by
+        search() are left out, so align scores through the index.
+        """
+        index = self._keys
+        hits  = [(pos, index.get(str(key))) for pos, key in enumerate(keys)]
+        hits  = [(pos, hit) for pos, hit in hits if hit is not None]
+        if not hits:
+            return pd.DataFrame()
+        return pd.DataFrame([seg.jobs.iloc[row] for _, (seg, row) in hits],
+                            index=[pos for pos, _ in hits])
+
+    def recommend(self, resume_vec: np.ndarray, k: int = 10, **filters) -> pd.DataFrame:
+        """Top-k live postings for one resume vector, with a score column."""
+        keys, scores = self.search(resume_vec, k=k, **filters)
+        out = self.jobs_for(keys[0])
+        out["score"] = scores[0][out.index.to_numpy(dtype=np.int64)]
+        return out.reset_index(drop=True)
+
+    # ── compaction ──────────────────────────────────────────────────────────
+
+    def needs_compaction(self, max_segments: int = 8, max_dead_ratio: float = 0.2) -> bool:
+        segments = self.segments
+        total = sum(len(seg) for seg in segments)
+        dead  = sum(seg.n_dead for seg in segments)
+        return len(segments) > max_segments or (total and dead / total > max_dead_ratio)
+
+    def compact(self) -> int:
+        """
+        Merge all current segments into one, dropping dead rows. The merge
+        runs outside the write lock; postings appended meanwhile land in
+        newer segments and tombstones set meanwhile are carried over. If
+        another process compacted the same segments first, the merge is
+        discarded. Returns the number of segments merged.
+        """
+        with self._compact_lock:
+            with self._writing():
+                old = list(self.segments)
+                if not old or (len(old) == 1 and not old[0].n_dead):
+                    return 0
+                snapshot = [seg.deleted for seg in old]     # copy-on-write vectors
+                name = self._allocate()
+                self._commit()      # no other writer may reuse the name
+
+            with timer("live_index_compact"):
+                alive = [np.flatnonzero(~d) for d in snapshot]
+                jobs = pd.concat([seg.jobs.iloc[rows] for seg, rows in zip(old, alive)],
+                                 ignore_index=True)
+                dim = old[0].embeddings.shape[1]
+                embeddings = np.concatenate(
+                    [np.asarray(seg.embeddings[rows], dtype=np.float32)
+                     for seg, rows in zip(old, alive)]
+                ) if len(jobs) else np.empty((0, dim), dtype=np.float32)
+                merged = self._write_segment(name, jobs, embeddings)
+
+            with self._writing():
+                if [seg.name for seg in self.segments[:len(old)]] != [seg.name for seg in old]:
+                    shutil.rmtree(merged.path, ignore_errors=True)
+                    return 0
+                # tombstones that landed during the merge (refresh() has
+                # reloaded those written by other processes)
+                late, offset = [], 0
+                for seg, snap, rows in zip(old, snapshot, alive):
+                    late.append(offset + np.flatnonzero(seg.deleted[rows] & ~snap[rows]))
+                    offset += len(rows)
+                merged.mark_deleted(np.concatenate(late))
+                self.segments = [merged] + self.segments[len(old):]
+                for row in (merged.alive_rows() if merged.deleted.any() else range(len(merged))):
+                    self._keys[merged.keys[row]] = (merged, int(row))
+                now = time.time()
+                self._retired = self._retired + [
+                    {"name": seg.name, "generation": self.generation + 1, "retired_at": now}
+                    for seg in old]
+                self._commit()
+
+        inc("live_index_compactions")
+        self.purge_retired()
+        return len(old)
+
+    def purge_retired(self) -> int:
+        """
+        Delete the directories of segments retired by compaction more than
+        `retire_grace_s` seconds ago. Readers pick up a new generation on
+        their next query, so by then none should still be loading them;
+        mappings a reader still holds stay valid after the unlink.
+        Returns the number of segments deleted.
+        """
+        cutoff = time.time() - self.retire_grace_s
+        if not any(r["retired_at"] <= cutoff for r in self._retired):
+            return 0
+        with self._writing():
+            expired = [r for r in self._retired if r["retired_at"] <= cutoff]
+            if not expired:
+                return 0
+            self._retired = [r for r in self._retired if r["retired_at"] > cutoff]
+            self._commit()
+        for r in expired:
+            shutil.rmtree(self._segment_path(r["name"]), ignore_errors=True)
+        return len(expired)
+
+    def start_compactor(self, interval: float = 60.0, max_segments: int = 8,
+                        max_dead_ratio: float = 0.2):
+        """Compact on a daemon thread whenever needs_compaction() says so."""
+        if self._compactor is not None:
+            return self
+
+        def loop():
+            while not self._stop.wait(interval):
+                self.refresh()
+                if self.needs_compaction(max_segments, max_dead_ratio):
+                    self.compact()
+                else:
+                    self.purge_retired()
+
+        self._stop.clear()
+        self._compactor = threading.Thread(target=loop, name="live-index-compactor",
+                                           daemon=True)
+        self._compactor.start()
+        return self
+
+    def stop_compactor(self):
+        if self._compactor is not None:
+            self._stop.set()
+            self._compactor.join()
+            self._compactor = None
+
+
+def update_live_index(raw_path="data/raw/jobs", live_dir: str = LIVE_DIR,
+                      max_age_days: float = None, drop_missing: bool = False,
+                      model_name: str = None, use_cache: bool = True, **load_kwargs) -> dict:
+    """
+    Fold freshly scraped postings into the live index: append new or
+    changed postings (by key and description hash), expire old ones and,
+    with `drop_missing`, tombstone postings of the scraped professions that
+    the scrape no longer returned. Returns counts of each.
+    """
+    from src.utils.io_helpers import load_raw_jobs
+    from src.models.tower_model import get_recommender
+    from src.models.embedding_cache import EmbeddingCache
+
+    live = LiveJobIndex(live_dir, model_name=model_name)
+    if live.model_name is None:
+        live.model_name = "all-MiniLM-L6-v2"
+    df = load_raw_jobs(raw_path, **load_kwargs).reset_index(drop=True)
+    df = df[df[live.key_column].notna()].reset_index(drop=True)
+
+    keys = df[live.key_column].astype(str)
+    changed = np.ones(len(df), dtype=bool)
+    for i, (key, dedupe) in enumerate(zip(keys, df["dedupe_key"])):
+        current = live.lookup(key)
+        if current is not None and current.get("dedupe_key") == dedupe:
+            changed[i] = False
+    new = df[changed]
+
+    appended = 0
+    if len(new):
+        model = get_recommender(live.model_name)
+        texts = new["description"].tolist()
+        if use_cache:
+            # model.encode truncates at the encoder's own max_seq_length
+            cache = EmbeddingCache(live.model_name,
+                                   max_seq_length=getattr(model.encoder, "max_seq_length", None))
+            embeddings, _ = cache.encode(texts, model.encode, prune=False)
+            cache.save()
+        else:
+            embeddings = model.encode(texts)
+        appended = live.append(new, embeddings)
+
+    expired = live.expire(max_age_days) if max_age_days is not None else 0
+    missing = 0
+    if drop_missing and len(df):
+        missing = live.retain_only(keys, professions=df["profession"].dropna().unique())
+    return {"appended": appended, "expired": expired, "missing": missing,
+            "live": len(live), "segments": len(live.segments)}
+
+
+if __name__ == "__main__":
+    import argparse
+    ap = argparse.ArgumentParser(description="Update the live job index from raw partitions")
+    ap.add_argument("raw_path", nargs="?", default="data/raw/jobs")
+    ap.add_argument("--live-dir", default=LIVE_DIR)
+    ap.add_argument("--max-age-days", type=float, default=None)
+    ap.add_argument("--drop-missing", action="store_true")
+    ap.add_argument("--compact", action="store_true")
+    args = ap.parse_args()
+    counts = update_live_index(args.raw_path, args.live_dir, args.max_age_days,
+                               args.drop_missing)
+    if args.compact:
+        counts["compacted"] = LiveJobIndex(args.live_dir).compact()
+    print(f"✅ Live index updated: {counts}")
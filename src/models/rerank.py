@@ -0,0 +1,98 @@
+# src/models/rerank.py
+
+import time
+import numpy as np
+
+DEFAULT_CROSS_ENCODER = "cross-encoder/ms-marco-MiniLM-L-6-v2"
+
+
+class CrossEncoderReranker:
+    """
+    Scores (resume, job) text pairs with a cross-encoder. Pairs are sorted
+    by length and cut into batches so each batch pads to similar lengths;
+    scoring stops early once `budget_ms` would be exceeded.
+    """
+
+    def __init__(self, model_name=DEFAULT_CROSS_ENCODER, batch_size=32,
+                 max_length=512, model=None):
+        if model is None:
+            from sentence_transformers import CrossEncoder
+            model = CrossEncoder(model_name, max_length=max_length)
+        self.model      = model
+        self.model_name = model_name
+        self.batch_size = batch_size
+
+    def score(self, resume_text: str, job_texts: list, budget_ms: float = None):
+        """
+        Return (scores, complete). `scores` has NaN for pairs left unscored
+        when the budget ran out; `complete` is False in that case. The next
+        batch is skipped if the mean batch time so far would overrun.
+        """
+        n = len(job_texts)
+        scores = np.full(n, np.nan, dtype=np.float32)
+        order  = np.argsort([len(t) for t in job_texts], kind="stable")
+        t0 = time.perf_counter()
+        done = 0
+        for start in range(0, n, self.batch_size):
+            elapsed_ms = (time.perf_counter() - t0) * 1000
+            if budget_ms is not None and done:
+                per_batch = elapsed_ms / done
+                if elapsed_ms + per_batch > budget_ms:
+                    return scores, False
+            idx   = order[start:start + self.batch_size]
+            pairs = [(resume_text, job_texts[i]) for i in idx]
+            scores[idx] = self.model.predict(pairs, batch_size=len(pairs),
+                                             show_progress_bar=False)
+            done += 1
+        return scores, True
+
+
+class TwoStageRecommender:
+    """
+    Two-tower retrieval of `n_candidates` jobs followed by cross-encoder
+    re-ranking of just those candidates. If the re-rank budget runs out,
+    the first-stage order is returned unchanged. Every call reports
+    per-stage timings so N can be tuned against the quality gain.
+    """
+
+    def __init__(self, retriever, reranker, job_texts, n_candidates=100,
+                 budget_ms=None):
+        self.retriever    = retriever      # TwoTowerRecommender with an index loaded
+        self.reranker     = reranker
+        self.job_texts    = job_texts      # row-aligned with the job index
+        self.n_candidates = n_candidates
+        self.budget_ms    = budget_ms
+
+    def recommend(self, resume_text: str, k: int = 10, n_candidates: int = None,
+                  budget_ms: float = None):
+        """Return (job indices, scores, timings) for the top `k` jobs."""
+        n_candidates = n_candidates or self.n_candidates
+        budget_ms    = self.budget_ms if budget_ms is None else budget_ms
+        timings = {}
+
+        t0 = time.perf_counter()
+        rvec = self.retriever.encode([resume_text], show_progress_bar=False)
+        t1 = time.perf_counter()
+        cand, first = self.retriever.search(rvec, k=max(k, n_candidates))
+        cand, first = cand[0], first[0]
+        keep = cand >= 0
+        cand, first = cand[keep], first[keep]
+        t2 = time.perf_counter()
+
+        texts = [str(self.job_texts[i]) for i in cand]
+        scores, complete = self.reranker.score(resume_text, texts, budget_ms=budget_ms)
+        t3 = time.perf_counter()
+
+        if complete:
+            order = np.argsort(-scores, kind="stable")[:k]
+            idx, out_scores = cand[order], scores[order]
+        else:
+            idx, out_scores = cand[:k], first[:k]
+
+        timings["encode_ms"]   = (t1 - t0) * 1000
+        timings["retrieve_ms"] = (t2 - t1) * 1000
+        timings["rerank_ms"]   = (t3 - t2) * 1000
+        timings["total_ms"]    = (t3 - t0) * 1000
+        timings["candidates"]  = int(len(cand))
+        timings["reranked"]    = bool(complete)
+        return idx, out_scores, timings
@@ -0,0 +1,100 @@
+# src/models/tfidf_index.py
+
+import os
+import pickle
+import numpy as np
+import pandas as pd
+
+from src.models.topk import top_k
+from src.utils.io_helpers import load_raw_jobs, save_processed
+from src.utils.near_dupes import drop_near_duplicates
+from src.utils.metrics import timed
+
+INDEX_DIR = "data/processed/tfidf_index"
+
+
+class TfidfJobIndex:
+    """
+    Sparse TF-IDF index over job descriptions. The vectorizer is fitted once,
+    offline, so a query only has to transform the resume and take one
+    sparse mat-vec product against the stored job matrix. sklearn/scipy
+    are imported on first fit/load rather than with this module.
+    """
+
+    def __init__(self, vectorizer, job_matrix, jobs: pd.DataFrame):
+        self.vectorizer = vectorizer
+        self.job_matrix = job_matrix.tocsr()
+        self.jobs       = jobs.reset_index(drop=True)
+
+    @classmethod
+    def fit(cls, jobs_df: pd.DataFrame) -> "TfidfJobIndex":
+        from sklearn.feature_extraction.text import TfidfVectorizer
+        vect = TfidfVectorizer(stop_words="english")
+        job_matrix = vect.fit_transform(jobs_df["description"].fillna(""))
+        # only needed for introspection and can be large once pickled
+        vect.stop_words_ = None
+        return cls(vect, job_matrix, jobs_df)
+
+    def save(self, index_dir: str = INDEX_DIR):
+        from scipy import sparse
+        os.makedirs(index_dir, exist_ok=True)
+        with open(os.path.join(index_dir, "vectorizer.pkl"), "wb") as f:
+            pickle.dump(self.vectorizer, f)
+        sparse.save_npz(os.path.join(index_dir, "job_matrix.npz"), self.job_matrix)
+        self.jobs.to_csv(os.path.join(index_dir, "jobs.csv"), index=False)
+
+    @classmethod
+    def load(cls, index_dir: str = INDEX_DIR) -> "TfidfJobIndex":
+        from scipy import sparse
+        with open(os.path.join(index_dir, "vectorizer.pkl"), "rb") as f:
+            vect = pickle.load(f)
+        job_matrix = sparse.load_npz(os.path.join(index_dir, "job_matrix.npz"))
+        jobs = pd.read_csv(os.path.join(index_dir, "jobs.csv"))
+        return cls(vect, job_matrix, jobs)
+
+    @staticmethod
+    def exists(index_dir: str = INDEX_DIR) -> bool:
+        return os.path.exists(os.path.join(index_dir, "job_matrix.npz"))
+
+    @timed("score", method="tfidf")
+    def search(self, resume_text: str, top_n: int = 5, rows=None):
+        """
+        Return (row indices, cosine scores) of the best `top_n` jobs, only
+        among `rows` if given (e.g. from FilterIndex.select).
+        Rows are L2-normalized by the vectorizer, so a dot product is cosine.
+        """
+        qvec = self.vectorizer.transform([resume_text or ""])
+        if rows is None:
+            scores = (self.job_matrix @ qvec.T).toarray().ravel()
+            return top_k(scores, top_n)
+        rows   = np.asarray(rows, dtype=np.int64)
+        scores = (self.job_matrix[rows] @ qvec.T).toarray().ravel()
+        idx, top = top_k(scores, top_n)
+        return rows[idx], top
+
+    def recommend(self, resume_text: str, top_n: int = 5, rows=None) -> pd.DataFrame:
+        idx, scores = self.search(resume_text, top_n, rows=rows)
+        out = self.jobs.iloc[idx].copy()
+        out["score"] = scores
+        return out
+
+
+def build_tfidf_index(raw_path="data/raw/all_jobs.csv", index_dir=INDEX_DIR,
+                      near_dupes=True):
+    """
+    Rebuild the TF-IDF index from the raw scrape: clean via load_raw_jobs,
+    drop near-duplicate postings, persist the cleaned table via
+    save_processed, then fit and save.
+    """
+    df = load_raw_jobs(raw_path)
+    if near_dupes:
+        df = drop_near_duplicates(df)
+    save_processed(df)
+    index = TfidfJobIndex.fit(df)
+    index.save(index_dir)
+    return index
+
+
+if __name__ == "__main__":
+    index = build_tfidf_index()
+    print(f"✅ TF-IDF index over {len(index.jobs)} jobs saved to {INDEX_DIR}")
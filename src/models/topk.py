@@ -0,0 +1,117 @@
+# src/models/topk.py
+
+import numpy as np
+
+
+def top_k(scores: np.ndarray, k: int):
+    """
+    Return (indices, scores) of the `k` largest entries of a 1-D score
+    vector, best first. Uses argpartition so only the winners get sorted.
+    """
+    scores = np.asarray(scores)
+    k = min(k, scores.shape[0])
+    if k <= 0:
+        return np.empty(0, dtype=np.int64), scores[:0]
+    if k < scores.shape[0]:
+        idx = np.argpartition(-scores, k - 1)[:k]
+    else:
+        idx = np.arange(scores.shape[0])
+    idx = idx[np.argsort(-scores[idx], kind="stable")]
+    return idx, scores[idx]
+
+
+def top_k_rows(scores: np.ndarray, k: int, ids: np.ndarray = None):
+    """
+    Row-wise top-k of a (queries, candidates) score matrix, best first.
+    `ids` optionally maps candidate columns to row ids (same shape as
+    `scores` or 1-D over columns); column positions are returned otherwise.
+    """
+    n = scores.shape[1]
+    k = min(k, n)
+    if k < n:
+        part = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    else:
+        part = np.broadcast_to(np.arange(n), scores.shape)
+    part_scores = np.take_along_axis(scores, part, axis=1)
+    order = np.argsort(-part_scores, axis=1, kind="stable")
+    cols  = np.take_along_axis(part, order, axis=1)
+    top_scores = np.take_along_axis(part_scores, order, axis=1)
+    if ids is None:
+        return cols, top_scores
+    ids = np.asarray(ids)
+    if ids.ndim == 1:
+        return ids[cols], top_scores
+    return np.take_along_axis(ids, cols, axis=1), top_scores
+
+
+def l2_normalize(x: np.ndarray, dtype=np.float32) -> np.ndarray:
+    """Return a copy of `x` with unit-length rows (zero rows stay zero)."""
+    x = np.array(x, dtype=dtype, ndmin=2)
+    norms = np.linalg.norm(x, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    x /= norms
+    return x
+
+
+def blocked_top_k(queries: np.ndarray, matrix: np.ndarray, k: int = 10,
+                  block_size: int = 65536, rows: np.ndarray = None):
+    """
+    Top-k inner products of every query row against every matrix row.
+    The matrix is scanned in blocks of `block_size` rows with a running
+    top-k per query, so peak memory is O(queries * (block_size + k)) no
+    matter how many rows `matrix` has. Works on memory-mapped matrices.
+    With `rows` (sorted row ids, e.g. from a FilterIndex) only those rows
+    are read and scored. Returns (indices, scores), both shaped
+    (queries, min(k, candidate rows)).
+    """
+    queries = np.asarray(queries, dtype=np.float32)
+    n_rows  = matrix.shape[0] if rows is None else len(rows)
+    k = min(k, n_rows)
+    best_idx    = np.empty((queries.shape[0], 0), dtype=np.int64)
+    best_scores = np.empty((queries.shape[0], 0), dtype=np.float32)
+
+    for start in range(0, n_rows, block_size):
+        if rows is None:
+            block = np.asarray(matrix[start:start + block_size], dtype=np.float32)
+            ids   = np.arange(start, start + block.shape[0])
+        else:
+            ids   = np.asarray(rows[start:start + block_size], dtype=np.int64)
+            block = np.asarray(matrix[ids], dtype=np.float32)
+        scores = queries @ block.T
+        idx, sc = top_k_rows(scores, k, ids)
+        # merge with the running top-k
+        cand_idx    = np.concatenate([best_idx, idx], axis=1)
+        cand_scores = np.concatenate([best_scores, sc], axis=1)
+        best_idx, best_scores = top_k_rows(cand_scores, k, cand_idx)
+
+    return best_idx, best_scores
+
+
+def sharded_top_k(queries: np.ndarray, matrix: np.ndarray, k: int = 10,
+                  block_size: int = 65536, workers: int = 1, pool=None):
+    """
+    blocked_top_k split into `workers` contiguous row shards scored on a
+    thread pool (numpy releases the GIL inside the matmul), then merged.
+    Peak memory is O(workers * queries * (block_size + k)).
+    """
+    n_rows = matrix.shape[0]
+    workers = max(1, min(workers or 1, n_rows // max(block_size, 1) + 1))
+    if workers == 1:
+        return blocked_top_k(queries, matrix, k=k, block_size=block_size)
+
+    bounds = np.linspace(0, n_rows, workers + 1).astype(np.int64)
+
+    def shard(i):
+        lo, hi = bounds[i], bounds[i + 1]
+        idx, sc = blocked_top_k(queries, matrix[lo:hi], k=k, block_size=block_size)
+        return idx + lo, sc
+
+    if pool is None:
+        from concurrent.futures import ThreadPoolExecutor
+        with ThreadPoolExecutor(max_workers=workers) as own_pool:
+            parts = list(own_pool.map(shard, range(workers)))
+    else:
+        parts = list(pool.map(shard, range(workers)))
+    cand_idx    = np.concatenate([p[0] for p in parts], axis=1)
+    cand_scores = np.concatenate([p[1] for p in parts], axis=1)
+    return top_k_rows(cand_scores, min(k, n_rows), cand_idx)
@@ -1,16 +1,94 @@
 import numpy as np
-from sentence_transformers import SentenceTransformer
+from functools import lru_cache
+from src.models.topk import l2_normalize, blocked_top_k
+from src.utils.metrics import timer, timed, inc
 
 class TwoTowerRecommender:
     def __init__(self, model_name="all-MiniLM-L6-v2"):
-        self.encoder = SentenceTransformer(model_name)
+        # sentence-transformers pulls in torch; only pay for it when a
+        # recommender is actually built
+        from sentence_transformers import SentenceTransformer
+        self.model_name = model_name
+        self.encoder    = SentenceTransformer(model_name)
+        self.job_vecs   = None
+        self.ann        = None
+        self.last_encode_stats = None
 
-    def encode(self, texts: list[str]) -> np.ndarray:
-        return self.encoder.encode(texts, convert_to_numpy=True, show_progress_bar=True)
+    def encode(self, texts: list[str], show_progress_bar: bool = True) -> np.ndarray:
+        inc("encode_texts", len(texts))
+        with timer("encode"):
+            return self.encoder.encode(texts, convert_to_numpy=True,
+                                       show_progress_bar=show_progress_bar)
 
+    def encode_corpus(self, texts, n: int = None, out_path: str = None,
+                      **engine_kwargs) -> np.ndarray:
+        """
+        Encode a large (possibly streamed) corpus with an EncodingEngine:
+        length-bucketed batches, max_seq_length truncation, optional worker
+        processes (`workers=`) and output into a memory-mapped .npy at
+        `out_path`. In-process runs reuse this recommender's model (its
+        max_seq_length is restored afterwards); worker processes load
+        their own copy.
+        """
+        from src.models.encoding import EncodingEngine
+        with EncodingEngine(self.model_name, model=self.encoder, **engine_kwargs) as engine:
+            out = engine.encode(texts, n=n, out_path=out_path)
+            self.last_encode_stats = engine.last_stats
+        return out
+
+    @timed("score", method="rank")
     def rank(self, resume_vec: np.ndarray, job_vecs: np.ndarray) -> np.ndarray:
         # Cosine similarity
         sims = (job_vecs @ resume_vec) / (
             np.linalg.norm(job_vecs, axis=1) * np.linalg.norm(resume_vec)
         )
         return sims
+
+    def load_index(self, job_vecs: np.ndarray, normalized: bool = False):
+        """
+        Keep job vectors for search(). They are L2-normalized once here
+        (skipped when the index was saved pre-normalized, which keeps a
+        memory-mapped matrix mapped instead of copying it).
+        """
+        self.job_vecs = job_vecs if normalized else l2_normalize(job_vecs)
+        if self.ann is not None:
+            self.ann.attach_vectors(self.job_vecs)
+        return self
+
+    def load_ann(self, ann_index):
+        """
+        Route search() through an approximate IVFIndex built over the same
+        job vectors; the exact vectors, if loaded, refine its PQ scores.
+        """
+        self.ann = ann_index
+        if self.job_vecs is not None:
+            ann_index.attach_vectors(self.job_vecs)
+        return self
+
+    def search(self, resume_vecs: np.ndarray, k: int = 10, block_size: int = 65536,
+               nprobe: int = None, exact: bool = False, rows: np.ndarray = None):
+        """
+        Cosine top-k for a batch of resume vectors against the loaded index.
+        Uses the ANN index when one is loaded (probing `nprobe` lists) unless
+        `exact` is set. `rows` (e.g. from FilterIndex.select) restricts the
+        search to those job rows, scored exactly. Returns (indices, scores),
+        each shaped (n_resumes, k), best first.
+        """
+        queries = l2_normalize(resume_vecs)
+        if self.ann is not None and not exact and rows is None:
+            with timer("score", method="ann"):
+                return self.ann.search(queries, k=k, nprobe=nprobe)
+        if self.job_vecs is None:
+            raise RuntimeError("No job index loaded; call load_index() first")
+        with timer("score", method="exact"):
+            return blocked_top_k(queries, self.job_vecs, k=k, block_size=block_size, rows=rows)
+
+    def recommend(self, texts: list[str], k: int = 10, **search_kwargs):
+        """Encode a batch of resumes and return search() results for them."""
+        return self.search(self.encode(texts), k=k, **search_kwargs)
+
+
+@lru_cache(maxsize=None)
+def get_recommender(model_name="all-MiniLM-L6-v2") -> TwoTowerRecommender:
+    """Process-wide TwoTowerRecommender per model name, built on first use."""
+    return TwoTowerRecommender(model_name)
@@ -1,19 +1,76 @@
-import pickle
+import os
+import shutil
+import argparse
 from src.utils.io_helpers import load_raw_jobs, save_processed
+from src.utils.near_dupes import drop_near_duplicates
 from src.models.tower_model import TwoTowerRecommender
+from src.models.job_index import save_job_index, INDEX_DIR
+from src.models.ann_index import IVFIndex, ANN_SUBDIR, MIN_RECALL, auto_pq_m, tune_nprobe
+from src.models.embedding_cache import EmbeddingCache
+from src.models.filters import FilterIndex
+from src.models.hybrid import build_sparse_index
+from src.models.topk import l2_normalize
 
-def build_job_index():
-    # 1. Load & clean
+def build_job_index(index_dir=INDEX_DIR, dtype="float32",
+                    ann=False, n_lists=None, pq_m=None, min_recall=MIN_RECALL, use_cache=True,
+                    near_dupes=True, encode_workers=1, max_seq_length=256,
+                    sparse=True):
+    # 1. Load & clean, collapsing near-duplicate postings across scrapes
     df = load_raw_jobs()
+    if near_dupes:
+        df = drop_near_duplicates(df)
     save_processed(df)
-    # 2. Encode descriptions
-    model      = TwoTowerRecommender()
-    embeddings = model.encode(df["description"].tolist())
-    df["job_embedding"] = list(embeddings)
-    # 3. Persist
-    with open("data/processed/jobs_index.pkl", "wb") as f:
-        pickle.dump(df, f)
+    # 2. Encode descriptions (only new/changed ones when the cache is on)
+    model = TwoTowerRecommender()
+    texts = df["description"].tolist()
+    def encode_fn(batch):
+        return model.encode_corpus(batch, workers=encode_workers,
+                                   max_seq_length=max_seq_length)
+    if use_cache:
+        cache = EmbeddingCache(model.model_name, max_seq_length=max_seq_length)
+        embeddings, stats = cache.encode(texts, encode_fn)
+        cache.save()
+        print(f"Embedding cache: {stats['hits']} hits, {stats['misses']} misses, "
+              f"encoded in {stats['encode_seconds']:.1f}s, "
+              f"~{stats['saved_seconds']:.1f}s saved")
+    else:
+        embeddings = encode_fn(texts)
+    if model.last_encode_stats:
+        print(f"Encoded {model.last_encode_stats['sentences']} descriptions at "
+              f"{model.last_encode_stats['sentences_per_sec']:.1f} sentences/s")
+    embeddings = l2_normalize(embeddings)
+    # 3. Persist as memory-mapped embeddings + columnar metadata + filters
+    manifest = save_job_index(df, embeddings, model.model_name,
+                              index_dir=index_dir, dtype=dtype, normalized=True)
+    FilterIndex.build(df.reset_index(drop=True)).save(index_dir)
+    # 4. Optional IVF(-PQ) ANN index over the same vectors, kept only when
+    #    it reaches `min_recall` against exact search and is faster
+    ann_dir = os.path.join(index_dir, ANN_SUBDIR)
+    shutil.rmtree(ann_dir, ignore_errors=True)     # never serve a stale one
+    if ann and len(df):
+        pq_m = auto_pq_m(embeddings.shape[1]) if pq_m is None else pq_m
+        ivf  = IVFIndex.build(embeddings, n_lists=n_lists, pq_m=pq_m)
+        ivf.attach_vectors(embeddings)
+        report = tune_nprobe(ivf, embeddings, min_recall=min_recall)
+        best = max(report["probes"], key=lambda p: p["recall"], default=None)
+        if report["ok"]:
+            ivf.save(ann_dir)
+            print(f"ANN index: recall@10 {report['recall']:.3f} at nprobe={report['nprobe']}, "
+                  f"{report['ms']:.2f} vs {report['exact_ms']:.2f} ms/query exact")
+        else:
+            print(f"ANN index not saved: best recall@10 "
+                  f"{best['recall'] if best else 0:.3f} (target {min_recall}) or not faster "
+                  f"than exact search ({report['exact_ms']:.2f} ms/query); using exact search")
+    # 5. Row-aligned TF-IDF index for hybrid sparse + dense retrieval
+    if sparse and len(df):
+        build_sparse_index(index_dir)
+    return manifest
 
 if __name__ == "__main__":
-    build_job_index()
-    print("✅ Job index built and saved to data/processed/jobs_index.pkl")
+    ap = argparse.ArgumentParser(description="Build the job index")
+    ap.add_argument("--ann", action="store_true",
+                    help="also build an IVF-PQ index, kept if recall@10 >= --min-recall")
+    ap.add_argument("--min-recall", type=float, default=MIN_RECALL)
+    args = ap.parse_args()
+    manifest = build_job_index(ann=args.ann, min_recall=args.min_recall)
+    print(f"✅ Job index ({manifest['rows']} jobs) built and saved to {INDEX_DIR}")
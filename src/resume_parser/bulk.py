@@ -0,0 +1,171 @@
+# src/resume_parser/bulk.py
+#
+# Bulk resume extraction over a process pool:
+#
+#   python -m src.resume_parser.bulk resumes/ -o data/processed/resumes.jsonl
+
+import os
+import sys
+import json
+import time
+import argparse
+import collections
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+
+from src.resume_parser.parser import (
+    SUPPORTED_EXTENSIONS, ResumeExtractionError,
+    count_pdf_pages, extract_pdf_text, extract_resume_text,
+)
+
+
+def iter_resume_paths(inputs):
+    """Expand directories (recursively) and files into supported resume paths."""
+    if isinstance(inputs, str):
+        inputs = [inputs]
+    for item in inputs:
+        if os.path.isdir(item):
+            for root, _, files in os.walk(item):
+                for name in sorted(files):
+                    if name.lower().endswith(SUPPORTED_EXTENSIONS):
+                        yield os.path.join(root, name)
+        else:
+            yield item
+
+
+def _extract_task(task, pages_per_task=None):
+    """
+    Extract one task. A whole PDF (start None) is page-counted here, in the
+    worker: one longer than `pages_per_task` pages has only its first range
+    extracted, and the remaining (path, start, end) ranges are returned for
+    the parent to submit. Returns (task, text, error, seconds, rest).
+    """
+    path, start, end = task
+    t0 = time.perf_counter()
+    rest = []
+    try:
+        if start is not None:
+            text = extract_pdf_text(path, start, end)
+        elif path.lower().endswith(".pdf") and pages_per_task:
+            try:
+                n_pages = count_pdf_pages(path)
+            except ResumeExtractionError:
+                n_pages = 0             # extract_resume_text reports the error
+            if n_pages > pages_per_task:
+                text = extract_pdf_text(path, 0, pages_per_task)
+                rest = [(path, s, min(s + pages_per_task, n_pages))
+                        for s in range(pages_per_task, n_pages, pages_per_task)]
+            else:
+                text = extract_resume_text(path)
+        else:
+            text = extract_resume_text(path)
+        error = None
+    except ResumeExtractionError as e:
+        text, error = "", str(e)
+    except Exception as e:  # keep one bad file from killing the batch
+        text, error = "", f"{type(e).__name__}: {e}"
+    return task, text, error, time.perf_counter() - t0, rest
+
+
+def _iter_tasks(inputs):
+    """One whole-file task per distinct resume; nothing is opened here."""
+    seen = set()
+    for path in iter_resume_paths(inputs):
+        real = os.path.realpath(path)
+        if real in seen:
+            continue
+        seen.add(real)
+        yield path, None, None
+
+
+def _record(path, state):
+    text = "".join(state["parts"][k] for k in sorted(state["parts"]))
+    if state["errors"]:
+        status, text = "error", ""
+    else:
+        status = "ok" if text.strip() else "empty"
+    return {
+        "path":    path,
+        "status":  status,
+        "error":   "; ".join(state["errors"]) or None,
+        "text":    text,
+        "n_chars": len(text),
+        "parts":   len(state["parts"]),
+        "seconds": round(state["seconds"], 6),
+    }
+
+
+def parse_resumes(inputs, workers=None, pages_per_task=8, max_in_flight=None):
+    """
+    Extract every resume under `inputs` (directories and/or file paths)
+    across a process pool, yielding one result dict per file as soon as
+    all of its parts are done:
+        {"path", "status": "ok" | "empty" | "error", "error", "text",
+         "n_chars", "parts", "seconds"}
+    PDFs with more than `pages_per_task` pages are split into page ranges
+    that run in parallel; the worker extracting the first range counts
+    the pages, so the parent never opens a file. `seconds` is the summed
+    extraction time. Failures are reported, never replaced with stub
+    text. Files listed twice are parsed once. At most `max_in_flight` tasks (default 4 per
+    worker) are submitted at a time, so memory does not grow with the
+    number of inputs.
+    """
+    workers = workers or os.cpu_count() or 1
+    max_in_flight = max_in_flight or 4 * workers
+    tasks   = _iter_tasks(inputs)
+    ranges  = collections.deque()   # page ranges split off by the workers
+    pending = {}
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        in_flight = set()
+        while True:
+            while len(in_flight) < max_in_flight:
+                task = ranges.popleft() if ranges else next(tasks, None)
+                if task is None:
+                    break
+                if task[1] is None:
+                    pending[task[0]] = {"parts": {}, "left": 1, "errors": [], "seconds": 0.0}
+                in_flight.add(pool.submit(_extract_task, task, pages_per_task))
+            if not in_flight:
+                break
+            done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+            for fut in done:
+                (path, start, _), text, error, seconds, rest = fut.result()
+                state = pending[path]
+                state["parts"][start or 0] = text
+                state["seconds"] += seconds
+                if error:
+                    state["errors"].append(error)
+                ranges.extend(rest)
+                state["left"] += len(rest) - 1
+                if not state["left"]:
+                    yield _record(path, pending.pop(path))
+
+
+def parse_resumes_to_jsonl(inputs, out_path, workers=None, pages_per_task=8):
+    """Stream parse_resumes() results to a JSONL file; return status counts."""
+    counts = {"ok": 0, "empty": 0, "error": 0}
+    os.makedirs(os.path.dirname(out_path) or ".", exist_ok=True)
+    with open(out_path, "w", encoding="utf-8") as f:
+        for rec in parse_resumes(inputs, workers=workers, pages_per_task=pages_per_task):
+            f.write(json.dumps(rec, ensure_ascii=False) + "\n")
+            counts[rec["status"]] += 1
+    return counts
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Bulk-extract resume text to JSONL.")
+    ap.add_argument("inputs", nargs="+", help="resume files and/or directories")
+    ap.add_argument("-o", "--out", default="data/processed/resumes.jsonl")
+    ap.add_argument("--workers", type=int, default=None)
+    ap.add_argument("--pages-per-task", type=int, default=8)
+    args = ap.parse_args(argv)
+
+    t0 = time.perf_counter()
+    counts = parse_resumes_to_jsonl(args.inputs, args.out, args.workers, args.pages_per_task)
+    total = sum(counts.values())
+    print(f"✅ Parsed {total} resumes in {time.perf_counter() - t0:.1f}s "
+          f"({counts['ok']} ok, {counts['empty']} empty, {counts['error']} errors) -> {args.out}")
+    return 1 if counts["error"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -53,63 +53,234 @@
 
 # src/resume_parser/parser.py
 
+import io
 import os
+import hashlib
+import threading
+from collections import OrderedDict
 
-try:
-    import PyPDF2
-except ImportError:
-    PyPDF2 = None
+from functools import lru_cache
 
-try:
-    import docx
-except ImportError:
-    docx = None
+from src.utils.metrics import timed, inc
 
 
-def parse_resume_text(path: str) -> str:
+# PyPDF2 and python-docx are imported on first use so importing this module
+# (e.g. from the Streamlit app) stays cheap.
+@lru_cache(maxsize=None)
+def _optional_import(name):
+    try:
+        return __import__(name)
+    except ImportError:
+        return None
+
+
+def _pypdf2():
+    PyPDF2 = _optional_import("PyPDF2")
+    if PyPDF2 is None:
+        raise ResumeExtractionError("PyPDF2 is not installed")
+    return PyPDF2
+
+
+def _docx():
+    docx = _optional_import("docx")
+    if docx is None:
+        raise ResumeExtractionError("python-docx is not installed")
+    return docx
+
+SUPPORTED_EXTENSIONS = (".txt", ".pdf", ".docx")
+
+STUB_TEXT = (
+    "Python pandas scikit-learn machine learning API design cloud "
+    "data analysis software development"
+)
+
+
+class ResumeExtractionError(Exception):
+    """Raised when a resume file cannot be read or its format is unsupported."""
+
+
+def count_pdf_pages(path: str) -> int:
+    PyPDF2 = _pypdf2()
+    try:
+        with open(path, "rb") as f:
+            return len(PyPDF2.PdfReader(f).pages)
+    except Exception as e:
+        raise ResumeExtractionError(f"{path}: {e}") from e
+
+
+def _pdf_text(stream, start: int = 0, end: int = None) -> str:
+    PyPDF2 = _pypdf2()
+    text = ""
+    reader = PyPDF2.PdfReader(stream)
+    for page in reader.pages[start:end]:
+        # Some pages might return None
+        page_text = page.extract_text()
+        if page_text:
+            text += page_text + "\n"
+    return text
+
+
+def _docx_text(source) -> str:
+    doc = _docx().Document(source)
+    return "".join(para.text + "\n" for para in doc.paragraphs)
+
+
+def extract_pdf_text(path: str, start: int = 0, end: int = None) -> str:
+    """Text of pages [start, end) of a PDF, one line break per page."""
+    try:
+        with open(path, "rb") as f:
+            return _pdf_text(f, start, end)
+    except ResumeExtractionError:
+        raise
+    except Exception as e:
+        raise ResumeExtractionError(f"{path}: {e}") from e
+
+
+def extract_resume_text(path: str) -> str:
     """
-    Given a path to a resume file (.txt, .pdf, .docx), extract and return its text.
-    Falls back to a stub string if extraction fails.
+    Extract the text of a .txt, .pdf or .docx resume. Unlike
+    parse_resume_text, failures raise ResumeExtractionError.
     """
     ext = os.path.splitext(path)[1].lower()
-    text = ""
 
     if ext == ".txt":
         # Plain text resume
         try:
             with open(path, "r", encoding="utf-8") as f:
-                text = f.read()
-        except Exception:
-            text = ""
-    
-    elif ext == ".pdf" and PyPDF2 is not None:
+                return f.read()
+        except Exception as e:
+            raise ResumeExtractionError(f"{path}: {e}") from e
+
+    if ext == ".pdf":
         # PDF resume
-        try:
-            with open(path, "rb") as f:
-                reader = PyPDF2.PdfReader(f)
-                for page in reader.pages:
-                    # Some pages might return None
-                    page_text = page.extract_text()
-                    if page_text:
-                        text += page_text + "\n"
-        except Exception:
-            text = ""
-    
-    elif ext == ".docx" and docx is not None:
+        return extract_pdf_text(path)
+
+    if ext == ".docx":
         # DOCX resume
         try:
-            doc = docx.Document(path)
-            for para in doc.paragraphs:
-                text += para.text + "\n"
-        except Exception:
-            text = ""
-    
+            return _docx_text(path)
+        except ResumeExtractionError:
+            raise
+        except Exception as e:
+            raise ResumeExtractionError(f"{path}: {e}") from e
+
+    raise ResumeExtractionError(f"Unsupported resume type: {ext or path!r}")
+
+
+@timed("parse_resume", source="file")
+def parse_resume_text(path: str) -> str:
+    """
+    Given a path to a resume file (.txt, .pdf, .docx), extract and return its text.
+    Falls back to a stub string if extraction fails.
+    """
+    try:
+        text = extract_resume_text(path)
+    except ResumeExtractionError:
+        inc("parse_resume_failures", source="file")
+        text = ""
+
     # If we got nothing, return a stub so the demo still runs
     if not text.strip():
-        return (
-            "Python pandas scikit-learn machine learning API design cloud "
-            "data analysis software development"
-        )
-    
+        return STUB_TEXT
+
     return text
 
+
+# ── in-memory parsing (uploads) ─────────────────────────────────────────────
+
+MIME_TYPES = {
+    "text/plain":         "txt",
+    "application/pdf":    "pdf",
+    "application/vnd.openxmlformats-officedocument.wordprocessingml.document": "docx",
+}
+
+PARSE_CACHE_SIZE = 128
+
+
+def normalize_file_type(file_type: str) -> str:
+    """Map ".pdf", "PDF", "application/pdf", ... to "pdf" / "docx" / "txt"."""
+    file_type = (file_type or "").strip().lower()
+    if file_type in MIME_TYPES:
+        return MIME_TYPES[file_type]
+    return file_type.rsplit("/", 1)[-1].lstrip(".")
+
+
+def extract_resume_bytes(data: bytes, file_type: str) -> str:
+    """
+    Extract resume text straight from bytes, without a temp file.
+    `file_type` is an extension or MIME type. Raises ResumeExtractionError.
+    """
+    kind = normalize_file_type(file_type)
+    try:
+        if kind == "txt":
+            return data.decode("utf-8", errors="ignore")
+        if kind == "pdf":
+            return _pdf_text(io.BytesIO(data))
+        if kind == "docx":
+            return _docx_text(io.BytesIO(data))
+    except ResumeExtractionError:
+        raise
+    except Exception as e:
+        raise ResumeExtractionError(f"{kind} upload: {e}") from e
+    raise ResumeExtractionError(f"Unsupported resume type: {file_type!r}")
+
+
+class ParseCache:
+    """Thread-safe bounded LRU of extracted text keyed by content hash."""
+
+    def __init__(self, maxsize: int = PARSE_CACHE_SIZE):
+        self.maxsize = maxsize
+        self.hits    = 0
+        self.misses  = 0
+        self._data   = OrderedDict()
+        self._lock   = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return self._data[key]
+            self.misses += 1
+            return None
+
+    def put(self, key, value):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.hits = self.misses = 0
+
+    def __len__(self):
+        return len(self._data)
+
+
+_parse_cache = ParseCache()
+
+
+@timed("parse_resume", source="bytes")
+def parse_resume_bytes(data: bytes, file_type: str) -> str:
+    """
+    In-memory counterpart of parse_resume_text for uploads. Extraction is
+    cached by (sha256 of the bytes, file type), so re-submitting a resume
+    or a Streamlit rerun skips PDF/DOCX parsing. Falls back to the stub
+    string if extraction fails.
+    """
+    key  = (hashlib.sha256(data).hexdigest(), normalize_file_type(file_type))
+    text = _parse_cache.get(key)
+    if text is None:
+        try:
+            text = extract_resume_bytes(data, file_type)
+        except ResumeExtractionError:
+            inc("parse_resume_failures", source="bytes")
+            text = ""
+        _parse_cache.put(key, text)
+
+    if not text.strip():
+        return STUB_TEXT
+    return text
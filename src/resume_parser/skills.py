@@ -0,0 +1,129 @@
+# src/resume_parser/skills.py
+
+import os
+import re
+import json
+import glob
+from functools import lru_cache
+
+SKILLS_DIR = "data/skills"
+
+
+def _normalize_term(term: str) -> str:
+    return " ".join(str(term).lower().split())
+
+
+def _read_skills_file(path):
+    """
+    Yield (skill, [aliases]) from one skills file. Accepted layouts:
+      ["python", "ci/cd", ...]
+      ["python", {"name": "kubernetes", "aliases": ["k8s"]}, ...]
+      {"kubernetes": ["k8s"], "python": []}
+    """
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    if isinstance(data, dict):
+        for name, aliases in data.items():
+            yield name, list(aliases or [])
+        return
+    for entry in data:
+        if isinstance(entry, dict):
+            yield entry["name"], list(entry.get("aliases", []))
+        else:
+            yield entry, []
+
+
+def _trie_regex(node) -> str:
+    """Regex for a char trie; longer continuations are tried first."""
+    alts = []
+    for ch, child in sorted(node.items()):
+        if ch == "":
+            continue
+        atom = r"\s+" if ch == " " else re.escape(ch)
+        alts.append(atom + _trie_regex(child))
+    if not alts:
+        return ""
+    body = alts[0] if len(alts) == 1 else "(?:" + "|".join(alts) + ")"
+    if "" in node:
+        return "(?:" + body + ")?"
+    return body
+
+
+class SkillMatcher:
+    """
+    Every profession's skills (and their aliases) compiled once into a single
+    trie-shaped regex with word boundaries, so a resume is scanned in one
+    pass regardless of how many terms there are. Matching is
+    case-insensitive, tolerant of any whitespace inside multi-word skills,
+    and non-overlapping with the longest term winning at each position.
+    """
+
+    def __init__(self, skills_by_profession: dict):
+        # term (normalized) -> [(profession, canonical skill)]
+        self.terms = {}
+        self.professions = sorted(skills_by_profession)
+        for prof, skills in skills_by_profession.items():
+            for name, aliases in skills:
+                for term in [name] + aliases:
+                    key = _normalize_term(term)
+                    if key:
+                        self.terms.setdefault(key, []).append((prof, name))
+
+        trie = {}
+        for term in self.terms:
+            node = trie
+            for ch in term:
+                node = node.setdefault(ch, {})
+            node[""] = {}
+        body = _trie_regex(trie) if trie else r"(?!x)x"
+        self.pattern = re.compile(r"(?<!\w)(?:" + body + r")(?!\w)", re.IGNORECASE)
+
+    @classmethod
+    def from_dir(cls, skills_dir: str = SKILLS_DIR) -> "SkillMatcher":
+        skills = {}
+        for path in sorted(glob.glob(os.path.join(skills_dir, "*.json"))):
+            prof = os.path.splitext(os.path.basename(path))[0].replace("_", " ")
+            skills[prof] = list(_read_skills_file(path))
+        return cls(skills)
+
+    def match(self, text: str, professions=None) -> dict:
+        """
+        Scan `text` once and return {profession: [hit, ...]} where each hit
+        is {"skill", "term", "start", "end"}; offsets index into `text`.
+        """
+        wanted = set(professions) if professions is not None else None
+        hits = {}
+        for m in self.pattern.finditer(text or ""):
+            term = _normalize_term(m.group(0))
+            for prof, skill in self.terms.get(term, ()):
+                if wanted is None or prof in wanted:
+                    hits.setdefault(prof, []).append(
+                        {"skill": skill, "term": m.group(0),
+                         "start": m.start(), "end": m.end()}
+                    )
+        return hits
+
+    def skills(self, text: str, profession: str) -> list:
+        """Distinct canonical skills of `profession` found in `text`, in order."""
+        seen = []
+        for hit in self.match(text, [profession]).get(profession, []):
+            if hit["skill"] not in seen:
+                seen.append(hit["skill"])
+        return seen
+
+
+@lru_cache(maxsize=None)
+def load_skill_matcher(skills_dir: str = SKILLS_DIR) -> SkillMatcher:
+    """Process-wide matcher per skills directory, compiled on first use."""
+    return SkillMatcher.from_dir(skills_dir)
+
+
+def extract_skills(text: str, profession: str = None, skills_dir: str = SKILLS_DIR):
+    """
+    Skills found in `text`: a list for one profession (e.g. "software engineer"),
+    or {profession: [hits]} across all professions when none is given.
+    """
+    matcher = load_skill_matcher(skills_dir)
+    if profession is None:
+        return matcher.match(text)
+    return matcher.skills(text, profession.lower())
@@ -0,0 +1,132 @@
+# src/service/batching.py
+
+import time
+import queue
+import threading
+from collections import deque
+from concurrent.futures import Future, TimeoutError
+
+import numpy as np
+
+
+class MicroBatcher:
+    """
+    Coalesces concurrent calls into batches for a function that works on
+    lists. A background thread waits for the first item, then keeps
+    collecting until `max_batch_size` items or `max_wait_ms` have passed,
+    and calls `fn(items)` once, which must return one result per item.
+    Calls that time out are cancelled and left out of the batch if it has
+    not started yet. stop() lets the running batch finish and fails every
+    call still queued (and any submitted later) with RuntimeError.
+    """
+
+    def __init__(self, fn, max_batch_size=32, max_wait_ms=5.0):
+        self.fn             = fn
+        self.max_batch_size = max_batch_size
+        self.max_wait       = max_wait_ms / 1000
+        self.batch_sizes    = deque(maxlen=10_000)
+        self._queue  = queue.Queue()
+        self._thread = None
+        self._stop   = threading.Event()
+        self._lock   = threading.Lock()
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="micro-batcher", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        with self._lock:
+            self._stop.set()
+        self._queue.put(None)
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        # nothing reads the queue any more: fail what is left in it
+        while True:
+            try:
+                entry = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if entry is not None and entry[1].set_running_or_notify_cancel():
+                entry[1].set_exception(RuntimeError("MicroBatcher stopped"))
+
+    def submit(self, item) -> Future:
+        fut = Future()
+        with self._lock:
+            if self._stop.is_set():
+                fut.set_exception(RuntimeError("MicroBatcher stopped"))
+            else:
+                self._queue.put((item, fut))
+        return fut
+
+    def __call__(self, item, timeout=None):
+        fut = self.submit(item)
+        try:
+            return fut.result(timeout)
+        except TimeoutError:
+            fut.cancel()
+            raise
+
+    def _collect(self):
+        first = self._queue.get()
+        if first is None:
+            return []
+        batch = [first]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                nxt = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if nxt is None:
+                self._stop.set()
+                break
+            batch.append(nxt)
+        return batch
+
+    def _run(self):
+        while not self._stop.is_set():
+            batch = self._collect()
+            # drops cancelled calls; the rest can no longer be cancelled
+            batch = [(item, fut) for item, fut in batch if fut.set_running_or_notify_cancel()]
+            if not batch:
+                continue
+            self.batch_sizes.append(len(batch))
+            items = [item for item, _ in batch]
+            try:
+                results = self.fn(items)
+                for (_, fut), res in zip(batch, results):
+                    fut.set_result(res)
+            except Exception as e:
+                for _, fut in batch:
+                    if not fut.done():
+                        fut.set_exception(e)
+
+
+class LatencyTracker:
+    """Thread-safe window of recent latencies (ms) with percentile summaries."""
+
+    def __init__(self, window=10_000):
+        self._values = deque(maxlen=window)
+        self._lock   = threading.Lock()
+        self.count   = 0
+
+    def observe(self, ms: float):
+        with self._lock:
+            self._values.append(ms)
+            self.count += 1
+
+    def summary(self) -> dict:
+        with self._lock:
+            values = np.array(self._values, dtype=np.float64)
+            count  = self.count
+        if not len(values):
+            return {"count": count, "p50_ms": None, "p99_ms": None, "mean_ms": None}
+        p50, p99 = np.percentile(values, [50, 99])
+        return {"count": count, "p50_ms": float(p50), "p99_ms": float(p99),
+                "mean_ms": float(values.mean())}
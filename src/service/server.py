@@ -0,0 +1,286 @@
+# src/service/server.py
+#
+# Long-lived recommendation service:
+#
+#   python -m src.service.server --port 8080
+#   python -m src.service.server --live-dir data/processed/live_index
+#
+#   POST /recommend  {"resume_text": "...", "k": 10,
+#                     "filters": {"profession": ..., "location": ..., "salary": "$80k-$100k"}}
+#   GET  /healthz    process is up
+#   GET  /readyz     index and encoder are loaded
+#   GET  /metrics    request latency p50/p99 and batch sizes
+#   GET  /metrics/prometheus  per-stage metrics (src.utils.metrics), text format
+
+import os
+import json
+import time
+import argparse
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from concurrent.futures import TimeoutError as RequestTimeout
+
+import numpy as np
+
+from src.models.job_index import load_job_index, INDEX_DIR
+from src.models.ann_index import ANN_SUBDIR, load_verified
+from src.models.filters import FilterIndex
+from src.service.batching import MicroBatcher, LatencyTracker
+from src.utils import metrics as stage_metrics
+
+RESULT_COLUMNS = ["title", "companyName", "locationShort", "profession",
+                  "jobUrl", "datePublished"]
+MAX_K = 100
+
+
+class RecommendationService:
+    """
+    Loads the job index and the encoder once, then answers recommendation
+    requests. Concurrent requests are coalesced by a MicroBatcher so the
+    encoder and the scoring run once per batch rather than once per resume.
+    With `live_dir`, the LiveJobIndex there is searched instead, so
+    postings appended by the scraper show up without a restart; with
+    `compact_interval` the service also compacts it in the background.
+    """
+
+    def __init__(self, index_dir=INDEX_DIR, model_name=None, use_ann=False,
+                 max_batch_size=32, max_wait_ms=5.0, live_dir=None,
+                 compact_interval=None, request_timeout=10.0):
+        self.index_dir  = index_dir
+        self.model_name = model_name
+        self.use_ann    = use_ann
+        self.live_dir   = live_dir
+        self.compact_interval = compact_interval
+        self.request_timeout  = request_timeout
+        self.index      = None
+        self.live       = None
+        self.filters    = None
+        self.model      = None
+        self.error      = None
+        self.ready      = threading.Event()
+        self.latency    = LatencyTracker()
+        self.batcher    = MicroBatcher(self._recommend_batch, max_batch_size, max_wait_ms)
+
+    def load(self):
+        """Load index + encoder; safe to run in a background thread."""
+        from src.models.tower_model import TwoTowerRecommender
+        try:
+            if self.live_dir:
+                return self._load_live()
+            index = load_job_index(self.index_dir)
+            model = TwoTowerRecommender(self.model_name or index.model_name)
+            model.load_index(index.embeddings, normalized=index.normalized)
+            ann = load_verified(os.path.join(self.index_dir, ANN_SUBDIR)) if self.use_ann else None
+            if ann is not None:
+                model.load_ann(ann)
+            if FilterIndex.exists(self.index_dir):
+                self.filters = FilterIndex.load(self.index_dir)
+            self.index, self.model = index, model
+            self.batcher.start()
+            self.ready.set()
+        except Exception as e:
+            self.error = f"{type(e).__name__}: {e}"
+            raise
+
+    def _load_live(self):
+        from src.models.live_index import LiveJobIndex
+        from src.models.tower_model import TwoTowerRecommender
+        live = LiveJobIndex(self.live_dir)
+        if live.model_name is None:
+            raise FileNotFoundError(f"no live index in {self.live_dir}")
+        self.model = TwoTowerRecommender(self.model_name or live.model_name)
+        self.live  = live
+        if self.compact_interval:
+            live.start_compactor(self.compact_interval)
+        self.batcher.start()
+        self.ready.set()
+
+    def _recommend_batch(self, requests):
+        texts = [r["resume_text"] for r in requests]
+        vecs  = self.model.encode(texts, show_progress_bar=False)
+        results = [None] * len(requests)
+
+        if self.live is not None:
+            # filters are applied per segment inside the live index
+            for i, r in enumerate(requests):
+                keys, scores = self.live.search(vecs[i:i + 1], k=r["k"], **r["filters"])
+                results[i] = (keys[0], scores[0])
+            return results
+
+        # unfiltered requests share one search call
+        plain = [i for i, r in enumerate(requests) if r["rows"] is None]
+        if plain:
+            k = max(requests[i]["k"] for i in plain)
+            idx, scores = self.model.search(vecs[plain], k=k)
+            for j, i in enumerate(plain):
+                results[i] = (idx[j, :requests[i]["k"]], scores[j, :requests[i]["k"]])
+        # filtered ones only score their surviving rows
+        for i, r in enumerate(requests):
+            if r["rows"] is not None:
+                idx, scores = self.model.search(vecs[i:i + 1], k=r["k"], rows=r["rows"])
+                results[i] = (idx[0], scores[0])
+        return results
+
+    def recommend(self, resume_text: str, k: int = 10, filters: dict = None) -> list:
+        if self.live is not None:
+            return self._recommend_live(resume_text, k, filters)
+        rows = None
+        if filters and self.filters is not None:
+            rows = self.filters.select(profession=filters.get("profession"),
+                                       location=filters.get("location"),
+                                       salary=filters.get("salary"))
+            if rows is not None and not len(rows):
+                return []
+        idx, scores = self.batcher({"resume_text": resume_text, "k": k, "rows": rows},
+                                   timeout=self.request_timeout)
+        keep = idx >= 0
+        idx, scores = idx[keep], scores[keep]
+        cols = [c for c in RESULT_COLUMNS if c in self.index.jobs.columns]
+        rows = self.index.jobs.iloc[idx][cols].astype(object)
+        rows = rows.where(rows.notna(), None)
+        out = rows.to_dict(orient="records")
+        for rec, i, s in zip(out, idx, scores):
+            rec["row"], rec["score"] = int(i), float(s)
+        return out
+
+    def _recommend_live(self, resume_text, k, filters):
+        filters = {name: (filters or {}).get(name) for name in ("profession", "location", "salary")}
+        keys, scores = self.batcher({"resume_text": resume_text, "k": k, "filters": filters},
+                                    timeout=self.request_timeout)
+        jobs = self.live.jobs_for(keys)
+        cols = [c for c in RESULT_COLUMNS if c in jobs.columns]
+        rows = jobs[cols].astype(object)
+        out  = rows.where(rows.notna(), None).to_dict(orient="records")
+        # postings deleted since the search are missing from `jobs`
+        for rec, pos in zip(out, jobs.index):
+            rec["score"] = float(scores[pos])
+        return out
+
+    def metrics(self) -> dict:
+        sizes = np.array(self.batcher.batch_sizes, dtype=np.float64)
+        return {
+            "ready":   self.ready.is_set(),
+            "latency": self.latency.summary(),
+            "batches": {"count": int(len(sizes)),
+                        "mean_size": float(sizes.mean()) if len(sizes) else None},
+            "jobs":    len(self.live) if self.live is not None else
+                       len(self.index) if self.index is not None else 0,
+            "stages":  stage_metrics.snapshot() if stage_metrics.is_enabled() else None,
+        }
+
+
+def make_handler(service: RecommendationService):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, *args):
+            pass
+
+        def _send(self, status, body, content_type="application/json"):
+            data = body.encode() if isinstance(body, str) else json.dumps(body).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def do_GET(self):
+            if self.path == "/healthz":
+                self._send(200, {"status": "ok"})
+            elif self.path == "/readyz":
+                if service.ready.is_set():
+                    self._send(200, {"status": "ready"})
+                else:
+                    self._send(503, {"status": "error" if service.error else "loading",
+                                     "error": service.error})
+            elif self.path == "/metrics":
+                self._send(200, service.metrics())
+            elif self.path == "/metrics/prometheus":
+                self._send(200, stage_metrics.prometheus_text(),
+                           content_type="text/plain; version=0.0.4")
+            else:
+                self._send(404, {"error": "not found"})
+
+        def do_POST(self):
+            if self.path != "/recommend":
+                return self._send(404, {"error": "not found"})
+            if not service.ready.is_set():
+                return self._send(503, {"error": "service not ready"})
+            t0 = time.perf_counter()
+            try:
+                length = int(self.headers.get("Content-Length", 0))
+                body = json.loads(self.rfile.read(length) or b"{}")
+                text = body["resume_text"]
+                k    = int(body.get("k", 10))
+                filters = body.get("filters") or {}
+                if not isinstance(text, str) or not 1 <= k <= MAX_K:
+                    raise ValueError(f"resume_text must be a string and 1 <= k <= {MAX_K}")
+                if not isinstance(filters, dict):
+                    raise ValueError("filters must be an object")
+            except (KeyError, ValueError, TypeError) as e:
+                return self._send(400, {"error": f"bad request: {e}"})
+            try:
+                results = service.recommend(text, k, filters)
+            except RequestTimeout:
+                return self._send(503, {"error": "recommendation timed out"})
+            except Exception as e:
+                return self._send(500, {"error": f"{type(e).__name__}: {e}"})
+            ms = (time.perf_counter() - t0) * 1000
+            service.latency.observe(ms)
+            self._send(200, {"results": results, "latency_ms": ms})
+
+    return Handler
+
+
+def serve(host="0.0.0.0", port=8080, metrics_textfile=None, **service_kwargs):
+    service = RecommendationService(**service_kwargs)
+    server  = ThreadingHTTPServer((host, port), make_handler(service))
+    server.daemon_threads = True
+    # answer /healthz while the model loads
+    threading.Thread(target=service.load, name="loader", daemon=True).start()
+    print(f"Serving recommendations on http://{host}:{port}")
+    try:
+        server.serve_forever()
+    finally:
+        service.batcher.stop()
+        if service.live is not None:
+            service.live.stop_compactor()
+        server.server_close()
+        stage_metrics.flush(metrics_textfile)
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Job recommendation HTTP service")
+    ap.add_argument("--host", default="0.0.0.0")
+    ap.add_argument("--port", type=int, default=8080)
+    ap.add_argument("--index-dir", default=INDEX_DIR)
+    ap.add_argument("--model-name", default=None, help="defaults to the index manifest's model")
+    ap.add_argument("--ann", action="store_true",
+                    help="use the index's ANN index for unfiltered queries if its recall was verified")
+    ap.add_argument("--live-dir", default=None,
+                    help="serve the live job index in this directory instead of --index-dir")
+    ap.add_argument("--compact-interval", type=float, default=None,
+                    help="with --live-dir, compact the live index every this many seconds")
+    ap.add_argument("--max-batch-size", type=int, default=32)
+    ap.add_argument("--max-wait-ms", type=float, default=5.0)
+    ap.add_argument("--request-timeout", type=float, default=10.0,
+                    help="seconds a request may wait for its batch before a 503")
+    ap.add_argument("--metrics", action="store_true", help="enable per-stage metrics")
+    ap.add_argument("--profile-slow-ms", type=float, default=None,
+                    help="cProfile a sample of calls and dump those slower than this")
+    ap.add_argument("--profile-rate", type=float, default=0.01)
+    ap.add_argument("--metrics-textfile", default=None,
+                    help="with --metrics, write Prometheus text here on shutdown")
+    args = ap.parse_args()
+    if args.metrics or args.profile_slow_ms is not None:
+        stage_metrics.enable(profile_slow_ms=args.profile_slow_ms,
+                             profile_rate=args.profile_rate)
+    serve(args.host, args.port, metrics_textfile=args.metrics_textfile,
+          index_dir=args.index_dir, model_name=args.model_name,
+          use_ann=args.ann, max_batch_size=args.max_batch_size,
+          max_wait_ms=args.max_wait_ms, live_dir=args.live_dir,
+          compact_interval=args.compact_interval, request_timeout=args.request_timeout)
+
+
+if __name__ == "__main__":
+    main()
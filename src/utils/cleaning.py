@@ -0,0 +1,85 @@
+# src/utils/cleaning.py
+
+import re
+import html
+import pandas as pd
+
+from src.utils.metrics import timer, inc
+
+# cheap test: a tag-looking token or an HTML entity
+HTML_HINT   = r"<[a-zA-Z/!][^>]*>|&(?:#\d+|#x[0-9a-fA-F]+|[a-zA-Z]+);"
+SCRIPT_RE   = re.compile(r"<(script|style)\b.*?</\1\s*>", re.IGNORECASE | re.DOTALL)
+COMMENT_RE  = re.compile(r"<!--.*?-->", re.DOTALL)
+TAG_RE      = re.compile(r"<[^>]+>")
+# anything other than single spaces between words
+MESSY_WS    = r"\s\s|[\t\n\r\f\v]|^\s|\s$"
+
+DEDUPE_COLS = ["profession", "title", "companyName", "description"]
+
+
+def strip_html(text: str) -> str:
+    """Drop scripts, comments and tags (tags become spaces), then unescape."""
+    text = SCRIPT_RE.sub(" ", text)
+    text = COMMENT_RE.sub(" ", text)
+    text = TAG_RE.sub(" ", text)
+    return html.unescape(text)
+
+
+def normalize_whitespace(text: str) -> str:
+    return " ".join(text.split())
+
+
+def clean_descriptions(desc: pd.Series) -> pd.Series:
+    """
+    Strip HTML and normalize whitespace, each only on the rows a cheap
+    vectorized regex test says need it.
+    """
+    desc = desc.fillna("").astype(str).copy()
+    needs_html = desc.str.contains(HTML_HINT, regex=True)
+    if needs_html.any():
+        desc[needs_html] = desc[needs_html].map(strip_html)
+    needs_ws = desc.str.contains(MESSY_WS, regex=True)
+    if needs_ws.any():
+        desc[needs_ws] = desc[needs_ws].map(normalize_whitespace)
+    return desc
+
+
+def add_dedupe_key(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Add `dedupe_key`, a 64-bit hash of profession/title/company/description.
+    Older scrapes wrote `company` instead of `companyName`; either is used.
+    """
+    cols = df.reindex(columns=DEDUPE_COLS)
+    if "company" in df.columns:
+        cols["companyName"] = cols["companyName"].fillna(df["company"])
+    df["dedupe_key"] = pd.util.hash_pandas_object(
+        cols.fillna("").astype(str), index=False
+    ).to_numpy()
+    return df
+
+
+def clean_jobs(df: pd.DataFrame) -> pd.DataFrame:
+    """Clean one chunk of raw jobs and drop exact duplicates within it."""
+    df = df.copy()
+    if "description" not in df.columns:
+        df["description"] = ""
+    df["description"] = clean_descriptions(df["description"])
+    df = add_dedupe_key(df)
+    return df.drop_duplicates(subset="dedupe_key")
+
+
+def clean_job_chunks(chunks) -> pd.DataFrame:
+    """
+    Clean an iterable of raw DataFrame chunks and dedupe across chunks on
+    the hashed key. Cleaning is vectorized and cheaper than pickling the
+    chunks to worker processes, so it runs in-process.
+    """
+    with timer("clean_jobs"):
+        cleaned = [clean_jobs(c) for c in chunks]
+        if not cleaned:
+            return clean_jobs(pd.DataFrame(columns=DEDUPE_COLS))
+        df = pd.concat(cleaned, ignore_index=True)
+        inc("clean_rows_in", sum(len(c) for c in cleaned))
+        df = df.drop_duplicates(subset="dedupe_key", ignore_index=True)
+        inc("clean_rows_out", len(df))
+        return df
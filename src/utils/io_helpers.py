@@ -1,17 +1,40 @@
+import os
 import pandas as pd
-from bs4 import BeautifulSoup
+from src.utils.cleaning import clean_job_chunks
+from src.utils.partitions import list_partitions, iter_partitions
 
-def load_raw_jobs(path="data/raw/all_jobs.csv"):
-    df = pd.read_csv(path)
-    # Drop exact duplicates
-    df = df.drop_duplicates(subset=["profession","title","company","description"])
-    # Strip HTML from descriptions
-    df["description"] = df["description"] \
-        .apply(lambda x: BeautifulSoup(x, "html.parser").get_text())
-    # Normalize whitespace
-    df["description"] = df["description"] \
-        .str.replace(r"\s+", " ", regex=True).str.strip()
-    return df
+def iter_raw_jobs(path="data/raw/all_jobs.csv", dates=None, professions=None,
+                  chunksize=None):
+    """
+    Lazily yield raw scrape output as DataFrames: chunks of a single CSV
+    (`chunksize` rows each, or the whole file), one frame per file of a
+    partitioned directory written by the scraper (optionally filtered by
+    date/profession) or of an explicit list of partition files.
+    """
+    if isinstance(path, (list, tuple)):
+        yield from iter_partitions(list(path))
+    elif os.path.isdir(path):
+        yield from iter_partitions(list_partitions(path, dates=dates, professions=professions))
+    elif chunksize:
+        yield from pd.read_csv(path, chunksize=chunksize)
+    else:
+        yield pd.read_csv(path)
+
+def read_raw_jobs(path="data/raw/all_jobs.csv", dates=None, professions=None):
+    """Read raw scrape output (see iter_raw_jobs) into one DataFrame."""
+    frames = list(iter_raw_jobs(path, dates=dates, professions=professions))
+    return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+
+def load_raw_jobs(path="data/raw/all_jobs.csv", dates=None, professions=None,
+                  chunksize=50_000):
+    """
+    Read and clean raw jobs: HTML is stripped only where present, whitespace
+    normalized, and exact duplicates dropped on a hashed key.
+    """
+    chunks = iter_raw_jobs(path, dates=dates, professions=professions,
+                           chunksize=chunksize)
+    return clean_job_chunks(chunks)
 
 def save_processed(df, path="data/processed/jobs_clean.csv"):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
     df.to_csv(path, index=False)
@@ -0,0 +1,316 @@
+# src/utils/metrics.py
+#
+# Lightweight in-process instrumentation: counters, latency histograms,
+# context-manager / decorator timers, JSON log and Prometheus-text export,
+# and opt-in cProfile capture of slow calls. Everything is a no-op unless
+# enabled (metrics.enable() or JOB_RECOMMENDER_METRICS=1).
+
+import os
+import json
+import time
+import random
+import logging
+import bisect
+import itertools
+import cProfile
+import threading
+import functools
+
+PREFIX = "job_recommender"
+DEFAULT_BUCKETS_MS = (1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000, 60000)
+
+logger = logging.getLogger("job_recommender.metrics")
+
+
+class Counter:
+    def __init__(self):
+        self.value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, n=1.0):
+        with self._lock:
+            self.value += n
+
+
+class Histogram:
+    """Cumulative-bucket histogram in the Prometheus sense."""
+
+    def __init__(self, buckets=DEFAULT_BUCKETS_MS):
+        self.buckets = tuple(buckets)
+        self.counts  = [0] * (len(self.buckets) + 1)   # last slot is +Inf
+        self.count   = 0
+        self.sum     = 0.0
+        self._lock   = threading.Lock()
+
+    def observe(self, value):
+        i = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            self.counts[i] += 1
+            self.count += 1
+            self.sum += value
+
+    def state(self):
+        """Consistent (counts, count, sum) copy."""
+        with self._lock:
+            return list(self.counts), self.count, self.sum
+
+    def quantile(self, q):
+        """Bucket upper bound below which a fraction `q` of observations fall."""
+        if not self.count:
+            return None
+        target, seen = q * self.count, 0
+        for bound, n in zip(self.buckets + (float("inf"),), self.counts):
+            seen += n
+            if seen >= target:
+                return bound
+        return float("inf")
+
+
+class Registry:
+    def __init__(self):
+        self.counters   = {}
+        self.histograms = {}
+        self._lock      = threading.Lock()
+
+    @staticmethod
+    def _key(name, labels):
+        return name, tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+    def counter(self, name, **labels) -> Counter:
+        key = self._key(name, labels)
+        with self._lock:
+            if key not in self.counters:
+                self.counters[key] = Counter()
+            return self.counters[key]
+
+    def histogram(self, name, **labels) -> Histogram:
+        key = self._key(name, labels)
+        with self._lock:
+            if key not in self.histograms:
+                self.histograms[key] = Histogram()
+            return self.histograms[key]
+
+    def reset(self):
+        with self._lock:
+            self.counters.clear()
+            self.histograms.clear()
+
+    def items(self):
+        """Sorted (key, metric) lists of counters and histograms, copied under the lock."""
+        with self._lock:
+            return sorted(self.counters.items()), sorted(self.histograms.items())
+
+
+REGISTRY = Registry()
+
+
+class _Config:
+    enabled          = os.getenv("JOB_RECOMMENDER_METRICS", "").lower() not in ("", "0", "false")
+    json_log         = False
+    profile_stages   = None    # None = every stage
+    profile_rate     = 0.0
+    profile_slow_ms  = None
+    profile_dir      = "data/profiles"
+
+
+_config = _Config()
+
+
+def enable(json_log: bool = False, profile_slow_ms: float = None, profile_rate: float = 0.0,
+           profile_dir: str = "data/profiles", profile_stages=None):
+    """
+    Turn instrumentation on. With `json_log`, every timed call is also
+    logged as one JSON line. With `profile_slow_ms`, a `profile_rate`
+    fraction of calls (to `profile_stages`, or all) run under cProfile and
+    the stats of those slower than the threshold are dumped to `profile_dir`.
+    """
+    _config.enabled         = True
+    _config.json_log        = json_log
+    _config.profile_slow_ms = profile_slow_ms
+    _config.profile_rate    = profile_rate
+    _config.profile_dir     = profile_dir
+    _config.profile_stages  = set(profile_stages) if profile_stages else None
+
+
+def disable():
+    _config.enabled = False
+
+
+def is_enabled() -> bool:
+    return _config.enabled
+
+
+def inc(name, n=1.0, **labels):
+    if _config.enabled:
+        REGISTRY.counter(name, **labels).inc(n)
+
+
+def observe(name, value_ms, **labels):
+    if _config.enabled:
+        REGISTRY.histogram(name, **labels).observe(value_ms)
+
+
+class _NoopTimer:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NOOP = _NoopTimer()
+_profile_lock = threading.Lock()
+_profile_seq  = itertools.count()
+
+
+class _Timer:
+    __slots__ = ("name", "labels", "t0", "profiler", "ms")
+
+    def __init__(self, name, labels):
+        self.name, self.labels = name, labels
+        self.profiler = None
+        self.ms = None
+
+    def __enter__(self):
+        if (_config.profile_slow_ms is not None and _config.profile_rate > 0
+                and (_config.profile_stages is None or self.name in _config.profile_stages)
+                and random.random() < _config.profile_rate
+                and _profile_lock.acquire(blocking=False)):
+            # one profile at a time: nested timers and other threads run
+            # unprofiled (from 3.12 the profiler is interpreter-wide)
+            profiler = cProfile.Profile()
+            try:
+                profiler.enable()
+                self.profiler = profiler
+            except ValueError:      # another profiling tool is active
+                _profile_lock.release()
+        self.t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.ms = (time.perf_counter() - self.t0) * 1000
+        if self.profiler is not None:
+            self.profiler.disable()
+            _profile_lock.release()
+            if self.ms >= _config.profile_slow_ms:
+                _dump_profile(self.profiler, self.name, self.ms)
+            self.profiler = None
+        status = "error" if exc_type else "ok"
+        REGISTRY.histogram(self.name, **self.labels).observe(self.ms)
+        if exc_type:
+            REGISTRY.counter(self.name + "_errors", **self.labels).inc()
+        if _config.json_log:
+            logger.info(json.dumps({"event": "timer", "stage": self.name, "ms": round(self.ms, 3),
+                                    "status": status, **self.labels}, default=str))
+        return False
+
+
+def _dump_profile(profiler, name, ms):
+    os.makedirs(_config.profile_dir, exist_ok=True)
+    path = os.path.join(_config.profile_dir,
+                        f"{name}-{time.strftime('%Y%m%dT%H%M%S')}-{int(ms)}ms-{os.getpid()}"
+                        f"-{next(_profile_seq)}.prof")
+    profiler.dump_stats(path)
+    logger.info(json.dumps({"event": "slow_profile", "stage": name, "ms": round(ms, 3), "path": path}))
+
+
+def timer(name, **labels):
+    """`with timer("encode"):` -- records the block's latency in ms."""
+    if not _config.enabled:
+        return _NOOP
+    return _Timer(name, labels)
+
+
+def timed(name=None, **labels):
+    """Decorator form of timer(); the stage name defaults to the function name."""
+    def wrap(fn):
+        stage = name or fn.__name__
+
+        @functools.wraps(fn)
+        def inner(*args, **kwargs):
+            if not _config.enabled:
+                return fn(*args, **kwargs)
+            with _Timer(stage, labels):
+                return fn(*args, **kwargs)
+        return inner
+    return wrap
+
+
+# ── export ──────────────────────────────────────────────────────────────────
+
+def _escape(value) -> str:
+    # label value escaping required by the text exposition format
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _fmt_labels(labels, extra=None):
+    items = list(labels) + (list(extra.items()) if extra else [])
+    if not items:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in items) + "}"
+
+
+def prometheus_text() -> str:
+    """All metrics in the Prometheus text exposition format."""
+    lines = []
+    seen = set()
+    counters, histograms = REGISTRY.items()
+    for (name, labels), c in counters:
+        metric = f"{PREFIX}_{name}_total"
+        if metric not in seen:
+            lines.append(f"# TYPE {metric} counter")
+            seen.add(metric)
+        lines.append(f"{metric}{_fmt_labels(labels)} {c.value:g}")
+    for (name, labels), h in histograms:
+        metric = f"{PREFIX}_{name}_ms"
+        if metric not in seen:
+            lines.append(f"# TYPE {metric} histogram")
+            seen.add(metric)
+        counts, count, total = h.state()
+        cumulative = 0
+        for bound, n in zip(h.buckets + (float("inf"),), counts):
+            cumulative += n
+            le = "+Inf" if bound == float("inf") else f"{bound:g}"
+            lines.append(f"{metric}_bucket{_fmt_labels(labels, {'le': le})} {cumulative}")
+        lines.append(f"{metric}_sum{_fmt_labels(labels)} {total:g}")
+        lines.append(f"{metric}_count{_fmt_labels(labels)} {count}")
+    return "\n".join(lines) + "\n"
+
+
+def write_prometheus(path):
+    """Write prometheus_text() atomically (for a node-exporter textfile collector)."""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp = path + ".tmp"
+    with open(tmp, "w") as f:
+        f.write(prometheus_text())
+    os.replace(tmp, path)
+
+
+def snapshot() -> dict:
+    """JSON-serializable view of every metric, with approximate p50/p99."""
+    counters, histograms = REGISTRY.items()
+    return {
+        "counters": [{"name": n, **dict(l), "value": c.value} for (n, l), c in counters],
+        "histograms": [{"name": n, **dict(l), "count": h.count, "sum_ms": h.sum,
+                        "p50_ms": h.quantile(0.5), "p99_ms": h.quantile(0.99)}
+                       for (n, l), h in histograms],
+    }
+
+
+def log_snapshot():
+    """Emit snapshot() as one structured JSON log line."""
+    logger.info(json.dumps({"event": "metrics", **snapshot()}, default=str))
+
+
+def flush(prometheus_path=None):
+    """
+    At the end of a run: log a snapshot and, with `prometheus_path`, write
+    the Prometheus textfile. Does nothing unless metrics are enabled.
+    """
+    if not _config.enabled:
+        return
+    log_snapshot()
+    if prometheus_path:
+        write_prometheus(prometheus_path)
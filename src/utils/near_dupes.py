@@ -0,0 +1,174 @@
+# src/utils/near_dupes.py
+
+import os
+import re
+import json
+import zlib
+import numpy as np
+import pandas as pd
+
+STATE_DIR = "data/processed/near_dupes"
+
+_PRIME = np.uint64((1 << 31) - 1)
+_TOKEN_RE = re.compile(r"\w+")
+
+
+def shingle_hashes(text: str, k: int = 5) -> np.ndarray:
+    """31-bit hashes of the word k-shingles of `text` (rolling polynomial)."""
+    words = _TOKEN_RE.findall(str(text or "").lower())
+    if not words:
+        return np.zeros(1, dtype=np.uint64)
+    w = np.array([zlib.crc32(t.encode("utf-8")) for t in words], dtype=np.uint64) % _PRIME
+    k = min(k, len(w))
+    n = len(w) - k + 1
+    h = np.zeros(n, dtype=np.uint64)
+    for j in range(k):
+        h = (h * np.uint64(1_000_003) + w[j:j + n]) % _PRIME
+    return np.unique(h)
+
+
+class NearDuplicateIndex:
+    """
+    MinHash signatures over description shingles with LSH banding.
+    Documents are identified by a caller-supplied 64-bit key (the
+    `dedupe_key` from load_raw_jobs). State -- keys, signatures and the
+    union-find parent of each document -- persists between runs, so a new
+    scrape only computes signatures for postings it hasn't seen.
+    A cluster is named after its earliest-seen member.
+    """
+
+    def __init__(self, num_perm=128, bands=16, shingle_size=5,
+                 threshold=0.7, max_bucket=32, seed=1):
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        self.num_perm     = num_perm
+        self.bands        = bands
+        self.rows         = num_perm // bands
+        self.shingle_size = shingle_size
+        self.threshold    = threshold
+        self.max_bucket   = max_bucket
+        self.seed         = seed
+        rng = np.random.default_rng(seed)
+        self._a = rng.integers(1, int(_PRIME), num_perm, dtype=np.uint64)
+        self._b = rng.integers(0, int(_PRIME), num_perm, dtype=np.uint64)
+
+        self.keys    = []                       # position -> doc key
+        self.sigs    = []                       # position -> signature
+        self.parent  = []                       # union-find parent positions
+        self.pos     = {}                       # doc key -> position
+        self.buckets = [dict() for _ in range(bands)]
+
+    # ── signatures ──────────────────────────────────────────────────────────
+    def signature(self, text) -> np.ndarray:
+        x = shingle_hashes(text, self.shingle_size)
+        return ((self._a[:, None] * x[None, :] + self._b[:, None]) % _PRIME) \
+            .min(axis=1).astype(np.uint32)
+
+    def _band_keys(self, sig):
+        return [sig[i * self.rows:(i + 1) * self.rows].tobytes() for i in range(self.bands)]
+
+    # ── union-find ──────────────────────────────────────────────────────────
+    def _find(self, i):
+        root = i
+        while self.parent[root] != root:
+            root = self.parent[root]
+        while self.parent[i] != root:
+            self.parent[i], i = root, self.parent[i]
+        return root
+
+    def _union(self, i, j):
+        ri, rj = self._find(i), self._find(j)
+        if ri != rj:
+            # the earlier-seen document stays the root
+            lo, hi = min(ri, rj), max(ri, rj)
+            self.parent[hi] = lo
+
+    # ── adding documents ────────────────────────────────────────────────────
+    def _insert(self, key, sig):
+        p = len(self.keys)
+        self.keys.append(int(key))
+        self.sigs.append(sig)
+        self.parent.append(p)
+        self.pos[int(key)] = p
+        for band, bkey in zip(self.buckets, self._band_keys(sig)):
+            members = band.setdefault(bkey, [])
+            if len(members) < self.max_bucket:
+                members.append(p)
+        return p
+
+    def add(self, key, text) -> int:
+        """Add one document (no-op if its key is known); return its position."""
+        key = int(key)
+        if key in self.pos:
+            return self.pos[key]
+        sig = self.signature(text)
+        candidates = set()
+        for band, bkey in zip(self.buckets, self._band_keys(sig)):
+            candidates.update(band.get(bkey, ()))
+        p = self._insert(key, sig)
+        for c in candidates:
+            if np.mean(self.sigs[c] == sig) >= self.threshold:
+                self._union(p, c)
+        return p
+
+    def cluster_of(self, key) -> int:
+        """Cluster id (key of the earliest-seen member) of a known document."""
+        return self.keys[self._find(self.pos[int(key)])]
+
+    # ── persistence ─────────────────────────────────────────────────────────
+    def save(self, state_dir: str = STATE_DIR):
+        os.makedirs(state_dir, exist_ok=True)
+        sigs = np.stack(self.sigs) if self.sigs else np.empty((0, self.num_perm), np.uint32)
+        for name, arr in (("keys", np.array(self.keys, dtype=np.uint64)),
+                          ("signatures", sigs),
+                          ("parent", np.array([self._find(i) for i in range(len(self.parent))],
+                                              dtype=np.int64))):
+            tmp = os.path.join(state_dir, f"{name}.tmp.npy")
+            np.save(tmp, arr)
+            os.replace(tmp, os.path.join(state_dir, f"{name}.npy"))
+        with open(os.path.join(state_dir, "params.json"), "w") as f:
+            json.dump({"num_perm": self.num_perm, "bands": self.bands,
+                       "shingle_size": self.shingle_size, "threshold": self.threshold,
+                       "max_bucket": self.max_bucket, "seed": self.seed}, f, indent=2)
+
+    @classmethod
+    def load(cls, state_dir: str = STATE_DIR) -> "NearDuplicateIndex":
+        with open(os.path.join(state_dir, "params.json")) as f:
+            index = cls(**json.load(f))
+        keys    = np.load(os.path.join(state_dir, "keys.npy"))
+        sigs    = np.load(os.path.join(state_dir, "signatures.npy"))
+        parents = np.load(os.path.join(state_dir, "parent.npy"))
+        for key, sig in zip(keys, sigs):
+            index._insert(key, sig)
+        index.parent = parents.tolist()
+        return index
+
+    @classmethod
+    def load_or_create(cls, state_dir: str = STATE_DIR, **params) -> "NearDuplicateIndex":
+        if state_dir and os.path.exists(os.path.join(state_dir, "params.json")):
+            return cls.load(state_dir)
+        return cls(**params)
+
+
+def drop_near_duplicates(df: pd.DataFrame, state_dir: str = STATE_DIR,
+                         index: NearDuplicateIndex = None) -> pd.DataFrame:
+    """
+    Keep one canonical row per near-duplicate cluster of descriptions.
+    Expects the `dedupe_key` column added by load_raw_jobs. The canonical
+    row is the cluster's earliest-seen posting if it is still present,
+    otherwise the first row of the cluster. Adds a `cluster_id` column and
+    persists the LSH state to `state_dir` (pass None to keep it in memory).
+    """
+    index = index or NearDuplicateIndex.load_or_create(state_dir)
+    for key, text in zip(df["dedupe_key"], df["description"]):
+        index.add(key, text)
+    if state_dir:
+        index.save(state_dir)
+
+    df = df.copy()
+    df["cluster_id"] = np.array([index.cluster_of(k) for k in df["dedupe_key"]], dtype=np.uint64)
+    is_root = (df["cluster_id"] == df["dedupe_key"]).to_numpy()
+    # rows whose cluster root is present win; otherwise the first row
+    order = np.lexsort((np.arange(len(df)), ~is_root))
+    canonical = df.iloc[order].drop_duplicates(subset="cluster_id")
+    return canonical.sort_index()
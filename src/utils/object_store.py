@@ -0,0 +1,180 @@
+# src/utils/object_store.py
+#
+# Minimal object-store interface used by the scrape sync, with an S3
+# implementation and a local-filesystem one for offline runs and tests.
+#
+#   open_store("s3://bucket/raw/jobs")     -> S3ObjectStore
+#   open_store("file:///tmp/store")        -> LocalObjectStore
+#   open_store("/tmp/store")               -> LocalObjectStore
+
+import os
+import shutil
+from urllib.parse import urlsplit
+
+MULTIPART_THRESHOLD = 16 * 1024 * 1024
+MULTIPART_CHUNKSIZE = 16 * 1024 * 1024
+
+
+class ObjectStore:
+    """
+    Keys are "/"-separated strings relative to the store's root/prefix.
+    get_bytes raises KeyError for a missing key.
+    """
+
+    def put_file(self, path: str, key: str):
+        raise NotImplementedError
+
+    def put_bytes(self, key: str, data: bytes):
+        raise NotImplementedError
+
+    def get_bytes(self, key: str) -> bytes:
+        raise NotImplementedError
+
+    def download_file(self, key: str, path: str):
+        raise NotImplementedError
+
+    def exists(self, key: str) -> bool:
+        raise NotImplementedError
+
+    def list(self, prefix: str = "") -> list:
+        raise NotImplementedError
+
+
+class LocalObjectStore(ObjectStore):
+    """Objects as files under `root`; every write is atomic (temp + rename)."""
+
+    def __init__(self, root: str):
+        self.root = root
+
+    def _path(self, key):
+        return os.path.join(self.root, *key.split("/"))
+
+    def _atomic_target(self, key):
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        return path, path + ".tmp"
+
+    def put_file(self, path, key):
+        target, tmp = self._atomic_target(key)
+        shutil.copyfile(path, tmp)
+        os.replace(tmp, target)
+
+    def put_bytes(self, key, data):
+        target, tmp = self._atomic_target(key)
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, target)
+
+    def get_bytes(self, key):
+        try:
+            with open(self._path(key), "rb") as f:
+                return f.read()
+        except FileNotFoundError:
+            raise KeyError(key) from None
+
+    def download_file(self, key, path):
+        if not self.exists(key):
+            raise KeyError(key)
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        shutil.copyfile(self._path(key), path)
+
+    def exists(self, key):
+        return os.path.isfile(self._path(key))
+
+    def list(self, prefix=""):
+        keys = []
+        for dirpath, _, files in os.walk(self.root):
+            for name in files:
+                if name.endswith(".tmp"):
+                    continue
+                rel = os.path.relpath(os.path.join(dirpath, name), self.root)
+                key = rel.replace(os.sep, "/")
+                if key.startswith(prefix):
+                    keys.append(key)
+        return sorted(keys)
+
+
+class S3ObjectStore(ObjectStore):
+    """
+    S3 bucket + key prefix. boto3 is imported and the client created on
+    first use, not at import. Files above `multipart_threshold` are sent as
+    multipart uploads in `multipart_chunksize` parts by boto3's transfer
+    manager.
+    """
+
+    def __init__(self, bucket: str, prefix: str = "", client=None,
+                 multipart_threshold: int = MULTIPART_THRESHOLD,
+                 multipart_chunksize: int = MULTIPART_CHUNKSIZE):
+        self.bucket = bucket
+        self.prefix = prefix.strip("/")
+        self._client = client
+        self.multipart_threshold = multipart_threshold
+        self.multipart_chunksize = multipart_chunksize
+
+    @property
+    def client(self):
+        if self._client is None:
+            import boto3
+            self._client = boto3.client("s3")
+        return self._client
+
+    def _key(self, key):
+        return f"{self.prefix}/{key}" if self.prefix else key
+
+    def _transfer_config(self):
+        from boto3.s3.transfer import TransferConfig
+        return TransferConfig(multipart_threshold=self.multipart_threshold,
+                              multipart_chunksize=self.multipart_chunksize)
+
+    def put_file(self, path, key):
+        self.client.upload_file(path, self.bucket, self._key(key),
+                                Config=self._transfer_config())
+
+    def put_bytes(self, key, data):
+        self.client.put_object(Bucket=self.bucket, Key=self._key(key), Body=data)
+
+    def get_bytes(self, key):
+        try:
+            resp = self.client.get_object(Bucket=self.bucket, Key=self._key(key))
+        except self.client.exceptions.NoSuchKey:
+            raise KeyError(key) from None
+        return resp["Body"].read()
+
+    def download_file(self, key, path):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        try:
+            self.client.download_file(self.bucket, self._key(key), path,
+                                      Config=self._transfer_config())
+        except Exception as e:
+            if getattr(e, "response", {}).get("Error", {}).get("Code") in ("404", "NoSuchKey"):
+                raise KeyError(key) from None
+            raise
+
+    def exists(self, key):
+        try:
+            self.client.head_object(Bucket=self.bucket, Key=self._key(key))
+            return True
+        except Exception as e:
+            if getattr(e, "response", {}).get("Error", {}).get("Code") in ("404", "NoSuchKey"):
+                return False
+            raise
+
+    def list(self, prefix=""):
+        keys = []
+        strip = len(self.prefix) + 1 if self.prefix else 0
+        paginator = self.client.get_paginator("list_objects_v2")
+        for page in paginator.paginate(Bucket=self.bucket, Prefix=self._key(prefix)):
+            keys += [obj["Key"][strip:] for obj in page.get("Contents", [])]
+        return sorted(keys)
+
+
+def open_store(url: str) -> ObjectStore:
+    """ObjectStore for an s3://bucket/prefix URL, a file:// URL or a local path."""
+    parts = urlsplit(url)
+    if parts.scheme == "s3":
+        return S3ObjectStore(parts.netloc, parts.path)
+    if parts.scheme == "file":
+        return LocalObjectStore(parts.path)
+    if parts.scheme:
+        raise ValueError(f"Unsupported object store URL: {url!r}")
+    return LocalObjectStore(url)
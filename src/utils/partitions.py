@@ -0,0 +1,74 @@
+# src/utils/partitions.py
+#
+# Date/profession partitioned storage for raw scrape output:
+#   <root>/date=YYYY-MM-DD/profession=<slug>/part-<name>.jsonl.gz  (or .parquet)
+
+import os
+import re
+import glob
+import gzip
+import json
+import pandas as pd
+
+PARTITIONS_DIR = "data/raw/jobs"
+FORMATS = {"jsonl": ".jsonl.gz", "parquet": ".parquet"}
+
+
+def slugify(value) -> str:
+    return re.sub(r"[^a-z0-9]+", "_", str(value).lower()).strip("_") or "none"
+
+
+def partition_dir(root, date, profession) -> str:
+    return os.path.join(root, f"date={date}", f"profession={slugify(profession)}")
+
+
+def write_partition(records, root, date, profession, part="0", fmt="jsonl") -> str:
+    """
+    Write one batch of job records as a single partition file and return
+    its path. Written to a temp name and renamed, so a crash never leaves a
+    truncated partition behind; re-writing the same part replaces it.
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown partition format {fmt!r}; expected one of {list(FORMATS)}")
+    out_dir = partition_dir(root, date, profession)
+    os.makedirs(out_dir, exist_ok=True)
+    path = os.path.join(out_dir, f"part-{slugify(part)}{FORMATS[fmt]}")
+    tmp  = path + ".tmp"
+
+    if fmt == "jsonl":
+        with gzip.open(tmp, "wt", encoding="utf-8") as f:
+            for rec in records:
+                f.write(json.dumps(rec, ensure_ascii=False, default=str) + "\n")
+    else:
+        pd.DataFrame(list(records)).to_parquet(tmp, index=False)
+    os.replace(tmp, path)
+    return path
+
+
+def list_partitions(root=PARTITIONS_DIR, dates=None, professions=None) -> list:
+    """
+    Partition files under `root`, optionally restricted to some dates
+    (ISO strings) and professions. Only paths are listed; nothing is read.
+    """
+    paths = []
+    for fmt_ext in FORMATS.values():
+        paths += glob.glob(os.path.join(root, "date=*", "profession=*", f"part-*{fmt_ext}"))
+    if dates is not None:
+        wanted = {f"date={d}" for d in dates}
+        paths = [p for p in paths if os.path.basename(os.path.dirname(os.path.dirname(p))) in wanted]
+    if professions is not None:
+        wanted = {f"profession={slugify(p)}" for p in professions}
+        paths = [p for p in paths if os.path.basename(os.path.dirname(p)) in wanted]
+    return sorted(paths)
+
+
+def read_partition(path) -> pd.DataFrame:
+    if path.endswith(FORMATS["parquet"]):
+        return pd.read_parquet(path)
+    return pd.read_json(path, lines=True, compression="gzip", dtype=False)
+
+
+def iter_partitions(paths):
+    """Lazily yield one DataFrame per partition file."""
+    for path in paths:
+        yield read_partition(path)
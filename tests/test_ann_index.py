@@ -0,0 +1,33 @@
+import numpy as np
+
+from benchmarks import synthetic
+from src.models.ann_index import IVFIndex, load_verified, tune_nprobe
+from src.models.topk import top_k_rows
+
+
+def test_ivf_search_matches_exact_when_every_list_is_probed():
+    x = synthetic.make_embeddings(2000, dim=32)
+    q = synthetic.make_embeddings(20, dim=32, seed=1)
+    index = IVFIndex.build(x, n_lists=16)
+
+    idx, scores = index.search(q, k=10, nprobe=16, chunk=7)
+    exact_idx, exact_scores = top_k_rows(q @ x.T, 10)
+
+    assert np.allclose(scores, exact_scores, atol=1e-5)
+    assert (idx == exact_idx).mean() > 0.99
+
+
+def test_only_an_index_that_meets_the_recall_target_is_served(tmp_path):
+    x = synthetic.make_embeddings(2000, dim=32)
+    index = IVFIndex.build(x, n_lists=16, pq_m=4)
+    index.attach_vectors(x)
+
+    report = tune_nprobe(index, x, min_recall=1.01, n_queries=50)
+    assert not report["ok"] and index.recall is None
+    index.save(str(tmp_path / "rejected"))
+    assert load_verified(str(tmp_path / "rejected")) is None
+
+    index.recall = 0.97
+    index.save(str(tmp_path / "verified"))
+    assert load_verified(str(tmp_path / "verified")).recall == 0.97
+    assert load_verified(str(tmp_path / "missing")) is None
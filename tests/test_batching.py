@@ -0,0 +1,73 @@
+import threading
+from concurrent.futures import TimeoutError
+
+import pytest
+
+from src.service.batching import MicroBatcher
+
+
+def test_timed_out_calls_are_dropped_and_the_loop_keeps_running():
+    started, release = threading.Event(), threading.Event()
+    seen = []
+
+    def fn(items):
+        seen.append(list(items))
+        if items == ["slow"]:
+            started.set()
+            release.wait(5)
+        return [item.upper() for item in items]
+
+    batcher = MicroBatcher(fn, max_batch_size=4, max_wait_ms=1).start()
+    try:
+        first = batcher.submit("slow")
+        assert started.wait(5)
+        with pytest.raises(TimeoutError):
+            batcher("late", timeout=0.05)       # queued behind "slow", then cancelled
+        release.set()
+        assert first.result(5) == "SLOW"
+        assert batcher("next", timeout=5) == "NEXT"
+        assert all("late" not in batch for batch in seen)
+    finally:
+        batcher.stop()
+
+
+def test_a_batch_failing_after_partial_results_does_not_kill_the_loop():
+    def fn(items):
+        yield items[0]
+        raise RuntimeError("model crashed")
+
+    batcher = MicroBatcher(fn, max_batch_size=2, max_wait_ms=500).start()
+    try:
+        first, second = batcher.submit("a"), batcher.submit("b")
+        assert first.result(5) == "a"
+        with pytest.raises(RuntimeError):
+            second.result(5)
+        assert batcher.submit("c").result(5) == "c"
+    finally:
+        batcher.stop()
+
+
+def test_stop_fails_queued_calls_instead_of_leaving_them_pending():
+    started, release = threading.Event(), threading.Event()
+
+    def fn(items):
+        started.set()
+        release.wait(5)
+        return [item.upper() for item in items]
+
+    batcher = MicroBatcher(fn, max_batch_size=1, max_wait_ms=1).start()
+    running = batcher.submit("running")
+    assert started.wait(5)
+    queued = [batcher.submit(f"queued {i}") for i in range(3)]
+
+    stopper = threading.Thread(target=batcher.stop)
+    stopper.start()
+    release.set()
+    stopper.join(5)
+
+    assert running.result(5) == "RUNNING"
+    for fut in queued:
+        with pytest.raises(RuntimeError, match="stopped"):
+            fut.result(0)
+    with pytest.raises(RuntimeError, match="stopped"):
+        batcher.submit("late").result(0)
@@ -0,0 +1,47 @@
+import os
+import multiprocessing
+
+import pytest
+
+from src.resume_parser import bulk
+from src.resume_parser.bulk import parse_resumes
+
+
+def test_duplicate_inputs_are_parsed_once_through_a_small_window(tmp_path):
+    for i in range(6):
+        (tmp_path / f"r{i}.txt").write_text(f"resume {i}")
+    inputs = [str(tmp_path), str(tmp_path / "r3.txt"), str(tmp_path / "." / "r3.txt")]
+
+    recs = list(parse_resumes(inputs, workers=2, max_in_flight=2))
+
+    assert sorted(rec["text"] for rec in recs) == [f"resume {i}" for i in range(6)]
+    assert {rec["status"] for rec in recs} == {"ok"}
+
+
+def test_pdf_pages_are_counted_in_the_workers_and_split_into_ranges(tmp_path, monkeypatch):
+    if multiprocessing.get_start_method() != "fork":
+        pytest.skip("the fake PDF reader reaches the workers only when they fork")
+    counted_in = tmp_path / "counted_in"
+
+    def count_pages(path):
+        with open(counted_in, "a") as f:
+            f.write(f"{os.getpid()}\n")
+        return len(open(path).read().splitlines())
+
+    def pages(path, start=0, end=None):
+        return "".join(line + "\n" for line in open(path).read().splitlines()[start:end])
+
+    monkeypatch.setattr(bulk, "count_pdf_pages", count_pages)
+    monkeypatch.setattr(bulk, "extract_pdf_text", pages)
+    monkeypatch.setattr(bulk, "extract_resume_text", pages)
+    (tmp_path / "long.pdf").write_text("\n".join(f"page {i}" for i in range(7)))
+    (tmp_path / "short.pdf").write_text("page 0\npage 1")
+
+    recs = {os.path.basename(r["path"]): r
+            for r in bulk.parse_resumes(str(tmp_path), workers=2, pages_per_task=3)}
+
+    assert recs["long.pdf"]["parts"] == 3
+    assert recs["long.pdf"]["text"] == "".join(f"page {i}\n" for i in range(7))
+    assert (recs["short.pdf"]["parts"], recs["short.pdf"]["text"]) == (1, "page 0\npage 1\n")
+    pids = counted_in.read_text().split()
+    assert len(pids) == 2 and str(os.getpid()) not in pids
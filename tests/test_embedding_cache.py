@@ -0,0 +1,33 @@
+import numpy as np
+
+from src.models.embedding_cache import EmbeddingCache
+
+
+def _encoder(value):
+    calls = []
+
+    def encode(texts):
+        calls.append(list(texts))
+        return np.full((len(texts), 4), value, dtype=np.float32)
+    return encode, calls
+
+
+def test_cache_is_separate_per_model_and_max_seq_length(tmp_path):
+    texts = ["python backend developer", "data engineer  with spark"]
+    encode, _ = _encoder(1.0)
+    cache = EmbeddingCache("model-a", max_seq_length=256, cache_dir=str(tmp_path))
+    cache.encode(texts, encode)
+    cache.save()
+
+    for model_name, seq in (("model-a", 128), ("model-b", 256), ("model-a", None)):
+        encode, calls = _encoder(2.0)
+        other = EmbeddingCache(model_name, max_seq_length=seq, cache_dir=str(tmp_path))
+        vecs, stats = other.encode(texts, encode)
+        assert stats["hits"] == 0 and len(calls) == 1
+        assert (vecs == 2.0).all()
+
+    encode, calls = _encoder(3.0)
+    same = EmbeddingCache("model-a", max_seq_length=256, cache_dir=str(tmp_path))
+    vecs, stats = same.encode(["data engineer with spark"], encode)
+    assert stats["hits"] == 1 and not calls
+    assert (vecs == 1.0).all()
@@ -0,0 +1,27 @@
+import numpy as np
+
+from src.models.encoding import EncodingEngine
+
+
+class FakeModel:
+    max_seq_length = 512
+
+    def __init__(self):
+        self.seen_lengths = set()
+
+    def get_sentence_embedding_dimension(self):
+        return 4
+
+    def encode(self, texts, batch_size, convert_to_numpy, show_progress_bar,
+               normalize_embeddings):
+        self.seen_lengths.add(self.max_seq_length)
+        return np.array([[len(t), 1, 0, 0] for t in texts], dtype=np.float32)
+
+
+def test_encode_limits_max_seq_length_only_while_running():
+    model = FakeModel()
+    with EncodingEngine(model=model, max_seq_length=10, batch_size=2) as engine:
+        out = engine.encode(["a", "bbb", "cc"])
+    assert out[:, 0].tolist() == [1, 3, 2]
+    assert model.seen_lengths == {10}
+    assert model.max_seq_length == 512
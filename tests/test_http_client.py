@@ -0,0 +1,119 @@
+import json
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+import pytest
+
+from src.data_collection.http_client import PooledClient
+from src.data_collection.scrape_jobs import iter_job_batches
+
+
+class StubAPI:
+    """
+    Local stand-in for the scraper API. Answers each request with the next
+    scripted (status, headers) pair, then 200 with one job per query, and
+    records the client port of every request to show connection reuse.
+    """
+
+    def __init__(self, script=()):
+        self.script = list(script)
+        self.requests = []
+        self.lock = threading.Lock()
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+                with stub.lock:
+                    stub.requests.append((self.client_address[1], body))
+                    status, headers = stub.script.pop(0) if stub.script else (200, {})
+                if status == 200:
+                    job = {"title": f"{body['query']} in {body['location']}",
+                           "jobUrl": f"https://jobs.example/{body['query']}/{body['location']}",
+                           "salary": {"salaryText": "$80k"}}
+                    data = json.dumps({"returnvalue": {"data": [job]}}).encode()
+                else:
+                    data = json.dumps({"error": status}).encode()
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.server.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def stub():
+    servers = []
+
+    def start(script=()):
+        servers.append(StubAPI(script))
+        return servers[-1]
+    yield start
+    for server in servers:
+        server.close()
+
+
+def _record_backoff(client):
+    """Record each computed backoff delay instead of sleeping it."""
+    delays, compute = [], client._backoff
+
+    def backoff(attempt, resp=None):
+        delays.append(compute(attempt, resp))
+        return 0.0
+    client._backoff = backoff
+    return delays
+
+
+def test_retries_429_and_5xx_honouring_retry_after_on_one_connection(stub):
+    api = stub([(429, {"Retry-After": "7"}), (503, {}), (502, {"Retry-After": "2"})])
+    with PooledClient(max_retries=4, backoff_base=0.5, backoff_max=30) as client:
+        delays = _record_backoff(client)
+        data = client.post_json(f"{api.url}/api/job", {"query": "nurse", "location": "Austin"})
+        client.post_json(f"{api.url}/api/job", {"query": "teacher", "location": "Austin"})
+
+    assert data["returnvalue"]["data"][0]["title"] == "nurse in Austin"
+    assert len(api.requests) == 5                      # 3 retries, then 2 successes
+    assert delays[0] == 7.0 and delays[2] == 2.0       # Retry-After wins
+    assert 0.5 <= delays[1] <= 1.0                     # jittered 0.5 * 2**1 otherwise
+    assert len({port for port, _ in api.requests}) == 1
+
+
+def test_gives_up_after_max_retries(stub):
+    api = stub([(500, {})] * 3)
+    with PooledClient(max_retries=2) as client:
+        _record_backoff(client)
+        with pytest.raises(Exception, match="500"):
+            client.post_json(f"{api.url}/api/job", {"query": "nurse", "location": "Austin"})
+    assert len(api.requests) == 3
+
+
+def test_iter_job_batches_against_the_stub(stub):
+    api = stub([(429, {"Retry-After": "0"}), (503, {"Retry-After": "0"})])
+    profs, locs = ["nurse", "teacher", "chef"], ["Austin", "Boston"]
+    with PooledClient(per_host_concurrency=2, max_retries=3) as client:
+        batches = list(iter_job_batches(profs, locs, max_workers=2,
+                                        base_url=api.url, client=client))
+
+    assert sorted(i for i, *_ in batches) == list(range(6))
+    titles = {batch[0]["title"] for *_, batch in batches}
+    assert titles == {f"{p} in {l}" for p in profs for l in locs}
+    assert all(batch[0]["salaryText"] == "$80k" for *_, batch in batches)
+    assert len(api.requests) == 6 + 2
+    # two worker threads share the pool: at most two connections
+    assert len({port for port, _ in api.requests}) <= 2
@@ -0,0 +1,17 @@
+import numpy as np
+import pandas as pd
+
+from src.models.job_index import load_job_index, save_job_index
+
+
+def test_rebuilding_an_index_leaves_open_mappings_intact(tmp_path):
+    jobs = pd.DataFrame({"title": ["a", "b", "c"]})
+    first = np.arange(12, dtype=np.float32).reshape(3, 4)
+    save_job_index(jobs, first, "fake", index_dir=str(tmp_path))
+    mapped = load_job_index(str(tmp_path)).embeddings
+
+    save_job_index(jobs.iloc[:1], np.ones((1, 4), dtype=np.float32), "fake",
+                   index_dir=str(tmp_path))
+
+    assert np.array_equal(mapped, first)
+    assert load_job_index(str(tmp_path)).embeddings.shape == (1, 4)
@@ -0,0 +1,79 @@
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+
+from src.models.live_index import LiveJobIndex
+
+
+def _jobs(keys, profession="data engineer"):
+    jobs = pd.DataFrame({"jobUrl": keys, "title": keys, "profession": profession})
+    rng = np.random.default_rng(len(keys))
+    return jobs, rng.standard_normal((len(keys), 8)).astype(np.float32)
+
+
+def test_writers_sharing_a_directory_never_reuse_a_segment(tmp_path):
+    live_dir = str(tmp_path / "live")
+    writers = [LiveJobIndex(live_dir, model_name="fake") for _ in range(2)]
+
+    def append(live, w):
+        for i in range(5):
+            live.append(*_jobs([f"w{w}-{i}-{j}" for j in range(3)]))
+
+    threads = [threading.Thread(target=append, args=(live, w)) for w, live in enumerate(writers)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    reader = LiveJobIndex(live_dir)
+    assert len(reader.segments) == 10
+    assert len({seg.name for seg in reader.segments}) == 10
+    assert len(reader) == 30
+
+
+def test_search_picks_up_other_writers_and_compaction_defers_deletes(tmp_path):
+    live_dir = str(tmp_path / "live")
+    writer = LiveJobIndex(live_dir, model_name="fake", retire_grace_s=3600)
+    reader = LiveJobIndex(live_dir)
+
+    jobs, vecs = _jobs(["a", "b", "c"])
+    writer.append(jobs, vecs)
+    keys, _ = reader.search(vecs[:1], k=1)
+    assert keys[0].tolist() == ["a"]
+    assert os.path.exists(os.path.join(reader.segments[0].path, "filters.npz"))
+
+    writer.append(*_jobs(["d"], profession="teacher"))
+    writer.delete(["b"])
+    keys, _ = reader.search(vecs[:1], k=10, profession="teacher")
+    assert keys[0].tolist() == ["d"]
+
+    old = [seg.path for seg in writer.segments]
+    assert writer.compact() == 2
+    keys, _ = reader.search(vecs[:1], k=10)
+    assert sorted(keys[0].tolist()) == ["a", "c", "d"]
+    assert len(reader.segments) == 1
+    assert all(os.path.exists(path) for path in old)
+
+    writer.retire_grace_s = 0
+    assert writer.purge_retired() == 2
+    assert not any(os.path.exists(path) for path in old)
+
+
+def test_scores_stay_aligned_when_a_result_is_deleted_before_lookup(tmp_path):
+    live = LiveJobIndex(str(tmp_path / "live"), model_name="fake")
+    jobs = pd.DataFrame({"jobUrl": ["a", "b", "c"], "title": ["A", "B", "C"]})
+    live.append(jobs, np.eye(3, 8, dtype=np.float32), normalized=True)
+    query = np.array([[1.0, 0.5, 0.2, 0, 0, 0, 0, 0]], dtype=np.float32)
+
+    keys, scores = live.search(query, k=3)
+    assert keys[0].tolist() == ["a", "b", "c"]
+    live.delete(["b"])
+
+    found = live.jobs_for(keys[0])
+    assert found["jobUrl"].tolist() == ["a", "c"]
+    assert found.index.tolist() == [0, 2]
+    out = live.recommend(query, k=3)
+    assert out["jobUrl"].tolist() == ["a", "c"]
+    assert np.allclose(out["score"], [scores[0][0], scores[0][2]])
@@ -0,0 +1,52 @@
+import os
+import threading
+
+from src.utils import metrics
+
+
+def test_nested_sampled_timers_profile_only_the_outer_one(tmp_path):
+    metrics.REGISTRY.reset()
+    metrics.enable(profile_slow_ms=0, profile_rate=1.0, profile_dir=str(tmp_path))
+    try:
+        @metrics.timed("inner")
+        def inner():
+            return sum(range(1000))
+
+        with metrics.timer("outer"):
+            inner()
+            inner()
+        with metrics.timer("outer"):
+            inner()
+    finally:
+        metrics.disable()
+        metrics._config.profile_slow_ms = None
+
+    counts = {name: h.count for (name, _), h in metrics.REGISTRY.histograms.items()}
+    assert counts == {"outer": 2, "inner": 3}
+    dumps = sorted(os.listdir(tmp_path))
+    assert len(dumps) == 2 and all(d.startswith("outer-") for d in dumps)
+    assert not metrics._profile_lock.locked()
+
+
+def test_export_escapes_label_values_and_tolerates_concurrent_registration():
+    metrics.REGISTRY.reset()
+    metrics.REGISTRY.counter("hits", path='a"b\\c\nd').inc()
+    text = metrics.prometheus_text()
+    assert 'path="a\\"b\\\\c\\nd"' in text
+
+    def register():
+        for i in range(2000):
+            metrics.REGISTRY.counter("burst", n=i).inc()
+            metrics.REGISTRY.histogram("burst", n=i).observe(1.0)
+
+    thread = threading.Thread(target=register)
+    thread.start()
+    try:
+        while thread.is_alive():
+            metrics.prometheus_text()
+            metrics.snapshot()
+    finally:
+        thread.join()
+    counters, histograms = metrics.REGISTRY.items()
+    assert len(histograms) == 2000
+    metrics.REGISTRY.reset()
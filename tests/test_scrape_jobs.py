@@ -0,0 +1,48 @@
+import os
+import json
+
+import pandas as pd
+
+from src.data_collection.scrape_jobs import fetch_one
+from src.models.filters import _salary_bounds, parse_salary
+
+FIXTURE = os.path.join(os.path.dirname(__file__), "fixtures", "indeed_job_response.json")
+
+
+class RecordedClient:
+    def __init__(self, path):
+        with open(path) as f:
+            self.response = json.load(f)
+        self.calls = []
+
+    def post_json(self, url, payload):
+        self.calls.append((url, payload))
+        return self.response
+
+
+def test_recorded_response_maps_salary_and_location_fields():
+    client = RecordedClient(FIXTURE)
+    rows = fetch_one(client, "http://stub/api/job", "software developer", "San Francisco")
+
+    assert client.calls[0][1]["query"] == "software developer"
+    assert [r["companyName"] for r in rows] == ["Acme Corp", "Initech", "Globex"]
+    full, text_only, empty = rows
+    assert (full["salaryMin"], full["salaryMax"]) == (150000, 185000)
+    assert full["salaryText"] == "$150,000 - $185,000 a year"
+    assert (full["locationShort"], full["companyRating"]) == ("San Francisco, CA", 4.1)
+    assert full["description"].startswith("Build and run")
+    assert (text_only["salaryMin"], text_only["salaryText"]) == (None, "80-100k")
+    assert text_only["description"] == "<p>Maintain the TPS reporting platform.</p>"
+    assert (empty["salaryMin"], empty["salaryText"], empty["locationShort"]) == (None, None, None)
+
+    lo, hi = _salary_bounds(pd.DataFrame(rows))
+    assert (lo[0], hi[0]) == (150000, 185000)
+    assert (lo[1], hi[1]) == (80000, 100000)
+    assert pd.isna(lo[2]) and pd.isna(hi[2])
+
+
+def test_parse_salary_applies_a_trailing_k_to_both_ends():
+    assert parse_salary("80-100k") == (80000, 100000)
+    assert parse_salary("$80k–$100k") == (80000, 100000)
+    assert parse_salary("$85,000 - $95,000 a year") == (85000, 95000)
+    assert parse_salary("$20-25 an hour") == (20 * 2080, 25 * 2080)
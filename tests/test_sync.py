@@ -0,0 +1,58 @@
+import os
+
+from src.data_collection.sync import pull_deltas, push_partitions
+from src.utils.object_store import LocalObjectStore
+from src.utils.partitions import read_partition, write_partition
+
+
+def _scrape(root):
+    shared = {"jobUrl": "https://example.com/jobs/1", "title": "Data Engineer",
+              "companyName": "Acme"}
+    return [
+        write_partition([dict(shared, profession="data engineer", searchLocation="Berlin"),
+                         {"jobUrl": "https://example.com/jobs/2", "title": "ETL Developer",
+                          "companyName": "Initech", "profession": "data engineer"}],
+                        root, "2024-05-01", "data engineer"),
+        write_partition([dict(shared, profession="software engineer", searchLocation="Munich")],
+                        root, "2024-05-01", "software engineer"),
+    ]
+
+
+def test_pushing_the_same_scrape_twice_uploads_nothing_the_second_time(tmp_path):
+    store = LocalObjectStore(str(tmp_path / "store"))
+
+    first = push_partitions(_scrape(str(tmp_path / "day1")), store)
+    assert (first["new"], first["changed"], first["unchanged"]) == (3, 0, 0)
+    assert first["deltas"] == 2
+
+    second = push_partitions(_scrape(str(tmp_path / "day2")), store)
+    assert (second["new"], second["changed"], second["unchanged"]) == (0, 0, 3)
+    assert second["deltas"] == 0
+
+
+def test_a_posting_under_two_professions_lands_in_both_partitions(tmp_path):
+    store = LocalObjectStore(str(tmp_path / "store"))
+    push_partitions(_scrape(str(tmp_path / "day1")), store)
+
+    paths, _ = pull_deltas(store, str(tmp_path / "pulled"))
+    urls = {}
+    for path in paths:
+        profession = os.path.basename(os.path.dirname(path))
+        urls[profession] = set(read_partition(path)["jobUrl"])
+    assert urls == {
+        "profession=data_engineer": {"https://example.com/jobs/1", "https://example.com/jobs/2"},
+        "profession=software_engineer": {"https://example.com/jobs/1"},
+    }
+
+
+def test_a_new_search_location_alone_is_not_a_change(tmp_path):
+    store = LocalObjectStore(str(tmp_path / "store"))
+    root = str(tmp_path / "scrape")
+    rec = {"jobUrl": "https://example.com/jobs/1", "title": "Data Engineer",
+           "profession": "data engineer"}
+    push_partitions([write_partition([dict(rec, searchLocation="Berlin")],
+                                     root, "2024-05-01", "data engineer", part="berlin")], store)
+    again = push_partitions([write_partition([dict(rec, searchLocation="Munich")],
+                                             root, "2024-05-01", "data engineer", part="munich")],
+                            store)
+    assert (again["new"], again["unchanged"], again["deltas"]) == (0, 1, 0)